@@ -8,31 +8,147 @@
 - 追踪方法定义位置
 """
 
+import gc
+import os
 import sys
 import pkgutil
 import importlib
 import inspect
+from importlib.machinery import FileFinder
 from pathlib import Path
-from typing import List, Dict, Any, Optional, Tuple
+from types import ModuleType
+from typing import List, Dict, Any, Optional, Tuple, Iterable, Iterator, Set, Union
+
+from .cache import ResultCache, ExternalCache, CACHE_DIR_NAME
+from .config import AnalysisConfig
+from .context import AnalysisContext
+from .streaming import DEFAULT_MODULE_WINDOW
+from .imports import ImportProfiler
+from .dynamic import (DEFAULT_RESOLUTION_BUDGET, describe_class, is_dynamic_class,
+                      has_dynamic_features)
+from .changes import (GitError, resolve_revision, changed_modules_since, dirty_modules,
+                      affected_modules)
+
+
+class ClaimedClasses:
+    """
+    已收录的动态类
+
+    类对象存活期间按身份去重：同一个工厂创建的多个类 __qualname__ 相同，
+    不能按名称区分。流式分析移除模块后类对象可能被回收、id() 被复用，
+    此时改为按 (定义模块, __qualname__, 绑定名) 去重，避免之后重新导入的
+    模块再次收录被重复导出的类。
+    """
+
+    def __init__(self) -> None:
+        self._live: Dict[int, Tuple[str, str, str]] = {}
+        self._evicted: set = set()
+
+    def claim(self, cls: type, name: str) -> bool:
+        """收录绑定为 name 的类，已收录时返回 False"""
+        key = (cls.__module__, cls.__qualname__, name)
+        if id(cls) in self._live or key in self._evicted:
+            return False
+        self._live[id(cls)] = key
+        return True
+
+    def evict(self) -> None:
+        """模块已被移除，之后只能按名称识别已收录的类"""
+        self._evicted.update(self._live.values())
+        self._live.clear()
+
+
+class _ResultIndex:
+    """
+    按分析结果追踪方法时使用的索引
+
+    MRO 中的类按 模块.类名 解析。同一短名绑定了多个类，或同一 模块.类名
+    对应多个类（如同一工厂函数产生的类）时视为有歧义，由调用方改为导入后追踪。
+    """
+
+    def __init__(self, analysis_result: Dict[str, Any]):
+        self.classes: Dict[str, Tuple[str, Dict[str, Any]]] = {}
+        self.ambiguous: Set[str] = set()
+        self.files: Dict[str, str] = {}
+        self._owners: Dict[str, Optional[Tuple[str, frozenset]]] = {
+            "builtins.object": ("builtins", frozenset(vars(object)))}
+        for module_name, module_info in analysis_result["modules"].items():
+            self.files[module_name] = module_info["file"]
+            for class_name, class_info in module_info["classes"].items():
+                if class_name in self.classes:
+                    self.ambiguous.add(class_name)
+                else:
+                    self.classes[class_name] = (module_name, class_info)
+                self._add_owner(f"{class_info['module']}.{class_info['name']}", class_info)
+        for name, info in analysis_result.get("external_classes", {}).items():
+            self._add_owner(f"{info['module']}.{name}", info)
+        self.modules = analysis_result["modules"]
+
+    def _add_owner(self, qualified_name: str, info: Dict[str, Any]) -> None:
+        if qualified_name in self._owners:
+            self._owners[qualified_name] = None
+        else:
+            self._owners[qualified_name] = (info["module"], frozenset(info["own_methods"]))
+
+    def find(self, class_name: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """短名或 模块.类名，返回 (绑定模块, 类信息)"""
+        if "." not in class_name:
+            return self.classes.get(class_name)
+        module_name, _, name = class_name.rpartition(".")
+        class_info = self.modules.get(module_name, {}).get("classes", {}).get(name)
+        return None if class_info is None else (module_name, class_info)
+
+    def owner(self, qualified_name: str) -> Optional[Tuple[str, frozenset]]:
+        """MRO 中的类（模块.类名）所在模块及其自身定义的方法，未知或有歧义时为 None"""
+        return self._owners.get(qualified_name)
 
 
 class InheritanceAnalyzer:
     """继承关系分析器"""
     
-    def __init__(self, project_path: str = "."):
+    def __init__(self, project_path: str = ".",
+                 resolution_budget: int = DEFAULT_RESOLUTION_BUDGET,
+                 config: Optional[AnalysisConfig] = None,
+                 import_profile: bool = False,
+                 external_cache: bool = True,
+                 external_cache_dir: Union[str, Path, None] = None):
         """
         初始化分析器
         
         Args:
             project_path: 项目路径，默认为当前目录
+            resolution_budget: 识别动态特征时每个类最多检查的成员数量
+            config: 分析范围配置，默认读取项目 pyproject.toml 中的 [tool.supermro]
+            import_profile: analyze_package 是否同时记录包内导入图和导入开销
+            external_cache: 是否按发行包版本缓存包外类的描述，跨次运行、跨项目复用
+            external_cache_dir: 包外类缓存目录，默认为用户级缓存目录
+                （见 cache.default_external_cache_dir）
         """
         self.project_path = Path(project_path).resolve()
-        self._add_project_to_path()
+        self.resolution_budget = resolution_budget
+        if config is None:
+            config = AnalysisConfig.from_pyproject(self.project_path / "pyproject.toml")
+        self.config = config
+        self.import_profile = import_profile
+        self.external_cache = ExternalCache(external_cache_dir) if external_cache else None
+        self._external_descriptions: Dict[str, Dict[str, Any]] = {}
+        self._external_members: Dict[str, Tuple[List[str], frozenset]] = {}
+        # 项目模块的导入 finder 只在各分析调用期间安装
+        self.context = AnalysisContext(self.project_path)
+    
+    def close(self) -> None:
+        """
+        释放分析状态
+        
+        清理分析期间导入的项目模块和路径缓存；之后再次分析会重新导入。
+        """
+        self.context.close()
     
-    def _add_project_to_path(self):
-        """将项目路径添加到Python路径中"""
-        if str(self.project_path) not in sys.path:
-            sys.path.insert(0, str(self.project_path))
+    def __enter__(self) -> "InheritanceAnalyzer":
+        return self
+    
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
     
     def find_python_packages(self) -> List[str]:
         """
@@ -41,19 +157,23 @@ class InheritanceAnalyzer:
         Returns:
             包名列表
         """
-        packages = []
-        
-        # 查找当前目录下的Python包
-        for item in self.project_path.iterdir():
-            if item.is_dir() and (item / "__init__.py").exists():
-                packages.append(item.name)
+        packages = set()
+        roots = self.context.roots
         
-        # 查找子目录中的包
-        for item in self.project_path.rglob("__init__.py"):
-            if item.parent != self.project_path:
-                rel_path = item.parent.relative_to(self.project_path)
-                package_name = ".".join(rel_path.parts)
-                packages.append(package_name)
+        # 自顶向下遍历，被排除的目录不再深入；src 布局中的包按 src 下的路径命名
+        for root in roots:
+            for dirpath, dirnames, filenames in os.walk(root):
+                current = Path(dirpath)
+                if current != root:
+                    package_name = ".".join(current.relative_to(root).parts)
+                    if self.config.is_excluded(package_name):
+                        dirnames[:] = []
+                        continue
+                    if "__init__.py" in filenames:
+                        packages.add(package_name)
+                else:
+                    dirnames[:] = [d for d in dirnames if current / d not in roots]
+                dirnames[:] = sorted(d for d in dirnames if not d.startswith((".", "__")))
         
         return sorted(packages)
     
@@ -67,65 +187,471 @@ class InheritanceAnalyzer:
         Returns:
             分析结果字典
         """
+        with self.context.importing(package_name):
+            return self._analyze_package(package_name)
+    
+    def _analyze_package(self, package_name: str) -> Dict[str, Any]:
+        profiler = ImportProfiler(package_name) if self.import_profile else None
+        try:
+            if profiler:
+                package = profiler.import_module(package_name)
+            else:
+                package = importlib.import_module(package_name)
+        except Exception as e:
+            if profiler:
+                profiler.finish()
+            return {"error": f"无法导入包 {package_name}: {e}"}
+        
+        result = self._new_result(package_name)
+        
+        # 扫描包中的所有模块
+        module_names = self._iter_module_names(package, package_name)
+        result["modules"] = self._analyze_modules(module_names, package_name,
+                                                  result["external_classes"],
+                                                  profiler=profiler)
+        
+        # 包内导入图与导入开销
+        if profiler:
+            result.update(profiler.finish())
+        
+        # 构建继承链
+        result["inheritance_chains"] = self._build_inheritance_chains(result["modules"])
+        self._flush_external_cache()
+        
+        return result
+    
+    def analyze_changed(self, package_name: str, since: str,
+                        cache: Optional[ResultCache] = None) -> Dict[str, Any]:
+        """
+        只重新分析自指定版本以来受变更影响的模块
+        
+        受影响的模块包括直接变更的模块、上次分析时工作区中有未提交修改的模块
+        （其缓存结果不对应任何提交），以及其中类的 MRO 触及这些模块中任一类的
+        模块；其余模块复用缓存结果。没有可用缓存时执行完整分析。
+        
+        Args:
+            package_name: 包名
+            since: Git 基准版本（如 origin/main）
+            cache: 结果缓存，默认为项目目录下的 .supermro_cache
+            
+        Returns:
+            分析结果字典，额外包含 changed_modules 和 reanalyzed_modules
+        """
+        with self.context.importing(package_name):
+            return self._analyze_changed(package_name, since, cache)
+    
+    def _analyze_changed(self, package_name: str, since: str,
+                         cache: Optional[ResultCache]) -> Dict[str, Any]:
+        if cache is None:
+            cache = ResultCache(self.project_path / CACHE_DIR_NAME)
+        
+        try:
+            head = resolve_revision(self.project_path)
+            dirty = dirty_modules(self.project_path, package_name, self.context.roots)
+        except GitError as e:
+            return {"error": f"无法读取 Git 版本: {e}"}
+        
+        entry = cache.load(package_name)
+        fingerprint = self.config.fingerprint()
+        if (entry is None or not entry.get("revision") or 
+                entry.get("config") != fingerprint):
+            result = self.analyze_package(package_name)
+            if "error" not in result:
+                result["changed_modules"] = []
+                result["reanalyzed_modules"] = list(result["modules"])
+                cache.save(package_name, result, head, fingerprint, dirty)
+            return result
+        
+        try:
+            changed = changed_modules_since(self.project_path, package_name,
+                                            since, entry["revision"], self.context.roots)
+        except GitError as e:
+            return {"error": f"无法获取变更文件: {e}"}
+        changed.update(entry.get("dirty", ()))
+        changed.discard(package_name)
+        
         try:
             package = importlib.import_module(package_name)
         except Exception as e:
             return {"error": f"无法导入包 {package_name}: {e}"}
         
-        result = {
+        previous = entry["result"]
+        current_modules = self._iter_module_names(package, package_name)
+        affected = affected_modules(previous, changed)
+        reanalyzed = [name for name in current_modules 
+                      if name in affected or name not in previous["modules"]]
+        result = self._new_result(package_name)
+        result["external_classes"].update(previous.get("external_classes", {}))
+        fresh = self._analyze_modules(reanalyzed, package_name, result["external_classes"])
+        
+        for module_name in current_modules:
+            if module_name in fresh:
+                result["modules"][module_name] = fresh[module_name]
+            elif module_name not in affected and module_name in previous["modules"]:
+                result["modules"][module_name] = previous["modules"][module_name]
+        
+        result["inheritance_chains"] = self._build_inheritance_chains(result["modules"])
+        result["changed_modules"] = sorted(changed)
+        result["reanalyzed_modules"] = reanalyzed
+        self._flush_external_cache()
+        
+        cache.save(package_name, result, head, fingerprint, dirty)
+        return result
+    
+    def iter_class_records(self, package_name: str,
+                           module_window: int = DEFAULT_MODULE_WINDOW) -> Iterator[Dict[str, Any]]:
+        """
+        逐模块分析并产出逐类记录（流式）
+        
+        每个模块分析完后立即产出其类记录（kind="class"），以及首次出现的包外类
+        （kind="external"），不在内存中累积结果。每分析 module_window 个模块，
+        就把本次导入的包内模块从 sys.modules 中移除，使驻留的模块对象不超过
+        一个窗口。
+        
+        Args:
+            package_name: 包名
+            module_window: 模块驻留窗口大小，0 表示不移除
+            
+        Raises:
+            ImportError: 包无法导入
+        """
+        with self.context.importing(package_name):
+            yield from self._iter_class_records(package_name, module_window)
+    
+    def _iter_class_records(self, package_name: str,
+                            module_window: int) -> Iterator[Dict[str, Any]]:
+        preloaded = set(sys.modules)
+        try:
+            package = importlib.import_module(package_name)
+        except Exception as e:
+            raise ImportError(f"无法导入包 {package_name}: {e}") from e
+        
+        module_names = self._iter_module_names(package, package_name)
+        del package
+        
+        # 已产出的包外类只保留名称
+        external: Dict[str, Any] = {}
+        claimed = ClaimedClasses()
+        
+        try:
+            for i, module_name in enumerate(module_names, 1):
+                modules = self._analyze_modules([module_name], package_name, external, claimed)
+                for module_info in modules.values():
+                    for class_name, class_info in module_info["classes"].items():
+                        yield dict(class_info, kind="class", module=module_name,
+                                   file=module_info["file"], **{"class": class_name})
+                del modules
+                
+                for name, info in external.items():
+                    if info is not None:
+                        yield dict(info, kind="external", **{"class": name})
+                        external[name] = None
+                
+                if module_window and i % module_window == 0:
+                    self._evict_modules(package_name, preloaded)
+                    claimed.evict()
+        finally:
+            self._flush_external_cache()
+            if module_window:
+                self._evict_modules(package_name, preloaded)
+    
+    def stream_package(self, package_name: str, sinks: Iterable[Any] = (),
+                       module_window: int = DEFAULT_MODULE_WINDOW) -> Dict[str, Any]:
+        """
+        以有界内存流式分析包，把逐类记录写入 sink
+        
+        内存中只保留继承骨架（模块.类名 -> 基类名元组），峰值内存上限见
+        streaming.memory_ceiling。
+        
+        Args:
+            package_name: 包名
+            sinks: 输出目标，见 streaming 模块
+            module_window: 模块驻留窗口大小
+            
+        Returns:
+            汇总信息：包名、模块数、类数和继承骨架
+        """
+        sinks = list(sinks)
+        skeleton: Dict[str, Tuple[str, ...]] = {}
+        module_count = 0
+        class_count = 0
+        last_module = None
+        
+        try:
+            for record in self.iter_class_records(package_name, module_window):
+                if record["kind"] == "class":
+                    # 不同模块中的同名类各占一项
+                    key = sys.intern(f"{record['module']}.{record['class']}")
+                    skeleton[key] = tuple(sys.intern(base) for base in record["bases"])
+                    class_count += 1
+                    if record["module"] != last_module:
+                        last_module = record["module"]
+                        module_count += 1
+                for sink in sinks:
+                    sink.write(record)
+        except BaseException as e:
+            for sink in sinks:
+                getattr(sink, "abort", sink.close)()
+            if isinstance(e, ImportError):
+                return {"error": str(e)}
+            raise
+        
+        for sink in sinks:
+            sink.close()
+        
+        return {
+            "package_name": package_name,
+            "modules": module_count,
+            "classes": class_count,
+            "skeleton": skeleton
+        }
+    
+    def _evict_modules(self, package_name: str, preloaded: set) -> None:
+        """从 sys.modules 中移除本次导入的包内模块并回收内存"""
+        prefix = package_name + "."
+        for name in list(sys.modules):
+            if name in preloaded or not (name == package_name or name.startswith(prefix)):
+                continue
+            module = sys.modules.pop(name)
+            parent_name, _, child = name.rpartition(".")
+            parent = sys.modules.get(parent_name)
+            if parent is not None and getattr(parent, child, None) is module:
+                delattr(parent, child)
+        gc.collect()
+    
+    def _new_result(self, package_name: str) -> Dict[str, Any]:
+        """创建空的分析结果"""
+        return {
             "package_name": package_name,
             "modules": {},
             "classes": {},
-            "inheritance_chains": {}
+            "inheritance_chains": {},
+            "external_classes": {}
         }
+    
+    def _iter_module_names(self, package: ModuleType, package_name: str) -> List[str]:
+        """
+        列出包中需要分析的模块名
         
-        # 扫描包中的所有模块
-        for _, module_name, _ in pkgutil.walk_packages(package.__path__, package_name + "."):
+        只读取文件系统，不导入任何模块；被排除的包整棵子树都不会被访问。
+        顺序与 pkgutil.walk_packages 相同（深度优先）。
+        """
+        module_names: List[str] = []
+        self._walk_modules(list(package.__path__), package_name + ".", module_names)
+        return module_names
+    
+    def _walk_modules(self, path: List[str], prefix: str, module_names: List[str]) -> None:
+        """递归收集模块名"""
+        for finder, name, ispkg in pkgutil.iter_modules(path, prefix):
+            if self.config.is_excluded(name):
+                continue
+            if self.config.is_included(name):
+                module_names.append(name)
+            # 只递归文件系统上的子包（zip 等其他来源的 finder 没有 path）
+            if ispkg and isinstance(finder, FileFinder):
+                sub_path = os.path.join(finder.path, name.rsplit(".", 1)[-1])
+                self._walk_modules([sub_path], name + ".", module_names)
+    
+    def _analyze_modules(self, module_names: Iterable[str], package_name: str,
+                         external: Optional[Dict[str, Any]] = None,
+                         claimed: Optional[ClaimedClasses] = None,
+                         profiler: Optional[ImportProfiler] = None) -> Dict[str, Any]:
+        """
+        导入并分析一组模块，跳过无法导入的模块
+        
+        external 用于收集 MRO 中出现的包外类（名称 -> 模块、基类、MRO、自有方法）；
+        提供 profiler 时通过它导入模块以记录导入开销。
+        """
+        import_module = profiler.import_module if profiler else importlib.import_module
+        if external is None:
+            external = {}
+        if claimed is None:
+            claimed = ClaimedClasses()
+        modules = {}
+        for module_name in module_names:
             try:
-                module = importlib.import_module(module_name)
-                module_info = self._analyze_module(module, package_name)
+                module = import_module(module_name)
+                module_info = self._analyze_module(module, package_name, claimed, external)
                 if module_info["classes"]:
-                    result["modules"][module_name] = module_info
+                    modules[module_name] = module_info
             except Exception as e:
                 print(f"⚠️ 跳过模块 {module_name}: {e}")
                 continue
-        
-        # 构建继承链
-        result["inheritance_chains"] = self._build_inheritance_chains(result["modules"])
-        
-        return result
+        return modules
     
-    def _analyze_module(self, module, package_name: str) -> Dict[str, Any]:
-        """分析单个模块"""
+    def _analyze_module(self, module: ModuleType, package_name: str,
+                        claimed: Optional[ClaimedClasses] = None,
+                        external: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        分析单个模块
+        
+        除了在当前模块中定义的类，还会收录绑定在当前模块、由包内工厂函数
+        或 type() 动态创建的类；claimed 记录已收录的动态类，避免被重复导出的
+        模块再次收录。
+        """
         module_file = getattr(module, '__file__', 'unknown')
         file_name = Path(module_file).name if module_file != 'unknown' else 'unknown'
+        if claimed is None:
+            claimed = ClaimedClasses()
+        if external is None:
+            external = {}
         
         classes = {}
         
         for name, cls in inspect.getmembers(module, inspect.isclass):
-            # 只处理在当前模块中定义的类
-            if (cls.__module__.startswith(package_name) and 
-                cls.__module__ == module.__name__):
-                
-                # 获取类的方法
-                methods = [method for method in dir(cls) 
-                          if not method.startswith('_') and 
-                          callable(getattr(cls, method, None))]
-                
-                classes[name] = {
-                    "name": cls.__name__,
-                    "module": cls.__module__,
-                    "file": file_name,
-                    "methods": methods,
-                    "mro": [c.__name__ for c in cls.mro()],
-                    "bases": [base.__name__ for base in cls.__bases__]
-                }
+            if not cls.__module__.startswith(package_name):
+                continue
+            
+            # 只处理在当前模块中定义的类，或绑定在此处的动态类
+            if cls.__module__ != module.__name__:
+                if not is_dynamic_class(cls) or not claimed.claim(cls, name):
+                    continue
+            
+            # 获取类的方法
+            methods = self._class_methods(cls, package_name)
+            mro = self._limit_external(cls.__mro__, package_name)
+            
+            classes[name] = {
+                "name": cls.__name__,
+                "module": cls.__module__,
+                "file": file_name,
+                "methods": methods,
+                "own_methods": self._own_methods(cls),
+                "mro": [c.__name__ for c in mro],
+                "qualified_mro": [f"{c.__module__}.{c.__name__}" for c in mro],
+                "bases": [base.__name__ for base in cls.__bases__],
+                "meta": describe_class(cls, module_file, self.resolution_budget)
+            }
+            
+            # 记录 MRO 中的包外类
+            for base in mro[1:]:
+                if (base is not object and base.__name__ not in external and
+                        not base.__module__.startswith(package_name)):
+                    external[base.__name__] = self._describe_external(base)
         
         return {
             "file": file_name,
             "classes": classes
         }
     
+    def _own_methods(self, cls: type) -> List[str]:
+        """获取类自身定义的（按可见性规则收录的）方法"""
+        return [name for name in cls.__dict__
+                if self.config.is_member_visible(name) and 
+                callable(getattr(cls, name, None))]
+    
+    def _limit_external(self, mro: Tuple[type, ...], package_name: str) -> List[type]:
+        """
+        按 external_depth 截断 MRO 中的包外类
+        
+        包内类始终保留，object 始终位于末尾。
+        """
+        limit = self.config.external_depth
+        if limit is None:
+            return list(mro)
+        
+        kept = []
+        external_count = 0
+        for c in mro:
+            if c is object or c.__module__.startswith(package_name):
+                kept.append(c)
+            elif external_count < limit:
+                external_count += 1
+                kept.append(c)
+        return kept
+    
+    def _class_methods(self, cls: type, package_name: str) -> List[str]:
+        """
+        获取类的全部方法（按可见性规则收录）
+        
+        结果与遍历 dir(cls) 相同，但包外基类的成员取自其缓存描述，不再逐个
+        getattr；元类自定义了 __dir__ 时（如 Enum）仍使用 dir()。
+        """
+        visible = self.config.is_member_visible
+        if type(cls).__dir__ is not type.__dir__:
+            return [name for name in dir(cls)
+                    if visible(name) and callable(getattr(cls, name, None))]
+        
+        resolved: Dict[str, bool] = {}
+        for c in cls.__mro__:
+            if c.__module__.startswith(package_name):
+                for name in c.__dict__:
+                    if name not in resolved:
+                        resolved[name] = callable(getattr(c, name, None))
+            else:
+                members, callables = self._members_of_external(c)
+                for name in members:
+                    if name not in resolved:
+                        resolved[name] = name in callables
+        return sorted(name for name, is_callable in resolved.items()
+                      if is_callable and visible(name))
+    
+    def _describe_external(self, cls: type) -> Dict[str, Any]:
+        """描述包外类"""
+        description = self._external_description(cls)
+        callables = set(description["callables"])
+        return {
+            "module": description["module"],
+            "bases": description["bases"],
+            "mro": description["mro"],
+            "own_methods": [name for name in description["members"]
+                            if name in callables and self.config.is_member_visible(name)]
+        }
+    
+    def _external_description(self, cls: type) -> Dict[str, Any]:
+        """
+        包外类的基类、MRO 和自身成员
+        
+        可以通过 __module__ 和 __qualname__ 找回的类在本次运行内只检查一次，
+        并写入按发行包版本分组的缓存；动态创建的类每次重新检查。
+        """
+        if is_dynamic_class(cls):
+            return self._introspect_external(cls)
+        
+        key = f"{cls.__module__}:{cls.__qualname__}"
+        description = self._external_descriptions.get(key)
+        if description is None:
+            cache = self.external_cache
+            if cache is not None:
+                description = cache.get(cls.__module__, cls.__qualname__)
+            if description is None:
+                description = self._introspect_external(cls)
+                if cache is not None:
+                    cache.put(cls.__module__, cls.__qualname__, description)
+            self._external_descriptions[key] = description
+        return description
+    
+    def _members_of_external(self, cls: type) -> Tuple[List[str], frozenset]:
+        """包外类的成员名与其中可调用的成员"""
+        key = f"{cls.__module__}:{cls.__qualname__}"
+        members = self._external_members.get(key)
+        if members is None:
+            description = self._external_description(cls)
+            members = (description["members"], frozenset(description["callables"]))
+            if not is_dynamic_class(cls):
+                self._external_members[key] = members
+        return members
+    
+    def _introspect_external(self, cls: type) -> Dict[str, Any]:
+        """检查包外类（不使用缓存）"""
+        members = list(cls.__dict__)
+        return {
+            "module": cls.__module__,
+            "bases": [base.__name__ for base in cls.__bases__],
+            "mro": [c.__name__ for c in cls.__mro__],
+            "members": members,
+            "callables": [name for name in members if callable(getattr(cls, name, None))]
+        }
+    
+    def _flush_external_cache(self) -> None:
+        """写出本次运行新检查的包外类描述"""
+        if self.external_cache is None:
+            return
+        try:
+            self.external_cache.flush()
+        except OSError as e:
+            print(f"⚠️ 无法写入包外类缓存: {e}")
+    
     def _build_inheritance_chains(self, modules: Dict[str, Any]) -> Dict[str, List[str]]:
         """构建继承链"""
         chains = {}
@@ -136,8 +662,8 @@ class InheritanceAnalyzer:
         
         return chains
     
-    def trace_method(self, class_name: str, method_name: str, 
-                    package_name: str) -> Optional[Dict[str, Any]]:
+    def trace_method(self, class_name: str, method_name: str, package_name: str,
+                     analysis_result: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         追踪方法在继承链中的定义位置
         
@@ -145,26 +671,123 @@ class InheritanceAnalyzer:
             class_name: 类名
             method_name: 方法名
             package_name: 包名
+            analysis_result: 同一个包已有的分析结果（可选，见 trace_methods）
             
         Returns:
             追踪结果
         """
-        try:
-            # 查找类
-            cls = self._find_class(class_name, package_name)
-            if not cls:
-                return {"error": f"未找到类 {class_name}"}
+        return self.trace_methods([(class_name, method_name)], package_name,
+                                  analysis_result)[0]
+    
+    def trace_methods(self, pairs: Iterable[Tuple[str, str]], package_name: str,
+                      analysis_result: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """
+        批量追踪方法在继承链中的定义位置
+        
+        提供 analysis_result 时直接基于其中按 模块.类名 记录的 MRO 和自有方法追踪，
+        不再遍历、导入模块；只有结果中没有记录的情况（方法按可见性规则未收录、
+        类定义在包的 __init__ 中、MRO 中的类无法唯一确定）才按完整路径导入对应的
+        单个模块，短名有歧义时与不提供结果时相同。否则所有类在一次模块遍历中
+        查找（找齐即停止）。重复的类/方法组合只追踪一次。类名可以是短名，
+        也可以是 模块.类名 形式的完整路径。
+        
+        Args:
+            pairs: (类名, 方法名) 序列
+            package_name: 包名
+            analysis_result: 同一个包已有的分析结果（可选）
             
-            # 追踪方法
+        Returns:
+            与 pairs 顺序一致的追踪结果，失败的条目包含 error
+        """
+        pairs = list(pairs)
+        traced: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        files: Dict[str, str] = {}
+        # 需要导入后追踪的组合 -> 查找类时使用的名称
+        live: Dict[Tuple[str, str], str] = {}
+        
+        if analysis_result is not None and "error" not in analysis_result:
+            index = _ResultIndex(analysis_result)
+            for key in dict.fromkeys(pairs):
+                class_name, method_name = key
+                if class_name in index.ambiguous:
+                    live[key] = class_name
+                    continue
+                found = index.find(class_name)
+                if found is None:
+                    live[key] = (class_name if "." in class_name
+                                 else f"{package_name}.{class_name}")
+                    continue
+                recorded = None
+                if self.config.is_member_visible(method_name):
+                    recorded = self._trace_recorded(
+                        class_name, method_name, found[1], index, files)
+                if recorded is None:
+                    live[key] = f"{found[0]}.{class_name.rpartition('.')[2]}"
+                else:
+                    traced[key] = recorded
+        else:
+            live = {key: key[0] for key in pairs}
+        
+        classes = self._find_classes(set(live.values()), package_name) if live else {}
+        for key, lookup in live.items():
+            class_name, method_name = key
+            cls = classes.get(lookup)
+            if cls is None:
+                traced[key] = {"class": class_name, "method": method_name,
+                               "error": f"未找到类 {class_name}"}
+            else:
+                traced[key] = self._trace(cls, class_name, method_name, files)
+        
+        return [traced[key] for key in pairs]
+    
+    def _trace_recorded(self, class_name: str, method_name: str, class_info: Dict[str, Any],
+                        index: "_ResultIndex",
+                        files: Dict[str, str]) -> Optional[Dict[str, Any]]:
+        """
+        基于分析结果沿 MRO 追踪单个方法
+        
+        包外类按 external_depth 截断的部分不在结果中，也不会出现在追踪链里。
+        MRO 中有无法唯一确定的类时返回 None。
+        """
+        owners = []
+        for qualified_name in class_info.get("qualified_mro") or ():
+            owner = index.owner(qualified_name)
+            if owner is None:
+                return None
+            owners.append((qualified_name.rpartition(".")[2], owner))
+        if len(owners) != len(class_info["mro"]):
+            return None
+        
+        method_chain = []
+        for ancestor, owner in owners:
+            if method_name not in owner[1]:
+                continue
+            module_name = owner[0]
+            if module_name not in files:
+                module = sys.modules.get(module_name)
+                files[module_name] = (getattr(module, "__file__", None) or
+                                      index.files.get(module_name) or "(built-in)")
+            method_chain.append({
+                "class": ancestor,
+                "module": module_name,
+                "file": files[module_name]
+            })
+        return {"class": class_name, "method": method_name, "chain": method_chain}
+    
+    def _trace(self, cls: type, class_name: str, method_name: str,
+               files: Dict[str, str]) -> Dict[str, Any]:
+        """沿 MRO 追踪单个方法，files 缓存模块名到文件路径的映射"""
+        try:
             method_chain = []
-            for c in cls.mro():
+            for c in cls.__mro__:
                 if method_name in c.__dict__:
-                    module = inspect.getmodule(c)
-                    file_path = getattr(module, '__file__', '(built-in)')
+                    if c.__module__ not in files:
+                        module = sys.modules.get(c.__module__) or inspect.getmodule(c)
+                        files[c.__module__] = getattr(module, '__file__', None) or '(built-in)'
                     method_chain.append({
                         "class": c.__name__,
                         "module": c.__module__,
-                        "file": file_path
+                        "file": files[c.__module__]
                     })
             
             return {
@@ -174,26 +797,71 @@ class InheritanceAnalyzer:
             }
             
         except Exception as e:
-            return {"error": f"追踪方法时出错: {e}"}
+            return {"class": class_name, "method": method_name,
+                    "error": f"追踪方法时出错: {e}"}
+    
+    def _find_classes(self, class_names: Iterable[str], package_name: str) -> Dict[str, type]:
+        """
+        查找一组类
+        
+        完整路径直接按模块导入；短名按包本身及其模块的遍历顺序查找第一个同名类，
+        全部找到后停止遍历。
+        """
+        with self.context.importing(package_name):
+            return self._import_classes(class_names, package_name)
     
-    def _find_class(self, class_name: str, package_name: str):
-        """查找指定类"""
+    def _import_classes(self, class_names: Iterable[str], package_name: str) -> Dict[str, type]:
+        found: Dict[str, type] = {}
+        remaining = set()
+        
+        for class_name in class_names:
+            if "." not in class_name:
+                remaining.add(class_name)
+                continue
+            module_name, _, attr = class_name.rpartition(".")
+            try:
+                obj = getattr(importlib.import_module(module_name), attr, None)
+            except Exception:
+                continue
+            if inspect.isclass(obj):
+                found[class_name] = obj
+        
+        if not remaining:
+            return found
+        
         try:
             package = importlib.import_module(package_name)
-            for _, module_name, _ in pkgutil.walk_packages(package.__path__, package_name + "."):
-                try:
-                    module = importlib.import_module(module_name)
-                    if hasattr(module, class_name):
-                        return getattr(module, class_name)
-                except Exception:
-                    continue
         except Exception:
-            pass
-        return None
+            return found
+        
+        module_names = [package_name] + self._iter_module_names(package, package_name)
+        for module_name in module_names:
+            try:
+                module = importlib.import_module(module_name)
+            except Exception:
+                continue
+            for class_name in remaining.intersection(vars(module)):
+                obj = getattr(module, class_name)
+                if inspect.isclass(obj):
+                    found[class_name] = obj
+                    remaining.discard(class_name)
+            if not remaining:
+                break
+        
+        return found
     
-    def print_analysis(self, package_name: str):
-        """打印分析结果"""
-        result = self.analyze_package(package_name)
+    def print_analysis(self, package_name: str, result: Optional[Dict[str, Any]] = None,
+                       module_names: Optional[Iterable[str]] = None) -> None:
+        """
+        打印分析结果
+        
+        Args:
+            package_name: 包名
+            result: 已有的分析结果，默认重新分析
+            module_names: 只打印这些模块，默认打印全部
+        """
+        if result is None:
+            result = self.analyze_package(package_name)
         
         if "error" in result:
             print(f"❌ 分析失败: {result['error']}")
@@ -201,11 +869,31 @@ class InheritanceAnalyzer:
         
         print(f"\n📦 扫描包：{package_name}\n{'='*60}")
         
+        selected = set(module_names) if module_names is not None else None
         for module_name, module_info in result["modules"].items():
+            if selected is not None and module_name not in selected:
+                continue
             print(f"\n📁 模块: {module_name} ({module_info['file']})")
             for class_name, class_info in module_info["classes"].items():
                 print(f"\n🧩 类: {class_name}")
                 for base in class_info["mro"]:
                     print("   →", base)
+                self._print_meta(class_info.get("meta"))
         
         print("\n✅ 扫描完成\n")
+    
+    def _print_meta(self, meta: Optional[Dict[str, Any]]) -> None:
+        """打印类的动态特征"""
+        if not meta or not has_dynamic_features(meta):
+            return
+        
+        if meta["metaclass"]:
+            print(f"   ⚙️ 元类: {' → '.join(meta['metaclass_mro'])}")
+        if meta["decorators"]:
+            print(f"   🎀 装饰器: {', '.join(meta['decorators'])}")
+        if meta["init_subclass_hooks"]:
+            print(f"   🪝 __init_subclass__: {', '.join(meta['init_subclass_hooks'])}")
+        if meta["dynamic"]:
+            print("   🏭 动态创建")
+        if meta["generated_methods"]:
+            print(f"   ✨ 生成的方法: {', '.join(meta['generated_methods'])}")
@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+分析结果缓存
+
+将分析结果以 JSON 形式保存在项目目录中，供增量分析复用；包外类的描述
+（MRO、成员）按所属发行包的名称和版本缓存在用户级缓存目录中，跨次运行、
+跨项目复用。
+"""
+
+import json
+import os
+import sys
+import sysconfig
+from pathlib import Path
+from typing import Dict, Any, Optional, Iterable, List, Union
+
+# 可选：Python 3.8 以下需要 importlib_metadata 识别发行包版本
+if sys.version_info >= (3, 8):
+    from importlib import metadata as importlib_metadata
+    HAS_METADATA = True
+else:
+    try:
+        import importlib_metadata
+        HAS_METADATA = True
+    except ImportError:
+        HAS_METADATA = False
+
+CACHE_DIR_NAME = ".supermro_cache"
+CACHE_FORMAT_VERSION = 5
+EXTERNAL_CACHE_DIR_NAME = "external"
+EXTERNAL_FORMAT_VERSION = 1
+USER_CACHE_DIR_NAME = "supermro"
+
+
+def default_external_cache_dir() -> Path:
+    """
+    包外类描述缓存的默认目录
+
+    $XDG_CACHE_HOME/supermro/external；未设置时 Windows 使用 %LOCALAPPDATA%，
+    其他系统使用 ~/.cache。
+    """
+    base = os.environ.get("XDG_CACHE_HOME")
+    if not base and os.name == "nt":
+        base = os.environ.get("LOCALAPPDATA")
+    cache_home = Path(base) if base else Path.home() / ".cache"
+    return cache_home / USER_CACHE_DIR_NAME / EXTERNAL_CACHE_DIR_NAME
+
+
+class ResultCache:
+    """按包名存储的分析结果缓存"""
+
+    def __init__(self, cache_dir: Union[str, Path]):
+        """
+        初始化缓存
+
+        Args:
+            cache_dir: 缓存目录
+        """
+        self.cache_dir = Path(cache_dir)
+
+    def _path_for(self, package_name: str) -> Path:
+        return self.cache_dir / f"{package_name}.json"
+
+    def load(self, package_name: str) -> Optional[Dict[str, Any]]:
+        """
+        读取缓存的分析结果
+
+        Returns:
+            缓存条目（包含 revision、dirty、config 和 result），缓存缺失或格式不兼容时返回 None
+        """
+        path = self._path_for(package_name)
+        try:
+            with open(path, encoding="utf-8") as f:
+                entry: Dict[str, Any] = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if entry.get("version") != CACHE_FORMAT_VERSION:
+            return None
+        return entry
+
+    def save(self, package_name: str, result: Dict[str, Any],
+             revision: Optional[str] = None, config: Optional[str] = None,
+             dirty: Iterable[str] = ()) -> None:
+        """
+        保存分析结果
+
+        Args:
+            package_name: 包名
+            result: 分析结果
+            revision: 结果对应的 Git 提交（可选）
+            config: 生成结果时的配置指纹（可选）
+            dirty: 分析时工作区中有未提交修改的模块，其结果与 revision 不一致
+        """
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        entry = {
+            "version": CACHE_FORMAT_VERSION,
+            "revision": revision,
+            "dirty": sorted(dirty),
+            "config": config,
+            "result": result,
+        }
+        path = self._path_for(package_name)
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entry, f, ensure_ascii=False)
+        tmp_path.replace(path)
+
+
+class ExternalCache:
+    """
+    包外类描述缓存
+
+    标准库中的类按 Python 实现和版本分组，第三方类按所属发行包的名称和
+    版本分组，每组一个 JSON 文件。以可编辑模式安装（pip install -e）或
+    无法确定发行包的模块不缓存，因为其源码可能在版本号不变的情况下改变。
+    """
+
+    def __init__(self, cache_dir: Union[str, Path, None] = None):
+        """
+        初始化缓存
+
+        Args:
+            cache_dir: 缓存目录，默认为 default_external_cache_dir()
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else default_external_cache_dir()
+        self._groups: Dict[str, Dict[str, Any]] = {}
+        self._dirty: set = set()
+        self._keys: Dict[str, Optional[str]] = {}
+        self._distributions: Optional[Dict[str, List[str]]] = None
+
+    def group_key(self, module_name: str) -> Optional[str]:
+        """
+        模块所属的缓存分组
+
+        Returns:
+            如 cpython-3.11.7 或 Django-4.2.1-cpython311；不可缓存时返回 None
+        """
+        top = module_name.partition(".")[0]
+        if top not in self._keys:
+            self._keys[top] = self._resolve_group(top)
+        return self._keys[top]
+
+    def _resolve_group(self, top: str) -> Optional[str]:
+        implementation = sys.implementation.name
+        version = sys.version_info
+        if _is_stdlib(top):
+            return f"{implementation}-{version.major}.{version.minor}.{version.micro}"
+        if not HAS_METADATA:
+            return None
+
+        # 发行包名通常与顶层模块名相同，先直接查找，避免扫描所有已安装的包
+        names = [top] if _provides(top) else None
+        if names is None:
+            if self._distributions is None:
+                self._distributions = _top_level_distributions()
+            names = sorted(set(self._distributions.get(top, ())))
+        if not names:
+            return None
+
+        parts = []
+        for name in names:
+            try:
+                dist = importlib_metadata.distribution(name)
+            except importlib_metadata.PackageNotFoundError:
+                return None
+            if _is_editable(dist):
+                return None
+            parts.append(f"{name}-{dist.version}")
+        return "+".join(parts) + f"-{implementation}{version.major}{version.minor}"
+
+    def _group(self, key: str) -> Dict[str, Any]:
+        """读取（必要时从磁盘加载）分组"""
+        group = self._groups.get(key)
+        if group is None:
+            group = {}
+            try:
+                with open(self._path_for(key), encoding="utf-8") as f:
+                    entry = json.load(f)
+                if entry.get("version") == EXTERNAL_FORMAT_VERSION:
+                    group = entry["classes"]
+            except (OSError, ValueError, KeyError):
+                pass
+            self._groups[key] = group
+        return group
+
+    def _path_for(self, key: str) -> Path:
+        return self.cache_dir / f"{key.replace('/', '_')}.json"
+
+    def get(self, module_name: str, qualname: str) -> Optional[Dict[str, Any]]:
+        """读取类描述，未缓存或不可缓存时返回 None"""
+        key = self.group_key(module_name)
+        if key is None:
+            return None
+        return self._group(key).get(f"{module_name}:{qualname}")
+
+    def put(self, module_name: str, qualname: str, description: Dict[str, Any]) -> None:
+        """记录类描述（在 flush 时写入磁盘）"""
+        key = self.group_key(module_name)
+        if key is None:
+            return
+        self._group(key)[f"{module_name}:{qualname}"] = description
+        self._dirty.add(key)
+
+    def flush(self) -> None:
+        """写出有变化的分组"""
+        if not self._dirty:
+            return
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        for key in sorted(self._dirty):
+            path = self._path_for(key)
+            tmp_path = path.with_suffix(".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"version": EXTERNAL_FORMAT_VERSION, "classes": self._groups[key]},
+                          f, ensure_ascii=False)
+            tmp_path.replace(path)
+        self._dirty.clear()
+
+
+def _is_stdlib(top: str) -> bool:
+    """顶层模块是否属于标准库"""
+    names = getattr(sys, "stdlib_module_names", None)
+    if names is not None:
+        return top in names or top in sys.builtin_module_names
+
+    if top in sys.builtin_module_names:
+        return True
+    module = sys.modules.get(top)
+    module_file = getattr(module, "__file__", None)
+    if not module_file:
+        return False
+    stdlib = sysconfig.get_paths()["stdlib"]
+    return module_file.startswith(stdlib) and "site-packages" not in module_file
+
+
+def _provides(top: str) -> bool:
+    """名为 top 的发行包是否提供同名顶层模块"""
+    try:
+        dist = importlib_metadata.distribution(top)
+    except importlib_metadata.PackageNotFoundError:
+        return False
+    top_level = dist.read_text("top_level.txt")
+    if top_level is not None:
+        return top in top_level.split()
+    return any(f.parts[0] in (top, f"{top}.py") for f in dist.files or ())
+
+
+def _top_level_distributions() -> Dict[str, List[str]]:
+    """顶层模块名 -> 提供它的发行包名称"""
+    packages_distributions = getattr(importlib_metadata, "packages_distributions", None)
+    if packages_distributions is not None:
+        distributions: Dict[str, List[str]] = packages_distributions()
+        return distributions
+
+    mapping: Dict[str, List[str]] = {}
+    for dist in importlib_metadata.distributions():
+        name = dist.metadata["Name"]
+        for top in (dist.read_text("top_level.txt") or "").split():
+            mapping.setdefault(top, []).append(name)
+    return mapping
+
+
+def _is_editable(dist: Any) -> bool:
+    """发行包是否以可编辑模式安装"""
+    try:
+        direct_url = json.loads(dist.read_text("direct_url.json") or "{}")
+    except ValueError:
+        return False
+    return bool(direct_url.get("dir_info", {}).get("editable"))
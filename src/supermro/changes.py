@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+变更检测
+
+基于本地 Git 仓库确定需要重新分析的范围，支持：
+- 读取自指定版本以来变更的文件列表
+- 将文件映射为包内模块名
+- 计算受影响模块的传递闭包（MRO 触及变更类的所有模块）
+"""
+
+import subprocess
+from pathlib import Path
+from typing import List, Dict, Any, Iterable, Optional, Set
+
+
+class GitError(RuntimeError):
+    """Git 命令执行失败"""
+
+
+def _run_git(repo_path: Path, *args: str) -> str:
+    """在仓库中执行 git 命令并返回标准输出"""
+    try:
+        completed = subprocess.run(
+            ["git", *args],
+            cwd=str(repo_path),
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            universal_newlines=True,
+            check=False,
+        )
+    except OSError as e:
+        raise GitError(f"无法执行 git: {e}")
+    if completed.returncode != 0:
+        raise GitError(completed.stderr.strip() or f"git {' '.join(args)} 执行失败")
+    return completed.stdout
+
+
+def resolve_revision(repo_path: Path, rev: str = "HEAD") -> str:
+    """将版本号解析为完整的提交哈希"""
+    return _run_git(repo_path, "rev-parse", "--verify", f"{rev}^{{commit}}").strip()
+
+
+def get_changed_files(repo_path: Path, rev: str) -> List[Path]:
+    """
+    获取自指定版本以来变更的文件
+
+    包括已提交、已暂存、工作区中的修改以及未跟踪的新文件。
+
+    Args:
+        repo_path: 仓库内任意路径
+        rev: 对比的基准版本
+
+    Returns:
+        变更文件的绝对路径列表
+    """
+    root = Path(_run_git(repo_path, "rev-parse", "--show-toplevel").strip())
+    diff = _run_git(root, "diff", "--name-only", rev, "--")
+    untracked = _run_git(root, "ls-files", "--others", "--exclude-standard")
+
+    files = []
+    seen = set()
+    for line in (diff + untracked).splitlines():
+        line = line.strip()
+        if line and line not in seen:
+            seen.add(line)
+            files.append(root / line)
+    return files
+
+
+def files_to_modules(files: Iterable[Path], project_path: Path,
+                     package_name: str, roots: Optional[Iterable[Path]] = None) -> Set[str]:
+    """
+    将文件路径映射为包内的模块名
+
+    Args:
+        files: 文件路径
+        project_path: 项目路径（包所在的根目录）
+        package_name: 包名
+        roots: 源码根目录（如 src 布局的 src/），默认为项目路径
+
+    Returns:
+        属于该包的模块名集合
+    """
+    roots = [Path(root).resolve() for root in (roots or [project_path])]
+    modules = set()
+
+    for file in files:
+        file = Path(file)
+        if file.suffix != ".py":
+            continue
+        file = file.resolve()
+
+        for root in roots:
+            try:
+                parts = file.relative_to(root).with_suffix("").parts
+            except ValueError:
+                continue
+            if parts and parts[-1] == "__init__":
+                parts = parts[:-1]
+            module_name = ".".join(parts)
+
+            if module_name == package_name or module_name.startswith(package_name + "."):
+                modules.add(module_name)
+                break
+
+    return modules
+
+
+def affected_modules(previous: Dict[str, Any], changed_modules: Iterable[str]) -> Set[str]:
+    """
+    计算需要重新分析的模块闭包
+
+    MRO 本身已经是传递的，因此只需一次遍历：凡是有类的 MRO 中出现了
+    变更模块所定义的类，其所在模块就属于闭包。
+
+    Args:
+        previous: 上一次的分析结果
+        changed_modules: 直接变更的模块
+
+    Returns:
+        受影响的模块名集合（包含直接变更的模块）
+    """
+    affected = set(changed_modules)
+    modules = previous.get("modules", {})
+
+    changed_classes = set()
+    for module_name in affected:
+        module_info = modules.get(module_name)
+        if module_info:
+            changed_classes.update(module_info["classes"])
+
+    if not changed_classes:
+        return affected
+
+    for module_name, module_info in modules.items():
+        if module_name in affected:
+            continue
+        for class_info in module_info["classes"].values():
+            if not changed_classes.isdisjoint(class_info["mro"]):
+                affected.add(module_name)
+                break
+
+    return affected
+
+
+def dirty_modules(project_path: Path, package_name: str,
+                  roots: Optional[Iterable[Path]] = None) -> Set[str]:
+    """
+    工作区中相对 HEAD 有未提交修改（或未跟踪）的包内模块
+
+    基于这些文件生成的结果并不对应 HEAD 提交，之后即使修改被撤销也必须重新分析。
+    """
+    return files_to_modules(get_changed_files(project_path, "HEAD"),
+                            project_path, package_name, roots)
+
+
+def changed_modules_since(project_path: Path, package_name: str, rev: str,
+                          cached_revision: Optional[str] = None,
+                          roots: Optional[Iterable[Path]] = None) -> Set[str]:
+    """
+    获取自指定版本以来变更的包内模块
+
+    如果缓存结果来自另一个提交，还会合并自该提交以来的变更，
+    保证复用的缓存部分与当前工作区一致。
+    """
+    files = get_changed_files(project_path, rev)
+    if cached_revision and cached_revision != resolve_revision(project_path, rev):
+        files.extend(get_changed_files(project_path, cached_revision))
+    return files_to_modules(files, project_path, package_name, roots)
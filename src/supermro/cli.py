@@ -10,12 +10,23 @@
 """
 
 import sys
+import json
 import argparse
 from pathlib import Path
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from .analyzer import InheritanceAnalyzer
+from .config import AnalysisConfig
 from .visualizer import InheritanceVisualizer
+from .shards import SPLIT_MODES
+from .dynamic import DEFAULT_RESOLUTION_BUDGET
+from .metrics import HierarchyMetrics, SORT_KEYS
+from .linearization import C3Linearizer, LinearizationError
+from .store import SqliteIndex, DEFAULT_DB_NAME
+from .tables import format_rows, TABLE_FORMATS
+from .streaming import DEFAULT_MODULE_WINDOW, open_sink
+from .imports import build_import_report
+from .changes import GitError, resolve_revision
 
 
 def main():
@@ -28,7 +39,15 @@ def main():
   python -m supermro                    # 在当前目录分析
   python -m supermro --package myapp   # 分析指定包
   python -m supermro --visualize       # 生成可视化图
-  python -m supermro --trace           # 追踪方法定义
+  python -m supermro --trace           # 追踪方法定义（交互式）
+  python -m supermro --trace Dog.speak --trace Cat.speak --trace-format json  # 批量追踪
+  python -m supermro --html            # 生成交互式 HTML 报告
+  python -m supermro --split-by module --jobs 8  # 每个模块一张图，并行渲染并生成索引页
+  python -m supermro --metrics --sort-by transitive_subclasses --top 20  # 热点排名
+  python -m supermro --db index.sqlite # 写入 SQLite 索引，供 supermro-query 查询
+  python -m supermro --stream out.jsonl # 有界内存流式分析（.jsonl/.json/.sqlite）
+  python -m supermro --import-report 15 # 包内导入图：最慢/最占内存的模块与导入环
+  python -m supermro --changed-since origin/main  # 只分析变更影响的模块
         """
     )
     
@@ -43,15 +62,140 @@ def main():
         help="生成可视化图"
     )
     
+    parser.add_argument(
+        "--split-by",
+        choices=SPLIT_MODES,
+        help="按模块或根类拆分为多张图并行渲染，并生成索引页（输出目录由 --output 指定）"
+    )
+    
+    parser.add_argument(
+        "--split-format",
+        default="svg",
+        help="拆分渲染的输出格式（默认 svg）"
+    )
+    
+    parser.add_argument(
+        "--jobs", "-j",
+        type=positive_int,
+        metavar="N",
+        help="拆分渲染的并行进程数（默认为 CPU 核数）"
+    )
+    
+    parser.add_argument(
+        "--html",
+        nargs="?",
+        const="",
+        metavar="PATH",
+        help="生成自包含的交互式 HTML 报告（默认 {包名}_inheritance.html）"
+    )
+    
+    parser.add_argument(
+        "--metrics",
+        nargs="?",
+        const="-",
+        metavar="PATH",
+        help="输出继承层次指标表（深度、子类数、菱形继承、多层重写、C3 冲突），默认打印到终端"
+    )
+    
+    parser.add_argument(
+        "--metrics-format",
+        choices=["text", "csv", "json"],
+        default="text",
+        help="指标表格式（默认 text）"
+    )
+    
+    parser.add_argument(
+        "--sort-by",
+        choices=SORT_KEYS,
+        help="指标表按该列降序排序"
+    )
+    
+    parser.add_argument(
+        "--top",
+        type=int,
+        help="指标表只保留前 N 行"
+    )
+    
+    parser.add_argument(
+        "--db",
+        nargs="?",
+        const=DEFAULT_DB_NAME,
+        metavar="PATH",
+        help=f"将分析结果写入 SQLite 索引（默认 {DEFAULT_DB_NAME}）"
+    )
+    
+    parser.add_argument(
+        "--stream",
+        metavar="PATH",
+        help="流式分析并逐类写出记录（.jsonl 为 JSON Lines，.sqlite/.db 为索引，其他为快照 JSON），内存只保留继承骨架"
+    )
+    
+    parser.add_argument(
+        "--module-window",
+        type=int,
+        default=DEFAULT_MODULE_WINDOW,
+        help=f"流式分析时每分析多少个模块清理一次已导入模块（默认 {DEFAULT_MODULE_WINDOW}，0 表示不清理）"
+    )
+    
+    parser.add_argument(
+        "--import-report",
+        nargs="?",
+        const=10,
+        type=int,
+        metavar="N",
+        help="记录包内导入图和每个模块的累计导入耗时/内存增量，输出前 N 名（默认 10）和导入环"
+    )
+    
     parser.add_argument(
         "--trace", "-t",
-        action="store_true",
-        help="追踪方法定义"
+        action="append",
+        nargs="?",
+        const="",
+        metavar="CLASS.METHOD",
+        help="追踪方法定义；不带参数时交互式输入，可重复指定多个 类名.方法名"
+    )
+    
+    parser.add_argument(
+        "--trace-file",
+        metavar="PATH",
+        help="从文件批量读取要追踪的方法，每行一个 类名.方法名（或 类名 方法名），# 开头为注释"
+    )
+    
+    parser.add_argument(
+        "--trace-format",
+        choices=TABLE_FORMATS,
+        default="text",
+        help="批量追踪结果的输出格式（默认 text）"
     )
     
     parser.add_argument(
         "--output", "-o",
-        help="输出文件路径"
+        help="输出文件路径（--split-by 时为输出目录）"
+    )
+    
+    parser.add_argument(
+        "--changed-since",
+        metavar="REV",
+        help="只重新分析自指定 Git 版本以来受变更影响的模块，其余复用缓存"
+    )
+    
+    parser.add_argument(
+        "--no-external-cache",
+        action="store_true",
+        help="不读写包外类缓存（默认在 ~/.cache/supermro 中按发行包版本缓存第三方和标准库类的 MRO 与方法）"
+    )
+    
+    parser.add_argument(
+        "--resolution-budget",
+        type=int,
+        default=DEFAULT_RESOLUTION_BUDGET,
+        help=f"识别元类/装饰器特征时每个类最多检查的成员数（默认 {DEFAULT_RESOLUTION_BUDGET}）"
+    )
+    
+    parser.add_argument(
+        "--config",
+        metavar="PYPROJECT",
+        help="读取 [tool.supermro] 配置的文件（默认为项目路径下的 pyproject.toml）"
     )
     
     parser.add_argument(
@@ -63,8 +207,18 @@ def main():
     args = parser.parse_args()
     
     # 创建分析器
-    analyzer = InheritanceAnalyzer(args.project_path)
-    
+    config = AnalysisConfig.from_pyproject(Path(args.config)) if args.config else None
+    analyzer = InheritanceAnalyzer(args.project_path, args.resolution_budget, config,
+                                   import_profile=args.import_report is not None,
+                                   external_cache=not args.no_external_cache)
+    try:
+        run(args, analyzer)
+    finally:
+        analyzer.close()
+
+
+def run(args: argparse.Namespace, analyzer: InheritanceAnalyzer) -> None:
+    """按命令行参数执行分析和输出"""
     # 自动检测包
     if not args.package:
         packages = analyzer.find_python_packages()
@@ -89,15 +243,36 @@ def main():
     else:
         package_name = args.package
     
+    # 流式分析
+    if args.stream:
+        print(f"\n📦 开始流式分析包: {package_name}")
+        sink = open_sink(args.stream, package_name, analyzer.project_path.name,
+                         _current_revision(analyzer.project_path))
+        summary = analyzer.stream_package(package_name, [sink], args.module_window)
+        if "error" in summary:
+            print(f"❌ 分析失败: {summary['error']}")
+        else:
+            print(f"✅ 已写出 {summary['modules']} 个模块、{summary['classes']} 个类: "
+                  f"{Path(args.stream).absolute()}")
+        return
+    
     # 分析包
     print(f"\n📦 开始分析包: {package_name}")
-    analyzer.print_analysis(package_name)
+    if args.changed_since:
+        analysis_result = analyzer.analyze_changed(package_name, args.changed_since)
+        if "error" not in analysis_result:
+            print(f"🔍 变更模块: {len(analysis_result['changed_modules'])} 个，"
+                  f"重新分析: {len(analysis_result['reanalyzed_modules'])} 个")
+        analyzer.print_analysis(package_name, analysis_result,
+                                analysis_result.get("reanalyzed_modules"))
+    else:
+        analysis_result = analyzer.analyze_package(package_name)
+        analyzer.print_analysis(package_name, analysis_result)
     
     # 生成可视化图
     if args.visualize:
         print("\n🎨 生成可视化图...")
         visualizer = InheritanceVisualizer()
-        analysis_result = analyzer.analyze_package(package_name)
         
         if "error" not in analysis_result:
             output_file = visualizer.visualize_project_mro(
@@ -109,27 +284,302 @@ def main():
         else:
             print(f"❌ 无法生成可视化图: {analysis_result['error']}")
     
+    # 拆分渲染
+    if args.split_by:
+        print(f"\n🎨 按{'模块' if args.split_by == 'module' else '根类'}拆分生成可视化图...")
+        if "error" not in analysis_result:
+            InheritanceVisualizer().visualize_shards(
+                analysis_result, args.split_by, args.output, args.split_format, args.jobs)
+        else:
+            print(f"❌ 无法生成可视化图: {analysis_result['error']}")
+    
+    # 生成交互式报告
+    if args.html is not None:
+        print("\n🌐 生成交互式 HTML 报告...")
+        if "error" not in analysis_result:
+            InheritanceVisualizer().export_html(analysis_result, args.html or None)
+        else:
+            print(f"❌ 无法生成报告: {analysis_result['error']}")
+    
+    # 继承层次指标
+    if args.metrics is not None:
+        if "error" not in analysis_result:
+            print_metrics(analysis_result, args.metrics, args.metrics_format,
+                          args.sort_by, args.top)
+        else:
+            print(f"❌ 无法计算指标: {analysis_result['error']}")
+    
+    # 导入开销报告
+    if args.import_report is not None and "import_costs" in analysis_result:
+        print_import_report(analysis_result, args.import_report)
+    
+    # 写入 SQLite 索引
+    if args.db is not None:
+        if "error" not in analysis_result:
+            write_index(analysis_result, args.db, analyzer.project_path)
+        else:
+            print(f"❌ 无法写入索引: {analysis_result['error']}")
+    
     # 方法追踪
-    if args.trace:
+    try:
+        pairs = [parse_trace_spec(spec) for spec in args.trace or () if spec]
+        if args.trace_file:
+            pairs.extend(read_trace_file(args.trace_file))
+    except (OSError, ValueError) as e:
+        print(f"❌ {e}")
+        return
+    if pairs:
+        print_trace_table(analyzer.trace_methods(pairs, package_name, analysis_result),
+                          args.trace_format)
+    elif args.trace:
         print("\n🔍 方法追踪模式")
         try:
             class_name = input("请输入类名: ").strip()
             method_name = input("请输入方法名: ").strip()
             
             if class_name and method_name:
-                result = analyzer.trace_method(class_name, method_name, package_name)
-                if "error" in result:
-                    print(f"❌ {result['error']}")
-                else:
-                    print(f"\n🔍 {class_name}.{method_name}() 调用顺序:")
-                    for item in result["chain"]:
-                        print(f"  🧭 {item['class']}.{method_name}() 定义于 {item['file']}")
+                print_trace(analyzer.trace_method(class_name, method_name, package_name,
+                                                  analysis_result))
             else:
                 print("❌ 类名和方法名不能为空")
         except (EOFError, KeyboardInterrupt):
             print("\n跳过方法追踪")
 
 
+def positive_int(value: str) -> int:
+    """argparse 类型：正整数"""
+    try:
+        number = int(value)
+    except ValueError:
+        number = 0
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"必须为正整数: {value}")
+    return number
+
+
+def parse_trace_spec(spec: str) -> Tuple[str, str]:
+    """解析 类名.方法名 或 类名 方法名，类名可以带模块路径"""
+    parts = spec.split()
+    if len(parts) == 1:
+        parts = list(parts[0].rpartition(".")[::2])
+    if len(parts) == 2 and all(parts):
+        return parts[0], parts[1]
+    raise ValueError(f"无法解析追踪目标 {spec!r}，应为 类名.方法名")
+
+
+def read_trace_file(path: str) -> List[Tuple[str, str]]:
+    """读取追踪文件，跳过空行和 # 注释"""
+    pairs = []
+    for line in Path(path).read_text(encoding="utf-8").splitlines():
+        line = line.split("#", 1)[0].strip()
+        if line:
+            pairs.append(parse_trace_spec(line))
+    return pairs
+
+
+def print_trace(result: Dict[str, Any]) -> None:
+    """输出单个方法的追踪结果"""
+    if "error" in result:
+        print(f"❌ {result['error']}")
+        return
+    print(f"\n🔍 {result['class']}.{result['method']}() 调用顺序:")
+    for item in result["chain"]:
+        print(f"  🧭 {item['class']}.{result['method']}() 定义于 {item['file']}")
+
+
+TRACE_COLUMNS = ["class", "method", "order", "defined_in", "module", "file", "error"]
+
+
+def trace_rows(results: List[Dict[str, Any]]) -> List[dict]:
+    """将追踪结果展开为表格行，每个定义位置一行"""
+    rows = []
+    for result in results:
+        base = {"class": result["class"], "method": result["method"]}
+        if "error" in result:
+            rows.append(dict(base, error=result["error"]))
+        elif not result["chain"]:
+            rows.append(dict(base, error="MRO 中没有类定义该方法"))
+        for order, item in enumerate(result.get("chain", ())):
+            rows.append(dict(base, order=order, defined_in=item["class"],
+                             module=item["module"], file=item["file"]))
+    return rows
+
+
+def print_trace_table(results: List[Dict[str, Any]], fmt: str = "text") -> None:
+    """以表格或 JSON 输出批量追踪结果"""
+    if fmt == "json":
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+        return
+    print(format_rows(trace_rows(results), TRACE_COLUMNS, fmt), end="")
+
+
+def print_metrics(analysis_result: Dict[str, Any], output: str = "-", fmt: str = "text",
+                  sort_by: Optional[str] = None, top: Optional[int] = None) -> None:
+    """输出继承层次指标表"""
+    metrics = HierarchyMetrics(analysis_result)
+    table = metrics.format_table(fmt, sort_by, top)
+    
+    if output == "-":
+        print("\n📊 继承层次指标")
+        print(table)
+    else:
+        Path(output).write_text(table, encoding="utf-8")
+        print(f"\n📊 指标表已保存: {Path(output).absolute()}")
+    
+    failures = metrics.compute()["c3_failures"]
+    if failures and fmt != "json":
+        print(f"⚠️ {len(failures)} 个类无法通过 C3 线性化:")
+        for failure in failures:
+            print(f"  ❌ {failure['class']}: {failure['reason']}")
+
+
+def print_import_report(analysis_result: Dict[str, Any], top: int = 10) -> None:
+    """输出导入开销排行与导入环"""
+    report = build_import_report(analysis_result, top)
+    
+    print("\n⏱️ 导入耗时最多的模块（累计，含首次导入的依赖）")
+    for row in report["slowest"]:
+        row["ms"] = round(row["seconds"] * 1000, 2)
+    print(format_rows(report["slowest"], ["module", "ms", "imports"]), end="")
+    
+    if report["heaviest"]:
+        print("\n🧠 内存增量最大的模块")
+        for row in report["heaviest"]:
+            row["memory_kb"] = round(row["memory_kb"], 1)
+        print(format_rows(report["heaviest"], ["module", "memory_kb", "imports"]), end="")
+    
+    if report["cycles"]:
+        print(f"\n🔁 发现 {len(report['cycles'])} 个导入环:")
+        for cycle in report["cycles"]:
+            print(f"  ⚠️ {' ↔ '.join(cycle)}")
+    else:
+        print("\n✅ 未发现导入环")
+
+
+def _current_revision(project_path: Path) -> Optional[str]:
+    """获取项目当前的 Git 提交，非 Git 仓库时返回 None"""
+    try:
+        return resolve_revision(project_path)
+    except GitError:
+        return None
+
+
+def write_index(analysis_result: Dict[str, Any], db_path: str, project_path: Path) -> None:
+    """将分析结果写入 SQLite 索引"""
+    with SqliteIndex(db_path) as index:
+        run_id = index.write(analysis_result, project_path.name,
+                             _current_revision(project_path))
+    print(f"\n🗄️ 已写入索引 {Path(db_path).absolute()} (run {run_id})")
+
+
+def query_main(argv: Optional[List[str]] = None) -> None:
+    """SQLite 索引查询入口"""
+    parser = argparse.ArgumentParser(
+        prog="supermro-query",
+        description="查询 SuperMro 的 SQLite 继承索引（无需重新扫描源码）",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+示例用法:
+  supermro-query overrides process --under BaseProcessor
+  supermro-query subclasses BaseModel --direct
+  supermro-query mro TextProcessor
+  supermro-query owner TextProcessor process
+  supermro-query whatif TextProcessor --add-base LoggingMixin --impact
+  supermro-query runs
+        """
+    )
+    parser.add_argument("--db", default=DEFAULT_DB_NAME, help=f"索引文件（默认 {DEFAULT_DB_NAME}）")
+    parser.add_argument("--project", help="只查询该项目")
+    parser.add_argument("--run", type=int, help="只查询该 run（默认每个项目/包的最新 run）")
+    parser.add_argument("--format", choices=TABLE_FORMATS, default="text", help="输出格式")
+    
+    commands = parser.add_subparsers(dest="command")
+    commands.required = True
+    
+    overrides = commands.add_parser("overrides", help="自身重写了某方法的类")
+    overrides.add_argument("method")
+    overrides.add_argument("--under", help="只包含该基类的子类")
+    
+    subclasses = commands.add_parser("subclasses", help="某个类的子类")
+    subclasses.add_argument("base")
+    subclasses.add_argument("--direct", action="store_true", help="只返回直接子类")
+    
+    mro = commands.add_parser("mro", help="类的 MRO")
+    mro.add_argument("class_name")
+    
+    owner = commands.add_parser("owner", help="类上某方法的实际定义者")
+    owner.add_argument("class_name")
+    owner.add_argument("method")
+    
+    whatif = commands.add_parser("whatif", help="假如修改基类列表后的 MRO（按 C3 规则推算）")
+    whatif.add_argument("class_name")
+    whatif.add_argument("--add-base", action="append", default=[], metavar="BASE",
+                        help="追加到基类列表末尾（可重复）")
+    whatif.add_argument("--remove-base", action="append", default=[], metavar="BASE",
+                        help="从基类列表中移除（可重复）")
+    whatif.add_argument("--bases", nargs="*", metavar="BASE",
+                        help="直接指定整个基类列表（可用于尚不存在的新类）")
+    whatif.add_argument("--impact", action="store_true", help="列出 MRO 会改变的所有类（含子类）")
+    
+    commands.add_parser("runs", help="列出已索引的 run")
+    
+    args = parser.parse_args(argv)
+    
+    if not Path(args.db).exists():
+        print(f"❌ 索引不存在: {args.db}（先运行 supermro --db {args.db}）")
+        return
+    
+    with SqliteIndex(args.db) as index:
+        scope = {"project": args.project, "run_id": args.run}
+        if args.command == "overrides":
+            rows = index.overrides(args.method, args.under, **scope)
+            columns = ["project", "class", "module", "file"]
+        elif args.command == "subclasses":
+            rows = index.subclasses(args.base, args.direct, **scope)
+            columns = ["project", "class", "module", "file"]
+        elif args.command == "mro":
+            rows = index.mro(args.class_name, **scope)
+            columns = ["project", "module", "position", "ancestor"]
+        elif args.command == "owner":
+            rows = index.owner(args.class_name, args.method, **scope)
+            columns = ["project", "class", "module", "method", "owner"]
+        elif args.command == "whatif":
+            rows, columns = what_if_rows(index, args, scope)
+        else:
+            rows = index.runs(args.project)
+            columns = ["run", "project", "package", "revision", "classes"]
+    
+    print(format_rows(rows, columns, args.format), end="")
+
+
+def what_if_rows(index: SqliteIndex, args: argparse.Namespace, scope: dict) -> Tuple[List[dict], List[str]]:
+    """在每个项目的继承图上推算修改基类列表后的 MRO，无法线性化时打印诊断"""
+    change = {"add": args.add_base, "remove": args.remove_base, "bases": args.bases}
+    rows: List[Dict[str, Any]] = []
+    for project, graph in index.hierarchy(**scope).items():
+        linearizer = C3Linearizer(graph["bases"], graph["fixed"])
+        if args.bases is None and args.class_name not in graph["bases"]:
+            continue
+        try:
+            if args.impact:
+                for class_name, mro in linearizer.impact(args.class_name, **change).items():
+                    if isinstance(mro, LinearizationError):
+                        print(f"❌ {project}: {mro.describe()}")
+                    else:
+                        rows.append({"project": project, "class": class_name,
+                                     "mro": " → ".join(mro)})
+            else:
+                mro = linearizer.what_if(args.class_name, **change)
+                rows.extend({"project": project, "position": i, "ancestor": ancestor}
+                            for i, ancestor in enumerate(mro))
+        except LinearizationError as e:
+            print(f"❌ {project}: {e.describe()}")
+    
+    if args.impact:
+        return rows, ["project", "class", "mro"]
+    return rows, ["project", "position", "ancestor"]
+
+
 def interactive_mode():
     """交互式模式"""
     print("🚀 SuperMro - Python 继承关系分析工具")
@@ -141,7 +591,14 @@ def interactive_mode():
         project_path = "."
     
     analyzer = InheritanceAnalyzer(project_path)
-    
+    try:
+        interactive_session(analyzer)
+    finally:
+        analyzer.close()
+
+
+def interactive_session(analyzer: InheritanceAnalyzer) -> None:
+    """交互式分析一个项目"""
     # 查找包
     packages = analyzer.find_python_packages()
     if not packages:
@@ -160,8 +617,9 @@ def interactive_mode():
         print("❌ 无效选择，使用第一个包")
         package_name = packages[0]
     
-    # 分析
-    analyzer.print_analysis(package_name)
+    # 分析（结果供可视化和方法追踪复用）
+    analysis_result = analyzer.analyze_package(package_name)
+    analyzer.print_analysis(package_name, analysis_result)
     
     # 询问是否生成可视化图
     try:
@@ -169,7 +627,6 @@ def interactive_mode():
         if visualize == "y":
             print("\n🎨 生成可视化图...")
             visualizer = InheritanceVisualizer()
-            analysis_result = analyzer.analyze_package(package_name)
             
             if "error" not in analysis_result:
                 visualizer.visualize_project_mro(analysis_result)
@@ -186,13 +643,8 @@ def interactive_mode():
             method_name = input("请输入方法名: ").strip()
             
             if class_name and method_name:
-                result = analyzer.trace_method(class_name, method_name, package_name)
-                if "error" in result:
-                    print(f"❌ {result['error']}")
-                else:
-                    print(f"\n🔍 {class_name}.{method_name}() 调用顺序:")
-                    for item in result["chain"]:
-                        print(f"  🧭 {item['class']}.{method_name}() 定义于 {item['file']}")
+                print_trace(analyzer.trace_method(class_name, method_name, package_name,
+                                                  analysis_result))
             else:
                 print("❌ 类名和方法名不能为空")
     except (EOFError, KeyboardInterrupt):
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+分析范围配置
+
+从 pyproject.toml 的 [tool.supermro] 表读取分析范围，支持：
+- 模块包含/排除规则（按点分模块名匹配的 glob）
+- 成员可见性规则
+- 包外基类的深度限制
+
+示例::
+
+    [tool.supermro]
+    include = ["myapp.*"]
+    exclude = ["*.tests", "*.migrations", "myapp.vendor"]
+    members = "public"        # public | protected | all
+    external-depth = 2        # 每条 MRO 最多保留的包外类数量
+"""
+
+import json
+import sys
+from dataclasses import dataclass, field, asdict
+from fnmatch import fnmatchcase
+from pathlib import Path
+from typing import List, Dict, Any, Optional
+
+# 可选：Python 3.11 以下需要 tomli 解析 pyproject.toml
+if sys.version_info >= (3, 11):
+    import tomllib
+    HAS_TOML = True
+else:
+    try:
+        import tomli as tomllib
+        HAS_TOML = True
+    except ImportError:
+        HAS_TOML = False
+
+MEMBER_VISIBILITY = ("public", "protected", "all")
+
+
+@dataclass
+class AnalysisConfig:
+    """分析范围配置"""
+
+    include: List[str] = field(default_factory=list)
+    exclude: List[str] = field(default_factory=list)
+    members: str = "public"
+    external_depth: Optional[int] = None
+
+    def __post_init__(self) -> None:
+        if self.members not in MEMBER_VISIBILITY:
+            raise ValueError(
+                f"members 必须是 {', '.join(MEMBER_VISIBILITY)} 之一，而不是 {self.members!r}")
+        if self.external_depth is not None and self.external_depth < 0:
+            raise ValueError("external-depth 不能为负数")
+
+    @classmethod
+    def from_dict(cls, table: Dict[str, Any]) -> "AnalysisConfig":
+        """从 [tool.supermro] 表创建配置，键名中的 - 等同于 _"""
+        known = set(cls.__dataclass_fields__)
+        options = {}
+        for key, value in table.items():
+            name = key.replace("-", "_")
+            if name not in known:
+                print(f"⚠️ 忽略未知的配置项 tool.supermro.{key}")
+                continue
+            options[name] = value
+        return cls(**options)
+
+    @classmethod
+    def from_pyproject(cls, path: Path) -> "AnalysisConfig":
+        """
+        从 pyproject.toml 读取配置
+
+        文件不存在或没有 [tool.supermro] 表时返回默认配置。
+        """
+        path = Path(path)
+        if not path.is_file():
+            return cls()
+
+        if not HAS_TOML:
+            if "[tool.supermro]" in path.read_text(encoding="utf-8"):
+                print("⚠️ 需要 tomli 才能读取 [tool.supermro] 配置，请运行: pip install tomli")
+            return cls()
+
+        with open(path, "rb") as f:
+            data = tomllib.load(f)
+        return cls.from_dict(data.get("tool", {}).get("supermro", {}))
+
+    def is_excluded(self, module_name: str) -> bool:
+        """模块（或包及其子树）是否被排除"""
+        return any(fnmatchcase(module_name, pattern) for pattern in self.exclude)
+
+    def is_included(self, module_name: str) -> bool:
+        """模块是否在包含范围内；包被包含时其子模块也被包含"""
+        if not self.include:
+            return True
+        parts = module_name.split(".")
+        for i in range(len(parts), 0, -1):
+            prefix = ".".join(parts[:i])
+            if any(fnmatchcase(prefix, pattern) for pattern in self.include):
+                return True
+        return False
+
+    def is_member_visible(self, name: str) -> bool:
+        """成员是否按可见性规则收录"""
+        if self.members == "all":
+            return True
+        if self.members == "protected":
+            return not (name.startswith("__") and name.endswith("__"))
+        return not name.startswith("_")
+
+    def fingerprint(self) -> str:
+        """配置指纹，用于判断缓存是否可复用"""
+        return json.dumps(asdict(self), sort_keys=True)
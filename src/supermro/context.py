@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+分析上下文
+
+在不修改 sys.path 的前提下导入被分析项目的模块：
+- 专用的 meta path finder，只在分析调用期间安装
+- 被分析的顶层包优先从项目源码根目录解析；项目中的其他顶层模块只作为
+  后备（位于 sys.meta_path 末尾），不会遮蔽标准库和已安装的包
+- 支持 src/ 布局和 PEP 420 命名空间包（可以跨越多个根目录和 sys.path）
+- 关闭上下文时清理本次导入的项目模块和路径缓存
+
+子模块通过父包的 __path__ 解析，不依赖 sys.path，因此 finder 只需要处理
+顶层名称。长期运行的进程可以依次为多个项目打开、关闭上下文，不会累积
+导入路径或模块对象。
+"""
+
+import gc
+import os
+import sys
+from contextlib import contextmanager
+from importlib.abc import MetaPathFinder
+from importlib.machinery import ModuleSpec, PathFinder
+from pathlib import Path
+from types import ModuleType
+from typing import Iterator, List, Optional, Set, Union, Any, Sequence
+
+# src 布局的源码目录
+SOURCE_DIRS = ("src",)
+
+
+def source_roots(project_path: Path) -> List[Path]:
+    """
+    项目的源码根目录
+
+    src/ 存在且本身不是包时作为根目录（优先于项目根目录）。
+    """
+    project_path = Path(project_path)
+    roots = []
+    for name in SOURCE_DIRS:
+        candidate = project_path / name
+        if candidate.is_dir() and not (candidate / "__init__.py").exists():
+            roots.append(candidate)
+    roots.append(project_path)
+    return roots
+
+
+class ProjectFinder(MetaPathFinder):
+    """在项目源码根目录中查找顶层模块"""
+
+    def __init__(self, roots: List[Path], names: Optional[Set[str]] = None):
+        """
+        Args:
+            roots: 源码根目录
+            names: 只解析这些顶层名称，None 表示解析任意名称
+        """
+        self.roots = [str(root) for root in roots]
+        self.names = names
+
+    def find_spec(self, fullname: str, path: Optional[Sequence[str]] = None,
+                  target: Optional[ModuleType] = None) -> Optional[ModuleSpec]:
+        if path is not None or "." in fullname:
+            return None
+        if self.names is not None and fullname not in self.names:
+            return None
+
+        spec = PathFinder.find_spec(fullname, self.roots)
+        if spec is None:
+            return None
+        if spec.loader is not None:
+            return spec
+
+        # 命名空间包：其他位置有常规包或模块时按 PEP 420 让位给它，
+        # 否则合并项目内外的所有部分
+        portions = [os.path.join(root, fullname) for root in self.roots
+                    if os.path.isdir(os.path.join(root, fullname))]
+        outside = PathFinder.find_spec(fullname)
+        if outside is not None and outside.loader is not None:
+            return None
+        for entry in sys.path:
+            portion = os.path.join(entry or ".", fullname)
+            if portion not in portions and os.path.isdir(portion):
+                portions.append(portion)
+
+        spec = ModuleSpec(fullname, None, is_package=True)
+        spec.submodule_search_locations = portions
+        return spec
+
+    def invalidate_caches(self) -> None:
+        pass
+
+
+class AnalysisContext:
+    """
+    项目导入上下文
+
+    importing() 只在一次分析调用期间安装 finder：优先 finder 位于
+    sys.meta_path 开头，只解析被分析的顶层包；后备 finder 位于末尾，解析
+    项目中的其他顶层模块。已导入的项目模块保留到 close()，可以作为上下文
+    管理器使用。
+    """
+
+    def __init__(self, project_path: Union[str, Path]):
+        """
+        初始化上下文
+
+        Args:
+            project_path: 项目路径
+        """
+        self.project_path = Path(project_path).resolve()
+        self.roots = source_roots(self.project_path)
+        self._names: Set[str] = set()
+        self.finder = ProjectFinder(self.roots, self._names)
+        self.fallback = ProjectFinder(self.roots)
+        self._depth = 0
+        self._preloaded: Optional[set] = None
+
+    @property
+    def active(self) -> bool:
+        """finder 是否已安装"""
+        return self._depth > 0
+
+    def activate(self, package_name: Optional[str] = None) -> None:
+        """
+        安装 finder（可以嵌套，与 deactivate 成对调用）
+
+        Args:
+            package_name: 被分析的包，其顶层名称优先从项目中解析
+        """
+        if self._preloaded is None:
+            self._preloaded = set(sys.modules)
+        if package_name:
+            self._names.add(package_name.partition(".")[0])
+        if self._depth == 0:
+            sys.meta_path.insert(0, self.finder)
+            sys.meta_path.append(self.fallback)
+        self._depth += 1
+
+    def deactivate(self) -> None:
+        """移除 finder（最外层调用时），保留已导入的项目模块"""
+        if self._depth == 0:
+            return
+        self._depth -= 1
+        if self._depth == 0:
+            for finder in (self.finder, self.fallback):
+                if finder in sys.meta_path:
+                    sys.meta_path.remove(finder)
+            self._names.clear()
+
+    @contextmanager
+    def importing(self, package_name: Optional[str] = None) -> Iterator["AnalysisContext"]:
+        """在 with 块内安装 finder"""
+        self.activate(package_name)
+        try:
+            yield self
+        finally:
+            self.deactivate()
+
+    def close(self) -> None:
+        """移除 finder，清理本次导入的项目模块和路径缓存"""
+        self._depth = 1
+        self.deactivate()
+
+        preloaded = self._preloaded
+        if preloaded is None:
+            return
+        self._preloaded = None
+        for name in [name for name in sys.modules if name not in preloaded]:
+            if self.owns(sys.modules[name]):
+                del sys.modules[name]
+
+        root = str(self.project_path)
+        for key in [key for key in sys.path_importer_cache
+                    if isinstance(key, str) and self._within(key, root)]:
+            del sys.path_importer_cache[key]
+        gc.collect()
+
+    def owns(self, module: ModuleType) -> bool:
+        """
+        模块是否来自本项目的源码根目录
+
+        只认 根目录/顶层名称 之下的文件，项目目录中的虚拟环境（如 .venv）
+        等其他位置的模块不算；命名空间包按其路径判断。
+        """
+        top = getattr(module, "__name__", "").partition(".")[0]
+        if not top:
+            return False
+        bases = [str(root / top) for root in self.roots]
+        module_file = getattr(module, "__file__", None)
+        if module_file:
+            return (any(self._within(module_file, base) for base in bases) or
+                    any(module_file.startswith(base + ".") for base in bases))
+        paths = getattr(module, "__path__", None) or ()
+        try:
+            return any(self._within(str(p), base) for p in paths for base in bases)
+        except Exception:
+            return False
+
+    @staticmethod
+    def _within(path: str, root: str) -> bool:
+        return path == root or path.startswith(root + os.sep)
+
+    def __enter__(self) -> "AnalysisContext":
+        self.activate()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+DOT 文本输出
+
+不经过 graphviz Python 包逐个创建节点和边，而是按模块把集群、节点和边
+直接写入文本缓冲区或文件：
+- 属性部分按颜色预先渲染，每个节点只需拼接名称和标签
+- 逐模块写出，只在内存中保留继承边
+- 输出与 InheritanceVisualizer.build_graph(...).source 逐字节相同
+"""
+
+import io
+import re
+from typing import Dict, Any, TextIO, Callable, List
+
+# 与 graphviz.quoting 相同的标识符规则
+_ID = re.compile(r'([a-zA-Z_][a-zA-Z0-9_]*|-?(\.[0-9]+|[0-9]+(\.[0-9]*)?))$')
+_HTML_STRING = re.compile(r'<.*>$', re.DOTALL)
+_UNESCAPED_QUOTE = re.compile(r'(?P<escaped_backslashes>(?:\\{2})*)\\?(?P<literal_quote>")')
+_KEYWORDS = {"node", "edge", "graph", "digraph", "subgraph", "strict"}
+
+LABEL_RULE = "━" * 20
+
+_GRAPH_HEADER = "\tgraph [nodesep=0.3 rankdir=TB ranksep=0.5 splines=ortho]\n"
+_CLUSTER_STYLE = ('\t\tstyle="filled,rounded"\n'
+                  '\t\tcolor={color}\n'
+                  '\t\tfontsize=12\n'
+                  '\t\tfontname=Arial\n')
+_NODE_STYLE = ' fillcolor={color} fontname=Arial fontsize=10 shape=ellipse style="filled,rounded"]\n'
+_INVISIBLE_EDGE = " [style=invis weight=100]\n"
+_INHERITANCE_EDGE = " [arrowhead=normal color=black]\n"
+
+
+def quote(identifier: str) -> str:
+    """按 DOT 语法在需要时为标识符加引号"""
+    if _HTML_STRING.match(identifier):
+        return identifier
+    if not _ID.match(identifier) or identifier.lower() in _KEYWORDS:
+        if '"' in identifier:
+            identifier = _UNESCAPED_QUOTE.sub(r'\g<escaped_backslashes>\\\g<literal_quote>',
+                                              identifier)
+        return f'"{identifier}"'
+    return identifier
+
+
+def quote_edge(identifier: str) -> str:
+    """边端点的引号规则（: 分隔端口）"""
+    node, _, rest = identifier.partition(":")
+    parts = [quote(node)]
+    if rest:
+        port, _, compass = rest.partition(":")
+        parts.append(quote(port))
+        if compass:
+            parts.append(compass)
+    return ":".join(parts)
+
+
+def write_dot(analysis_result: Dict[str, Any], out: TextIO, module_color: Callable[[str], str],
+              class_color: Callable[[str], str], format_methods: Callable[[List[str]], str]) -> None:
+    """
+    将继承关系图写为 DOT 文本
+
+    Args:
+        analysis_result: 分析结果
+        out: 可写的文本流
+        module_color: 模块名 -> 颜色
+        class_color: 类名 -> 颜色
+        format_methods: 方法列表 -> 方法摘要
+    """
+    cluster_styles: Dict[str, str] = {}
+    node_styles: Dict[str, str] = {}
+    edges: Dict[tuple, None] = {}
+    endpoints: Dict[str, str] = {}
+    write = out.write
+
+    write(f"// {analysis_result['package_name']} Class Hierarchy\n")
+    write("digraph {\n")
+    write(_GRAPH_HEADER)
+
+    cluster_index = 0
+    previous_first = None
+    for module_name, module_info in analysis_result["modules"].items():
+        classes = module_info["classes"]
+        if not classes:
+            continue
+
+        first = quote_edge(next(iter(classes)))
+        if previous_first is not None:
+            write(f"\t{previous_first} -> {first}{_INVISIBLE_EDGE}")
+        previous_first = first
+
+        color = module_color(module_name)
+        style = cluster_styles.get(color)
+        if style is None:
+            style = cluster_styles[color] = _CLUSTER_STYLE.format(color=quote(color))
+
+        label = f"{module_name}\\n{module_info['file']}\\n{len(classes)} 类"
+        lines = [f"\tsubgraph cluster_{cluster_index} {{\n",
+                 f"\t\tlabel={quote(label)}\n", style]
+        for class_name, class_info in classes.items():
+            color = class_color(class_name)
+            node_style = node_styles.get(color)
+            if node_style is None:
+                node_style = node_styles[color] = _NODE_STYLE.format(color=quote(color))
+            label = f"{class_name}\\n{LABEL_RULE}\\n• {format_methods(class_info['methods'])}"
+            lines.append(f"\t\t{quote(class_name)} [label={quote(label)}{node_style}")
+
+            mro = class_info["mro"][:-1]  # 去掉 object
+            for i in range(len(mro) - 1):
+                edges[(mro[i], mro[i + 1])] = None
+        lines.append("\t}\n")
+        write("".join(lines))
+        cluster_index += 1
+
+    # 同一个类会出现在多条边中，端点只加一次引号
+    for edge in edges:
+        for name in edge:
+            if name not in endpoints:
+                endpoints[name] = quote_edge(name)
+    write("".join(f"\t{endpoints[child]} -> {endpoints[parent]}{_INHERITANCE_EDGE}"
+                  for child, parent in edges))
+    write("}\n")
+
+
+def dot_source(analysis_result: Dict[str, Any], module_color: Callable[[str], str],
+               class_color: Callable[[str], str], format_methods: Callable[[List[str]], str]) -> str:
+    """生成 DOT 文本（参数同 write_dot）"""
+    buffer = io.StringIO()
+    write_dot(analysis_result, buffer, module_color, class_color, format_methods)
+    return buffer.getvalue()
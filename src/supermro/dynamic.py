@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+动态类特征识别
+
+识别元类、类装饰器和动态创建的类对继承关系与方法集合的影响，支持：
+- 元类及其提供的方法
+- dataclass / attrs 等类装饰器改写
+- __init_subclass__ 钩子
+- 工厂函数或 type() 创建的类
+- 由装饰器、元类或工厂生成（非本模块源码定义）的方法
+
+所有检查都按类做常数次属性查找，逐成员的检查受解析预算限制，
+保证整体分析仍为线性时间。
+"""
+
+import sys
+from typing import Dict, Any, List, Tuple
+
+DEFAULT_RESOLUTION_BUDGET = 256
+
+# 类装饰器在类字典中留下的标记属性
+_DECORATOR_MARKERS: Tuple[Tuple[str, str], ...] = (
+    ("__dataclass_fields__", "dataclass"),
+    ("__attrs_attrs__", "attrs"),
+)
+
+
+def is_dynamic_class(cls: type) -> bool:
+    """
+    判断类是否为动态创建
+
+    通过 __module__ 和 __qualname__ 无法找回该类对象时，说明它由工厂
+    函数、type() 调用或函数内部定义产生。
+    """
+    home = sys.modules.get(cls.__module__)
+    if home is None:
+        return True
+
+    obj: Any = home
+    for part in cls.__qualname__.split("."):
+        if part == "<locals>":
+            return True
+        obj = getattr(obj, part, None)
+        if obj is None:
+            return True
+    return obj is not cls
+
+
+def _code_filename(value: Any) -> str:
+    """获取可调用对象的源文件名，无法确定时返回空字符串"""
+    func = getattr(value, "__func__", value)
+    func = getattr(func, "fget", func)
+    code = getattr(func, "__code__", None)
+    return code.co_filename if code is not None else ""
+
+
+def describe_class(cls: type, module_file: str,
+                   budget: int = DEFAULT_RESOLUTION_BUDGET) -> Dict[str, Any]:
+    """
+    描述类的动态特征
+
+    Args:
+        cls: 要描述的类
+        module_file: 类所在模块的源文件路径
+        budget: 每个类最多检查的成员数量
+
+    Returns:
+        特征字典
+    """
+    metaclass: type = type(cls)
+    decorators = [label for marker, label in _DECORATOR_MARKERS
+                  if marker in cls.__dict__]
+
+    init_subclass_hooks = [
+        base.__name__ for base in cls.__mro__[1:]
+        if base is not object and "__init_subclass__" in base.__dict__
+    ]
+
+    truncated = False
+    generated_methods: List[str] = []
+    for i, (name, value) in enumerate(cls.__dict__.items()):
+        if i >= budget:
+            truncated = True
+            break
+        filename = _code_filename(value)
+        if filename and filename != module_file:
+            generated_methods.append(name)
+
+    metaclass_methods: List[str] = []
+    if metaclass is not type:
+        remaining = max(budget - len(cls.__dict__), 0)
+        for klass in metaclass.__mro__:
+            if klass is type or klass is object or truncated:
+                break
+            for name, value in klass.__dict__.items():
+                if remaining <= 0:
+                    truncated = True
+                    break
+                remaining -= 1
+                if not name.startswith("_") and callable(value):
+                    metaclass_methods.append(name)
+
+    return {
+        "metaclass": metaclass.__name__ if metaclass is not type else None,
+        "metaclass_mro": ([c.__name__ for c in metaclass.__mro__]
+                          if metaclass is not type else []),
+        "decorators": decorators,
+        "init_subclass_hooks": init_subclass_hooks,
+        "dynamic": is_dynamic_class(cls),
+        "generated_methods": generated_methods,
+        "metaclass_methods": metaclass_methods,
+        "truncated": truncated,
+    }
+
+
+def has_dynamic_features(meta: Dict[str, Any]) -> bool:
+    """判断特征字典中是否有值得报告的内容"""
+    return bool(meta["metaclass"] or meta["decorators"] or meta["init_subclass_hooks"]
+                or meta["dynamic"] or meta["generated_methods"])
@@ -0,0 +1,378 @@
+#!/usr/bin/env python3
+"""
+交互式 HTML 报告
+
+生成自包含的 HTML 文件，一次性嵌入紧凑的分析数据，在浏览器端完成布局与
+交互，无需再次运行 Python 或 Graphviz，支持：
+- 按模块集群折叠/展开（与 Graphviz 输出的模块集群一致）
+- 类名搜索
+- 祖先/后代高亮
+- 平移缩放与分批增量渲染
+"""
+
+import json
+from typing import Dict, Any, List, Callable
+
+# 类数量超过该值时默认折叠所有模块集群
+COLLAPSE_THRESHOLD = 1500
+
+EXTERNAL_MODULE = "(外部)"
+
+
+def build_report_data(analysis_result: Dict[str, Any], module_color: Callable[[str], str],
+                      class_color: Callable[[str], str],
+                      format_methods: Callable[[List[str]], str]) -> Dict[str, Any]:
+    """
+    将分析结果压缩为报告数据
+
+    模块为 [名称, 文件, 颜色]，类为 [名称, 模块序号, 颜色, 基类序号, 方法摘要, 特征]。
+    未被分析的基类作为外部节点归入单独的模块。
+
+    Args:
+        analysis_result: 分析结果
+        module_color: 模块名 -> 颜色
+        class_color: 类名 -> 颜色
+        format_methods: 方法列表 -> 方法摘要
+
+    Returns:
+        报告数据
+    """
+    modules: List[List[Any]] = []
+    classes: List[List[Any]] = []
+    index: Dict[str, int] = {}
+    pending = []
+
+    for module_name, module_info in analysis_result["modules"].items():
+        module_index = len(modules)
+        modules.append([module_name, module_info["file"], module_color(module_name)])
+        for class_name, class_info in module_info["classes"].items():
+            index[class_name] = len(classes)
+            meta = class_info.get("meta") or {}
+            flags = [label for label, present in (
+                ("metaclass", meta.get("metaclass")),
+                ("decorated", meta.get("decorators")),
+                ("dynamic", meta.get("dynamic")),
+            ) if present]
+            classes.append([class_name, module_index, class_color(class_name), [],
+                            format_methods(class_info["methods"]), flags])
+            pending.append(class_info["bases"])
+
+    external_index = None
+    for class_index, bases in enumerate(pending):
+        base_indices = classes[class_index][3]
+        for base in bases:
+            if base == "object":
+                continue
+            if base not in index:
+                if external_index is None:
+                    external_index = len(modules)
+                    modules.append([EXTERNAL_MODULE, "", "#fafafa"])
+                index[base] = len(classes)
+                classes.append([base, external_index, class_color(base), [], "", ["external"]])
+            base_indices.append(index[base])
+
+    return {
+        "package": analysis_result["package_name"],
+        "modules": modules,
+        "classes": classes,
+        "collapsed": len(classes) > COLLAPSE_THRESHOLD,
+    }
+
+
+def render_html(data: Dict[str, Any]) -> str:
+    """将报告数据渲染为自包含的 HTML 文本"""
+    payload = json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+    payload = payload.replace("</", "<\\/")
+    title = data["package"].replace("&", "&amp;").replace("<", "&lt;")
+    return (_TEMPLATE
+            .replace("__TITLE__", title)
+            .replace("__DATA__", payload))
+
+
+_TEMPLATE = r"""<!DOCTYPE html>
+<html lang="zh">
+<head>
+<meta charset="utf-8">
+<title>__TITLE__ 继承关系</title>
+<style>
+  html, body { margin: 0; height: 100%; font-family: Arial, sans-serif; font-size: 12px; }
+  #bar { position: fixed; top: 0; left: 0; right: 0; z-index: 2; display: flex; gap: 8px;
+         align-items: center; padding: 6px 10px; background: #fff; border-bottom: 1px solid #ddd; }
+  #bar input { width: 260px; padding: 4px; }
+  #results { position: fixed; top: 38px; left: 10px; z-index: 3; max-height: 60%; overflow: auto;
+             background: #fff; border: 1px solid #ddd; display: none; }
+  #results div { padding: 3px 8px; cursor: pointer; }
+  #results div:hover { background: #eef; }
+  #stats { color: #666; margin-left: auto; }
+  svg { position: absolute; top: 0; left: 0; width: 100%; height: 100%; cursor: grab; }
+  .cluster > rect { stroke: #999; rx: 8; }
+  .cluster > text.head { font-size: 12px; cursor: pointer; }
+  .node rect { stroke: #666; rx: 14; cursor: pointer; }
+  .node text { font-size: 10px; pointer-events: none; }
+  .node.hit rect { stroke: #f57c00; stroke-width: 3; }
+  .node.sel rect { stroke: #d32f2f; stroke-width: 3; }
+  .node.anc rect { stroke: #1976d2; stroke-width: 2.5; }
+  .node.desc rect { stroke: #388e3c; stroke-width: 2.5; }
+  svg.focus .node:not(.sel):not(.anc):not(.desc) { opacity: 0.25; }
+  #edges { fill: none; stroke: #333; stroke-width: 1; }
+  #hl-edges { fill: none; stroke: #d32f2f; stroke-width: 2; }
+  svg.focus #edges { opacity: 0.15; }
+</style>
+</head>
+<body>
+<div id="bar">
+  <strong>__TITLE__</strong>
+  <input id="search" placeholder="搜索类名…" autocomplete="off">
+  <button id="expand">全部展开</button>
+  <button id="collapse">全部折叠</button>
+  <button id="clear">清除高亮</button>
+  <span id="stats"></span>
+</div>
+<div id="results"></div>
+<svg id="canvas"><g id="viewport"><path id="edges"></path><path id="hl-edges"></path><g id="clusters"></g></g></svg>
+<script>
+"use strict";
+const DATA = __DATA__;
+const NODE_W = 190, NODE_H = 46, GAP_X = 16, GAP_Y = 30, PAD = 14, HEAD = 44, CLUSTER_GAP = 40;
+const BATCH = 40;
+const M = DATA.modules, C = DATA.classes;
+const svg = document.getElementById("canvas");
+const viewport = document.getElementById("viewport");
+const clustersEl = document.getElementById("clusters");
+const NS = "http://www.w3.org/2000/svg";
+
+// 反向索引与层级（最长继承路径），只计算一次
+const kids = C.map(() => []);
+C.forEach((c, i) => c[3].forEach(b => kids[b].push(i)));
+const rank = new Int32Array(C.length).fill(-1);
+for (let i = 0; i < C.length; i++) {
+  if (rank[i] >= 0) continue;
+  const stack = [i];
+  while (stack.length) {
+    const top = stack[stack.length - 1];
+    let ready = true, r = 0;
+    for (const b of C[top][3]) {
+      if (rank[b] === -2) continue;            // 环（名称冲突）时忽略
+      if (rank[b] < 0) { ready = false; rank[top] = -2; stack.push(b); break; }
+      r = Math.max(r, rank[b] + 1);
+    }
+    if (ready) { rank[top] = r; stack.pop(); }
+  }
+}
+const members = M.map(() => []);
+C.forEach((c, i) => members[c[1]].push(i));
+members.forEach(list => list.sort((a, b) => rank[a] - rank[b] || (C[a][0] < C[b][0] ? -1 : 1)));
+
+const collapsed = new Set(DATA.collapsed ? M.map((_, i) => i) : []);
+const pos = new Float64Array(C.length * 2);
+const box = M.map(() => ({x: 0, y: 0, w: 0, h: 0}));
+let selected = -1, hits = new Set();
+
+function esc(s) { return String(s).replace(/&/g, "&amp;").replace(/</g, "&lt;"); }
+
+// 布局单个集群：集群内按层级分行，集群之间纵向堆叠（与 Graphviz 输出一致）
+function layoutCluster(m) {
+  const b = box[m], list = members[m];
+  if (collapsed.has(m) || !list.length) {
+    b.w = NODE_W + 2 * PAD; b.h = HEAD + PAD;
+    for (const i of list) { pos[2 * i] = b.w / 2; pos[2 * i + 1] = HEAD / 2; }
+    return;
+  }
+  const rows = [];
+  let last = null;
+  for (const i of list) {
+    if (rank[i] !== last) { rows.push([]); last = rank[i]; }
+    rows[rows.length - 1].push(i);
+  }
+  const perRow = Math.max(1, Math.ceil(Math.sqrt(list.length * 3)));
+  const lines = [];
+  for (const row of rows) for (let k = 0; k < row.length; k += perRow) lines.push(row.slice(k, k + perRow));
+  let width = 0;
+  lines.forEach((line, r) => {
+    line.forEach((i, k) => {
+      pos[2 * i] = PAD + k * (NODE_W + GAP_X) + NODE_W / 2;
+      pos[2 * i + 1] = HEAD + r * (NODE_H + GAP_Y) + NODE_H / 2;
+    });
+    width = Math.max(width, line.length * (NODE_W + GAP_X) - GAP_X);
+  });
+  b.w = width + 2 * PAD;
+  b.h = HEAD + lines.length * (NODE_H + GAP_Y) - GAP_Y + PAD;
+}
+
+function placeClusters(from) {
+  let y = from > 0 ? box[from - 1].y + box[from - 1].h + CLUSTER_GAP : 0;
+  for (let m = from; m < M.length; m++) {
+    box[m].y = y;
+    y += box[m].h + CLUSTER_GAP;
+    const g = document.getElementById("m" + m);
+    if (g) g.setAttribute("transform", "translate(0," + box[m].y + ")");
+  }
+}
+
+function clusterMarkup(m) {
+  const b = box[m], list = members[m], mod = M[m];
+  const sign = collapsed.has(m) ? "▸" : "▾";
+  let s = '<rect width="' + b.w + '" height="' + b.h + '" fill="' + mod[2] + '"></rect>' +
+    '<text class="head" x="' + PAD + '" y="18" data-m="' + m + '">' + sign + " " + esc(mod[0]) + "</text>" +
+    '<text x="' + PAD + '" y="34" fill="#666">' + esc(mod[1]) + " · " + list.length + " 类</text>";
+  if (collapsed.has(m)) return s;
+  for (const i of list) {
+    const c = C[i], x = pos[2 * i] - NODE_W / 2, y = pos[2 * i + 1] - NODE_H / 2;
+    s += '<g class="node" id="n' + i + '" data-i="' + i + '" transform="translate(' + x + "," + y + ')">' +
+      '<rect width="' + NODE_W + '" height="' + NODE_H + '" fill="' + c[2] + '"></rect>' +
+      '<text x="10" y="18" font-weight="bold">' + esc(c[0]) + (c[5].length ? " ⚙" : "") + "</text>" +
+      '<text x="10" y="34">' + esc(c[4].length > 32 ? c[4].slice(0, 31) + "…" : c[4]) + "</text></g>";
+  }
+  return s;
+}
+
+function renderCluster(m) {
+  let g = document.getElementById("m" + m);
+  if (!g) {
+    g = document.createElementNS(NS, "g");
+    g.setAttribute("id", "m" + m);
+    g.setAttribute("class", "cluster");
+    clustersEl.appendChild(g);
+  }
+  g.setAttribute("transform", "translate(0," + box[m].y + ")");
+  g.innerHTML = clusterMarkup(m);
+}
+
+function absolute(i) { return [pos[2 * i], box[C[i][1]].y + pos[2 * i + 1]]; }
+
+function edgePath(filter) {
+  const parts = [];
+  for (let i = 0; i < C.length; i++) {
+    for (const b of C[i][3]) {
+      if (filter && !filter(i, b)) continue;
+      if (C[i][1] === C[b][1] && collapsed.has(C[i][1])) continue;
+      const p = absolute(i), q = absolute(b);
+      const dy = collapsed.has(C[i][1]) ? 0 : NODE_H / 2, dq = collapsed.has(C[b][1]) ? 0 : NODE_H / 2;
+      parts.push("M" + p[0] + " " + (p[1] - dy) + "L" + q[0] + " " + (q[1] + dq));
+    }
+  }
+  return parts.join("");
+}
+
+function renderEdges() {
+  document.getElementById("edges").setAttribute("d", edgePath(null));
+  renderHighlight();
+}
+
+// 分批渲染，避免大图阻塞浏览器
+let renderToken = 0;
+function renderAll() {
+  const token = ++renderToken;
+  clustersEl.innerHTML = "";
+  for (let m = 0; m < M.length; m++) layoutCluster(m);
+  placeClusters(0);
+  let m = 0;
+  function step() {
+    if (token !== renderToken) return;
+    const end = Math.min(M.length, m + BATCH);
+    for (; m < end; m++) renderCluster(m);
+    if (m < M.length) requestAnimationFrame(step); else { renderEdges(); applyMarks(); }
+  }
+  step();
+  document.getElementById("stats").textContent = C.length + " 类 · " + M.length + " 模块";
+}
+
+function toggle(m, open) {
+  if (open === undefined) open = collapsed.has(m);
+  if (open === !collapsed.has(m)) return;
+  if (open) collapsed.delete(m); else collapsed.add(m);
+  layoutCluster(m);
+  renderCluster(m);
+  placeClusters(m + 1);
+  renderEdges();
+  applyMarks();
+}
+
+function closure(start, next) {
+  const seen = new Set(), stack = [start];
+  while (stack.length) for (const j of next(stack.pop())) if (!seen.has(j)) { seen.add(j); stack.push(j); }
+  return seen;
+}
+
+let anc = new Set(), desc = new Set();
+function select(i) {
+  selected = i;
+  anc = i < 0 ? new Set() : closure(i, k => C[k][3]);
+  desc = i < 0 ? new Set() : closure(i, k => kids[k]);
+  svg.classList.toggle("focus", i >= 0);
+  renderHighlight();
+  applyMarks();
+}
+
+function renderHighlight() {
+  const on = new Set(anc); desc.forEach(k => on.add(k)); if (selected >= 0) on.add(selected);
+  document.getElementById("hl-edges").setAttribute("d", selected < 0 ? "" :
+    edgePath((i, b) => on.has(i) && on.has(b)));
+}
+
+function applyMarks() {
+  document.querySelectorAll(".node").forEach(el => {
+    const i = +el.dataset.i;
+    el.classList.toggle("sel", i === selected);
+    el.classList.toggle("anc", anc.has(i));
+    el.classList.toggle("desc", desc.has(i));
+    el.classList.toggle("hit", hits.has(i));
+  });
+}
+
+// 平移缩放
+let scale = 1, tx = 20, ty = 60, drag = null;
+function applyView() { viewport.setAttribute("transform", "translate(" + tx + "," + ty + ") scale(" + scale + ")"); }
+svg.addEventListener("wheel", e => {
+  e.preventDefault();
+  const k = Math.exp(-e.deltaY * 0.0015), ns = Math.min(4, Math.max(0.02, scale * k));
+  tx = e.clientX - (e.clientX - tx) * ns / scale; ty = e.clientY - (e.clientY - ty) * ns / scale; scale = ns;
+  applyView();
+}, {passive: false});
+svg.addEventListener("mousedown", e => { drag = [e.clientX - tx, e.clientY - ty, e.clientX, e.clientY]; });
+window.addEventListener("mousemove", e => { if (drag) { tx = e.clientX - drag[0]; ty = e.clientY - drag[1]; applyView(); } });
+window.addEventListener("mouseup", e => {
+  if (!drag) return;
+  const moved = Math.abs(e.clientX - drag[2]) + Math.abs(e.clientY - drag[3]) > 3;
+  drag = null;
+  if (moved) return;
+  const head = e.target.closest && e.target.closest("text.head");
+  const node = e.target.closest && e.target.closest(".node");
+  if (head) toggle(+head.dataset.m);
+  else if (node) select(+node.dataset.i === selected ? -1 : +node.dataset.i);
+});
+
+function focusClass(i) {
+  toggle(C[i][1], true);
+  const p = absolute(i);
+  scale = Math.max(scale, 0.8);
+  tx = innerWidth / 2 - p[0] * scale; ty = innerHeight / 2 - p[1] * scale;
+  applyView();
+  select(i);
+}
+
+const search = document.getElementById("search"), results = document.getElementById("results");
+search.addEventListener("input", () => {
+  const q = search.value.trim().toLowerCase();
+  hits = new Set();
+  if (q) C.forEach((c, i) => { if (c[0].toLowerCase().includes(q)) hits.add(i); });
+  const list = Array.from(hits).slice(0, 50);
+  results.innerHTML = list.map(i => '<div data-i="' + i + '">' + esc(C[i][0]) +
+    ' <span style="color:#888">' + esc(M[C[i][1]][0]) + "</span></div>").join("");
+  results.style.display = list.length ? "block" : "none";
+  applyMarks();
+});
+results.addEventListener("click", e => {
+  const row = e.target.closest("div[data-i]");
+  if (row) { results.style.display = "none"; focusClass(+row.dataset.i); }
+});
+document.getElementById("expand").onclick = () => { collapsed.clear(); renderAll(); };
+document.getElementById("collapse").onclick = () => { M.forEach((_, m) => collapsed.add(m)); renderAll(); };
+document.getElementById("clear").onclick = () => { search.value = ""; hits = new Set(); results.style.display = "none"; select(-1); };
+
+applyView();
+renderAll();
+</script>
+</body>
+</html>
+"""
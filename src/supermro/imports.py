@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+模块依赖与导入开销
+
+在分析包的同一次遍历中记录包内模块之间的导入关系和导入开销，支持：
+- 包内导入图（解析模块源码中执行于导入期的 import 语句）
+- 每个模块的累计导入耗时与内存增量（包含其首次导入的依赖）
+- 导入开销排行与导入环检测
+"""
+
+import ast
+import importlib
+import time
+import tracemalloc
+from types import ModuleType
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Iterator, Set, Union
+
+
+class ImportProfiler:
+    """记录模块导入开销并构建包内导入图"""
+
+    def __init__(self, package_name: str, trace_memory: bool = True):
+        """
+        初始化导入分析
+
+        Args:
+            package_name: 包名
+            trace_memory: 是否用 tracemalloc 记录内存增量（会使导入变慢）
+        """
+        self.package_name = package_name
+        self.trace_memory = trace_memory
+        self.costs: Dict[str, Dict[str, Any]] = {}
+        self._files: Dict[str, Optional[str]] = {}
+        self._packages: Set[str] = set()
+        self._started_tracing = False
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+
+    def import_module(self, module_name: str) -> ModuleType:
+        """导入模块并记录累计耗时与内存增量"""
+        memory_before = tracemalloc.get_traced_memory()[0] if self.trace_memory else 0
+        start = time.perf_counter()
+        module = importlib.import_module(module_name)
+        seconds = time.perf_counter() - start
+        memory_after = tracemalloc.get_traced_memory()[0] if self.trace_memory else 0
+
+        self.costs[module_name] = {
+            "seconds": seconds,
+            "memory_kb": (memory_after - memory_before) / 1024 if self.trace_memory else None,
+        }
+        self._files[module_name] = getattr(module, "__file__", None)
+        if hasattr(module, "__path__"):
+            self._packages.add(module_name)
+        return module
+
+    def finish(self) -> Dict[str, Any]:
+        """
+        结束记录并构建导入图
+
+        Returns:
+            {"import_graph": {模块: [依赖模块]}, "import_costs": {模块: 开销}}
+        """
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+        known = set(self._files)
+        graph = {}
+        for module_name, file_path in self._files.items():
+            graph[module_name] = find_imports(
+                module_name, file_path, module_name in self._packages, known)
+        return {"import_graph": graph, "import_costs": self.costs}
+
+
+def _is_type_checking(test: ast.expr) -> bool:
+    """条件是否为 TYPE_CHECKING 或 typing.TYPE_CHECKING（运行时恒为 False）"""
+    if isinstance(test, ast.Name):
+        return test.id == "TYPE_CHECKING"
+    return (isinstance(test, ast.Attribute) and test.attr == "TYPE_CHECKING" and
+            isinstance(test.value, ast.Name) and test.value.id in ("typing", "typing_extensions"))
+
+
+def _toplevel_imports(body: List[ast.stmt]) -> Iterator[Union[ast.Import, ast.ImportFrom]]:
+    """遍历导入期会执行的语句（跳过函数体和 if TYPE_CHECKING 分支）"""
+    for node in body:
+        if isinstance(node, (ast.Import, ast.ImportFrom)):
+            yield node
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            continue
+        elif isinstance(node, ast.If) and _is_type_checking(node.test):
+            yield from _toplevel_imports(node.orelse)
+        else:
+            for field in ("body", "orelse", "finalbody", "handlers"):
+                child = getattr(node, field, None)
+                if isinstance(child, list):
+                    yield from _toplevel_imports(child)
+
+
+def _longest_known(name: str, known: Set[str]) -> Optional[str]:
+    """返回 name 自身或其最长的已知父模块"""
+    while name:
+        if name in known:
+            return name
+        name = name.rpartition(".")[0]
+    return None
+
+
+def find_imports(module_name: str, file_path: Optional[str], is_package: bool,
+                 known: Set[str]) -> List[str]:
+    """
+    解析模块在导入期引入的包内模块
+
+    Args:
+        module_name: 模块名
+        file_path: 模块源文件
+        is_package: 是否为包（影响相对导入的解析）
+        known: 包内模块名集合
+
+    Returns:
+        依赖的包内模块名（按出现顺序去重）
+    """
+    if not file_path or not file_path.endswith(".py"):
+        return []
+    try:
+        tree = ast.parse(Path(file_path).read_bytes(), file_path)
+    except (OSError, SyntaxError, ValueError):
+        return []
+
+    context = module_name if is_package else module_name.rpartition(".")[0]
+    deps: List[str] = []
+
+    def add(name: Optional[str]) -> None:
+        if name and name != module_name and name not in deps:
+            deps.append(name)
+
+    for node in _toplevel_imports(tree.body):
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                add(_longest_known(alias.name, known))
+            continue
+
+        if node.level:
+            parts = context.split(".")
+            if node.level - 1 > len(parts):
+                continue
+            base = ".".join(parts[:len(parts) - (node.level - 1)])
+            if node.module:
+                base = f"{base}.{node.module}" if base else node.module
+        else:
+            base = node.module or ""
+
+        for alias in node.names:
+            candidate = f"{base}.{alias.name}"
+            add(candidate if candidate in known else _longest_known(base, known))
+
+    return deps
+
+
+def find_cycles(graph: Dict[str, List[str]]) -> List[List[str]]:
+    """
+    找出导入环（Tarjan 强连通分量，迭代实现）
+
+    Returns:
+        每个环包含的模块（按名称排序），只返回大小大于 1 或自环的分量
+    """
+    index: Dict[str, int] = {}
+    lowlink: Dict[str, int] = {}
+    on_stack: Set[str] = set()
+    stack: List[str] = []
+    cycles: List[List[str]] = []
+    counter = 0
+
+    for root in graph:
+        if root in index:
+            continue
+        work = [(root, iter(graph.get(root, ())))]
+        index[root] = lowlink[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack.add(root)
+
+        while work:
+            node, children = work[-1]
+            advanced = False
+            for child in children:
+                if child not in index:
+                    index[child] = lowlink[child] = counter
+                    counter += 1
+                    stack.append(child)
+                    on_stack.add(child)
+                    work.append((child, iter(graph.get(child, ()))))
+                    advanced = True
+                    break
+                if child in on_stack:
+                    lowlink[node] = min(lowlink[node], index[child])
+            if advanced:
+                continue
+
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                lowlink[parent] = min(lowlink[parent], lowlink[node])
+            if lowlink[node] == index[node]:
+                component = []
+                while True:
+                    member = stack.pop()
+                    on_stack.discard(member)
+                    component.append(member)
+                    if member == node:
+                        break
+                if len(component) > 1 or node in graph.get(node, ()):
+                    cycles.append(sorted(component))
+
+    return cycles
+
+
+def build_import_report(analysis_result: Dict[str, Any], top: int = 10) -> Dict[str, Any]:
+    """
+    汇总导入开销排行与导入环
+
+    Args:
+        analysis_result: 启用导入分析后的分析结果
+        top: 排行数量
+
+    Returns:
+        {"slowest": [...], "heaviest": [...], "cycles": [...]}
+    """
+    costs = analysis_result.get("import_costs", {})
+    graph = analysis_result.get("import_graph", {})
+    rows = [dict(cost, module=name, imports=len(graph.get(name, ())))
+            for name, cost in costs.items()]
+
+    slowest = sorted(rows, key=lambda r: -r["seconds"])[:top]
+    heaviest = sorted((r for r in rows if r["memory_kb"] is not None),
+                      key=lambda r: -r["memory_kb"])[:top]
+    return {"slowest": slowest, "heaviest": heaviest, "cycles": find_cycles(graph)}
@@ -0,0 +1,362 @@
+#!/usr/bin/env python3
+"""
+C3 线性化引擎
+
+只基于继承图（类名 -> 基类列表）计算 MRO，不导入任何模块，支持：
+- 每个类的线性化结果只计算一次，子类直接复用基类的结果
+- 显式栈遍历，深层继承链不受递归深度限制
+- 线性化失败时给出冲突的类、约束来源和失败原因（基类失败会沿子类传播）
+- "假如"查询：类 X 增加/移除基类（或定义一个新类）后的 MRO，以及受影响的子类
+
+单继承的类不需要合并，直接在基类结果前加上自身；总开销与所有类的
+MRO 长度之和成线性关系。包外类使用分析时记录的 MRO，未知的基类
+视为直接继承 object 的根类。
+"""
+
+from typing import List, Dict, Any, Optional, Iterable, Sequence, Tuple, Union
+
+CYCLE_REASON = "继承图中存在环（可能是同名类冲突）"
+
+
+class LinearizationError(ValueError):
+    """无法按 C3 规则线性化"""
+
+    def __init__(self, class_name: str, bases: Sequence[str], reason: str,
+                 conflicts: Optional[List[Dict[str, str]]] = None,
+                 cause: Optional["LinearizationError"] = None,
+                 cycle: Optional[List[str]] = None):
+        """
+        Args:
+            class_name: 无法线性化的类
+            bases: 该类的基类列表
+            reason: 失败原因
+            conflicts: 互相阻塞的约束，每项为 {"class", "after", "source"}，
+                表示 source 要求 class 排在 after 之后
+            cause: 导致失败的基类错误（失败沿继承链传播时）
+            cycle: 环上的类（继承图中存在环时）
+        """
+        super().__init__(f"{class_name}: {reason}")
+        self.class_name = class_name
+        self.bases = list(bases)
+        self.reason = reason
+        self.conflicts = conflicts or []
+        self.cause = cause
+        self.cycle = cycle
+
+    @property
+    def root_cause(self) -> "LinearizationError":
+        """沿传播链找到最初失败的类"""
+        error = self
+        while error.cause is not None:
+            error = error.cause
+        return error
+
+    def describe(self) -> str:
+        """多行诊断信息"""
+        lines = [str(self)]
+        error = self
+        while error.cause is not None:
+            error = error.cause
+            lines.append(f"  ← {error}")
+        for conflict in error.conflicts:
+            lines.append(f"    {conflict['source']} 要求 {conflict['class']} "
+                         f"排在 {conflict['after']} 之后")
+        return "\n".join(lines)
+
+
+def _merge(sequences: List[List[str]]) -> Tuple[List[str], List[Tuple[int, List[str]]]]:
+    """
+    C3 合并
+
+    Returns:
+        (合并结果, 剩余序列)，剩余序列为 (原序号, 未合并部分)，成功时为空
+    """
+    heads = [0] * len(sequences)
+    tail_counts: Dict[str, int] = {}
+    for seq in sequences:
+        for name in seq[1:]:
+            tail_counts[name] = tail_counts.get(name, 0) + 1
+
+    result: List[str] = []
+    while True:
+        candidate = None
+        for i, seq in enumerate(sequences):
+            if heads[i] < len(seq) and not tail_counts.get(seq[heads[i]]):
+                candidate = seq[heads[i]]
+                break
+        if candidate is None:
+            remaining = [(i, seq[heads[i]:]) for i, seq in enumerate(sequences)
+                         if heads[i] < len(seq)]
+            return result, remaining
+
+        result.append(candidate)
+        for i, seq in enumerate(sequences):
+            if heads[i] < len(seq) and seq[heads[i]] == candidate:
+                heads[i] += 1
+                if heads[i] < len(seq):
+                    tail_counts[seq[heads[i]]] -= 1
+
+
+def c3_merge(sequences: Iterable[Sequence[str]]) -> Optional[List[str]]:
+    """C3 合并，无法线性化时返回 None"""
+    merged, remaining = _merge([list(seq) for seq in sequences if seq])
+    return None if remaining else merged
+
+
+def _conflicts(remaining: List[Tuple[int, List[str]]],
+               labels: List[str]) -> List[Dict[str, str]]:
+    """解释剩余序列的队首为什么都无法选出（多个序列队首相同时只解释一次）"""
+    conflicts: List[Dict[str, str]] = []
+    for _, seq in remaining:
+        head = seq[0]
+        for index, other in remaining:
+            if head in other[1:]:
+                conflict = {"class": head, "after": other[0], "source": labels[index]}
+                if conflict not in conflicts:
+                    conflicts.append(conflict)
+                break
+    return conflicts
+
+
+class C3Linearizer:
+    """带记忆化的 C3 线性化引擎"""
+
+    def __init__(self, bases: Dict[str, List[str]],
+                 fixed: Optional[Dict[str, List[str]]] = None):
+        """
+        初始化引擎
+
+        Args:
+            bases: 类名 -> 基类列表（需要计算 MRO 的类）
+            fixed: 类名 -> 已知 MRO（如包外类），不再重新计算
+        """
+        self.bases = bases
+        self.fixed = fixed or {}
+        self._cache: Dict[str, List[str]] = {}
+        self._errors: Dict[str, LinearizationError] = {}
+        self._children: Optional[Dict[str, List[str]]] = None
+
+    @classmethod
+    def from_analysis(cls, analysis_result: Dict[str, Any]) -> "C3Linearizer":
+        """基于分析结果创建引擎（包内类按基类计算，包外类使用记录的 MRO）"""
+        bases: Dict[str, List[str]] = {}
+        for module_info in analysis_result["modules"].values():
+            for class_name, class_info in module_info["classes"].items():
+                bases[class_name] = list(class_info["bases"])
+        fixed = {name: list(info["mro"])
+                 for name, info in analysis_result.get("external_classes", {}).items()
+                 if name not in bases}
+        return cls(bases, fixed)
+
+    def __contains__(self, class_name: str) -> bool:
+        return class_name in self.bases or class_name in self.fixed
+
+    def mro(self, class_name: str) -> List[str]:
+        """
+        计算类的 MRO
+
+        Raises:
+            KeyError: 未知的类
+            LinearizationError: 无法线性化
+        """
+        if class_name in self.fixed:
+            return list(self.fixed[class_name])
+        if class_name not in self.bases:
+            raise KeyError(f"未知的类: {class_name}")
+
+        self._resolve(class_name)
+        error = self._errors.get(class_name)
+        if error is not None:
+            raise error
+        return list(self._cache[class_name])
+
+    def linearize_all(self) -> Tuple[Dict[str, List[str]], List[LinearizationError]]:
+        """
+        计算所有类的 MRO
+
+        Returns:
+            (类名 -> MRO, 失败列表)，均按 bases 中的顺序
+        """
+        for class_name in self.bases:
+            self._resolve(class_name)
+        mros = {name: self._cache[name] for name in self.bases if name in self._cache}
+        failures = [self._errors[name] for name in self.bases if name in self._errors]
+        return mros, failures
+
+    def failures(self) -> List[LinearizationError]:
+        """所有无法线性化的类"""
+        return self.linearize_all()[1]
+
+    def _dependencies(self, class_name: str) -> List[str]:
+        """需要先线性化的基类"""
+        return [base for base in self.bases[class_name]
+                if base != class_name and base in self.bases and base not in self.fixed]
+
+    def _resolve(self, class_name: str) -> None:
+        """按后序遍历线性化 class_name 及其尚未计算的祖先"""
+        if class_name in self._cache or class_name in self._errors:
+            return
+
+        stack = [(class_name, iter(self._dependencies(class_name)))]
+        on_stack = {class_name: 0}
+        while stack:
+            current, pending = stack[-1]
+            for dep in pending:
+                if dep in self._cache or dep in self._errors:
+                    continue
+                if dep in on_stack:
+                    self._mark_cycle([name for name, _ in stack[on_stack[dep]:]])
+                    continue
+                on_stack[dep] = len(stack)
+                stack.append((dep, iter(self._dependencies(dep))))
+                break
+            else:
+                stack.pop()
+                del on_stack[current]
+                if current not in self._errors:
+                    self._compute(current)
+
+    def _mark_cycle(self, cycle: List[str]) -> None:
+        for name in cycle:
+            if name not in self._errors:
+                self._errors[name] = LinearizationError(
+                    name, self.bases[name], CYCLE_REASON, cycle=cycle + [cycle[0]])
+
+    def _sequence(self, class_name: str, base: str) -> List[str]:
+        """基类的线性化结果（基类已解析）"""
+        if base == class_name:
+            return [base]
+        if base in self.fixed:
+            return self.fixed[base]
+        if base in self._cache:
+            return self._cache[base]
+        return [base] if base == "object" else [base, "object"]
+
+    def _compute(self, class_name: str) -> None:
+        """基于已计算的基类结果线性化一个类"""
+        bases = self.bases[class_name]
+        result = self._merge_bases(class_name, bases)
+        if isinstance(result, LinearizationError):
+            self._errors[class_name] = result
+        else:
+            self._cache[class_name] = result
+
+    def _merge_bases(self, class_name: str,
+                     bases: List[str]) -> Union[List[str], LinearizationError]:
+        """合并基类的线性化结果（基类已解析）"""
+        for base in bases:
+            error = self._errors.get(base) if base != class_name else None
+            if error is not None:
+                return LinearizationError(class_name, bases, f"基类 {base} 无法线性化",
+                                          cause=error)
+
+        if not bases:
+            return [class_name]
+        if len(bases) == 1:
+            return [class_name] + self._sequence(class_name, bases[0])
+
+        sequences = [self._sequence(class_name, base) for base in bases] + [list(bases)]
+        merged, remaining = _merge(sequences)
+        if remaining:
+            labels = [f"{base} 的 MRO" for base in bases] + ["基类列表"]
+            return LinearizationError(
+                class_name, bases, f"基类顺序 ({', '.join(bases)}) 与其 MRO 冲突",
+                conflicts=_conflicts(remaining, labels))
+        return [class_name] + merged
+
+    def _new_bases(self, class_name: str, add: Sequence[str], remove: Sequence[str],
+                   bases: Optional[Sequence[str]]) -> List[str]:
+        if bases is not None:
+            return list(bases)
+        if class_name not in self.bases:
+            raise KeyError(f"未知的类: {class_name}")
+        current = [base for base in self.bases[class_name] if base not in remove]
+        return current + [base for base in add if base not in current]
+
+    def what_if(self, class_name: str, add: Sequence[str] = (), remove: Sequence[str] = (),
+                bases: Optional[Sequence[str]] = None) -> List[str]:
+        """
+        假如修改类的基类列表，计算其 MRO（不修改继承图）
+
+        Args:
+            class_name: 类名；指定 bases 时可以是尚不存在的新类
+            add: 追加到基类列表末尾的基类
+            remove: 从基类列表中移除的基类
+            bases: 直接替换整个基类列表（忽略 add/remove）
+
+        Raises:
+            KeyError: 未指定 bases 且类不存在
+            LinearizationError: 修改后无法线性化
+        """
+        new_bases = self._new_bases(class_name, add, remove, bases)
+        for base in new_bases:
+            if base != class_name and base in self.bases:
+                self._resolve(base)
+                if class_name in self._cache.get(base, ()):
+                    raise LinearizationError(
+                        class_name, new_bases,
+                        f"{base} 是 {class_name} 的子类，作为基类会形成继承环",
+                        cycle=[class_name, base, class_name])
+
+        result = self._merge_bases(class_name, new_bases)
+        if isinstance(result, LinearizationError):
+            raise result
+        return result
+
+    def subclasses(self, class_name: str) -> List[str]:
+        """所有（直接和间接）子类，按广度优先顺序"""
+        if self._children is None:
+            self._children = {}
+            for name, bases in self.bases.items():
+                for base in bases:
+                    if base != name:
+                        self._children.setdefault(base, []).append(name)
+
+        found = []
+        seen = {class_name}
+        queue = [class_name]
+        for current in queue:
+            for child in self._children.get(current, ()):
+                if child not in seen:
+                    seen.add(child)
+                    found.append(child)
+                    queue.append(child)
+        return found
+
+    def impact(self, class_name: str, add: Sequence[str] = (), remove: Sequence[str] = (),
+               bases: Optional[Sequence[str]] = None
+               ) -> Dict[str, Union[List[str], LinearizationError]]:
+        """
+        假如修改类的基类列表，哪些类（自身及子类）的 MRO 会改变
+
+        参数同 what_if。不受影响的类直接复用已有结果。
+
+        Returns:
+            类名 -> 新 MRO 或 LinearizationError，只包含结果有变化的类
+        """
+        new_bases = self._new_bases(class_name, add, remove, bases)
+        affected = [class_name] + self.subclasses(class_name)
+
+        for name in affected:
+            if name in self.bases:
+                self._resolve(name)
+
+        trial = C3Linearizer(dict(self.bases), self.fixed)
+        trial.bases[class_name] = new_bases
+        stale = set(affected)
+        trial._cache = {name: mro for name, mro in self._cache.items() if name not in stale}
+        trial._errors = {name: error for name, error in self._errors.items()
+                         if name not in stale}
+
+        changes: Dict[str, Union[List[str], LinearizationError]] = {}
+        for name in affected:
+            try:
+                new_mro: Union[List[str], LinearizationError] = trial.mro(name)
+            except LinearizationError as e:
+                new_mro = e
+            if isinstance(new_mro, LinearizationError):
+                if name not in self._errors:
+                    changes[name] = new_mro
+            elif new_mro != self._cache.get(name):
+                changes[name] = new_mro
+        return changes
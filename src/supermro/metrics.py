@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+继承层次指标
+
+基于分析结果计算整个继承图的结构指标，用于定位架构热点，支持：
+- 每个类的继承深度
+- 直接/传递子类数量
+- 菱形继承
+- 在多个层级被重写的方法
+- 无法通过 C3 线性化的类（见 linearization 模块）
+
+所有指标在一次按拓扑序的遍历中得出，开销与继承图及其 MRO 的总规模成线性关系。
+"""
+
+import json
+from collections import deque
+from typing import List, Dict, Any, Optional
+
+from .linearization import C3Linearizer, LinearizationError
+from .tables import format_rows
+
+TABLE_COLUMNS = [
+    "class", "module", "depth", "direct_subclasses", "transitive_subclasses",
+    "diamonds", "multi_overrides", "c3_ok",
+]
+
+SORT_KEYS = ["depth", "direct_subclasses", "transitive_subclasses",
+             "diamonds", "multi_overrides"]
+
+
+class HierarchyMetrics:
+    """继承层次指标引擎"""
+
+    def __init__(self, analysis_result: Dict[str, Any], min_override_levels: int = 3):
+        """
+        初始化指标引擎
+
+        Args:
+            analysis_result: 分析结果
+            min_override_levels: 方法至少在多少个类中定义才算"多层重写"
+        """
+        self.analysis_result = analysis_result
+        self.min_override_levels = min_override_levels
+        self._metrics: Optional[Dict[str, Any]] = None
+
+    def compute(self) -> Dict[str, Any]:
+        """
+        计算指标
+
+        Returns:
+            {"classes": {模块.类名: 指标}, "c3_failures": [{"class", "reason"}]}，
+            不同模块中的同名类分别统计
+        """
+        if self._metrics is not None:
+            return self._metrics
+
+        nodes = self._build_nodes()
+
+        # 拓扑序（基类在前），未知基类（如 object）视为根
+        children: Dict[str, List[str]] = {name: [] for name in nodes}
+        pending: Dict[str, int] = {}
+        for name, node in nodes.items():
+            bases = [b for b in node["resolved_bases"] if b in nodes and b != name]
+            node["graph_bases"] = bases
+            pending[name] = len(bases)
+            for base in bases:
+                children[base].append(name)
+
+        queue = deque(name for name, count in pending.items() if count == 0)
+        depth: Dict[str, int] = {}
+        linearizer = C3Linearizer(
+            {name: node["resolved_bases"] for name, node in nodes.items() if node["internal"]},
+            {name: node["lineage"] for name, node in nodes.items() if not node["internal"]})
+        failures: List[Dict[str, str]] = []
+        classes: Dict[str, Dict[str, Any]] = {}
+        transitive = dict.fromkeys(nodes, 0)
+
+        while queue:
+            name = queue.popleft()
+            node = nodes[name]
+            bases = node["graph_bases"]
+
+            if bases:
+                depth[name] = 1 + max(depth[b] for b in bases)
+            else:
+                depth[name] = 0 if node["bases"] in ([], ["object"]) else 1
+
+            if node["internal"]:
+                try:
+                    linearizer.mro(name)
+                    c3_ok = True
+                except LinearizationError as e:
+                    failures.append({"class": name, "reason": e.reason})
+                    c3_ok = False
+
+                lineage = node["lineage"]
+                for ancestor in lineage[1:]:
+                    if ancestor in transitive:
+                        transitive[ancestor] += 1
+
+                classes[name] = {
+                    "class": node["short_name"],
+                    "module": node["module"],
+                    "depth": depth[name],
+                    "direct_subclasses": len(children[name]),
+                    "transitive_subclasses": 0,
+                    "diamonds": self._diamonds(node, nodes),
+                    "multi_overrides": self._multi_overrides(lineage, nodes),
+                    "c3_ok": c3_ok,
+                }
+
+            for child in children[name]:
+                pending[child] -= 1
+                if pending[child] == 0:
+                    queue.append(child)
+
+        # 剩余节点处于环中
+        for name, count in pending.items():
+            if count > 0:
+                failures.append({"class": name, "reason": "继承图中存在环"})
+
+        for name, metrics in classes.items():
+            metrics["transitive_subclasses"] = transitive[name]
+
+        self._metrics = {"classes": classes, "c3_failures": failures}
+        return self._metrics
+
+    def _build_nodes(self) -> Dict[str, Dict[str, Any]]:
+        """
+        以 模块.类名 为键收集继承图节点
+
+        MRO 和基类优先按分析结果中的 qualified_mro 解析到节点（lineage、
+        resolved_bases）；没有该字段时按短名解析，优先取同一模块中的类。
+        """
+        nodes: Dict[str, Dict[str, Any]] = {}
+        # 类定义处的 模块.类名 -> 节点键（工厂类的绑定名可能与类名不同）
+        origins: Dict[str, str] = {}
+        by_name: Dict[str, List[str]] = {}
+        for module_name, module_info in self.analysis_result["modules"].items():
+            for class_name, class_info in module_info["classes"].items():
+                key = f"{module_name}.{class_name}"
+                nodes[key] = dict(class_info, module=module_name, short_name=class_name,
+                                  internal=True)
+                origin = (f"{class_info.get('module', module_name)}."
+                          f"{class_info.get('name', class_name)}")
+                origins.setdefault(origin, key)
+                by_name.setdefault(class_name, []).append(key)
+        for class_name, class_info in self.analysis_result.get("external_classes", {}).items():
+            key = f"{class_info['module']}.{class_name}"
+            if key not in nodes:
+                nodes[key] = dict(class_info, short_name=class_name, internal=False)
+                by_name.setdefault(class_name, []).append(key)
+
+        def resolve(name: str, module: str, qualified: Optional[str] = None) -> str:
+            if qualified is not None:
+                if qualified in origins:
+                    return origins[qualified]
+                return qualified if qualified in nodes else name
+            candidates = by_name.get(name)
+            if not candidates:
+                return name
+            for candidate in candidates:
+                if nodes[candidate]["module"] == module:
+                    return candidate
+            return candidates[0]
+
+        for key, node in nodes.items():
+            mro = node["mro"]
+            module = node["module"]
+            qualified = node.get("qualified_mro")
+            if qualified and len(qualified) == len(mro):
+                lineage = [resolve(n, module, q) for n, q in zip(mro, qualified)]
+            else:
+                lineage = [resolve(n, module) for n in mro]
+            if lineage:
+                lineage[0] = key
+            node["lineage"] = lineage
+
+            # 直接基类按顺序对应 MRO 中的同名项
+            used = set()
+            resolved_bases = []
+            for base in node["bases"]:
+                for i in range(1, len(mro)):
+                    if mro[i] == base and i not in used:
+                        used.add(i)
+                        resolved_bases.append(lineage[i])
+                        break
+                else:
+                    resolved_bases.append(resolve(base, module))
+            node["resolved_bases"] = resolved_bases
+        return nodes
+
+    def _diamonds(self, node: Dict[str, Any], nodes: Dict[str, Dict[str, Any]]) -> List[str]:
+        """找出经由两个及以上直接基类到达的公共祖先（不含 object）"""
+        bases = node["resolved_bases"]
+        if len(bases) < 2:
+            return []
+
+        seen = set()
+        shared = []
+        for base in bases:
+            ancestors = nodes[base]["lineage"] if base in nodes else [base]
+            for ancestor in ancestors:
+                if ancestor == "object":
+                    continue
+                if ancestor in seen:
+                    if ancestor not in shared:
+                        shared.append(ancestor)
+                else:
+                    seen.add(ancestor)
+        return shared
+
+    def _multi_overrides(self, lineage: List[str],
+                         nodes: Dict[str, Dict[str, Any]]) -> List[str]:
+        """找出在 MRO 中至少 min_override_levels 个类里定义的方法"""
+        counts: Dict[str, int] = {}
+        for class_name in lineage:
+            node = nodes.get(class_name)
+            if node is None:
+                continue
+            for method in node.get("own_methods", ()):
+                counts[method] = counts.get(method, 0) + 1
+        return sorted(m for m, count in counts.items() if count >= self.min_override_levels)
+
+    def rows(self, sort_by: Optional[str] = None, top: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        生成指标表格行
+
+        Args:
+            sort_by: 按该列降序排序（见 SORT_KEYS）
+            top: 只保留前 N 行
+
+        Returns:
+            行列表，列表类型的指标以数量表示
+        """
+        rows = []
+        for metrics in self.compute()["classes"].values():
+            row = dict(metrics)
+            row["diamonds"] = len(metrics["diamonds"])
+            row["multi_overrides"] = len(metrics["multi_overrides"])
+            rows.append(row)
+
+        if sort_by:
+            if sort_by not in SORT_KEYS:
+                raise ValueError(f"无法按 {sort_by} 排序，可选: {', '.join(SORT_KEYS)}")
+            rows.sort(key=lambda r: (-r[sort_by], r["class"], r["module"]))
+        if top is not None:
+            rows = rows[:top]
+        return rows
+
+    def format_table(self, fmt: str = "text", sort_by: Optional[str] = None,
+                     top: Optional[int] = None) -> str:
+        """
+        将指标导出为表格文本
+
+        Args:
+            fmt: text、csv 或 json
+            sort_by: 排序列
+            top: 只保留前 N 行
+
+        Returns:
+            表格文本
+        """
+        rows = self.rows(sort_by, top)
+
+        if fmt == "json":
+            return json.dumps({
+                "rows": rows,
+                "c3_failures": self.compute()["c3_failures"]
+            }, ensure_ascii=False, indent=2)
+
+        return format_rows(rows, TABLE_COLUMNS, fmt)
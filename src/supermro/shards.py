@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+分片渲染
+
+把一次分析结果拆分为多张继承关系图并行渲染，用于生成文档，支持：
+- 按模块拆分：每个模块一张图
+- 按根类拆分：每个包内根类（没有包内基类的类）及其所有子类一张图
+- 在有界的进程池中调用 Graphviz 渲染
+- 生成链接所有图的索引页
+
+每个分片都是与 analyze_package 结果格式相同的子集，DOT 文本由主进程
+写出，工作进程只接收文件路径。
+"""
+
+import html
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Tuple
+
+# 可选：安装 Graphviz 支持
+try:
+    import graphviz
+    HAS_GRAPHVIZ = True
+except ImportError:
+    HAS_GRAPHVIZ = False
+
+SPLIT_MODES = ("module", "root")
+
+
+def _subset(name: str) -> Dict[str, Any]:
+    """创建空的分片结果"""
+    return {
+        "package_name": name,
+        "modules": {},
+        "classes": {},
+        "inheritance_chains": {},
+        "external_classes": {}
+    }
+
+
+def split_by_module(analysis_result: Dict[str, Any]) -> List[Tuple[str, Dict[str, Any]]]:
+    """每个包含类的模块一个分片"""
+    shards = []
+    for module_name, module_info in analysis_result["modules"].items():
+        if module_info["classes"]:
+            shard = _subset(module_name)
+            shard["modules"][module_name] = module_info
+            shards.append((module_name, shard))
+    return shards
+
+
+def _common_prefix(a: str, b: str) -> int:
+    """两个模块名相同的前缀段数"""
+    count = 0
+    for x, y in zip(a.split("."), b.split(".")):
+        if x != y:
+            break
+        count += 1
+    return count
+
+
+def split_by_root(analysis_result: Dict[str, Any]) -> List[Tuple[str, Dict[str, Any]]]:
+    """
+    每个包内根类一个分片，包含 MRO 中有该根类的所有类
+
+    分片以 模块.类名 命名，不同模块中的同名根类各自成图。MRO 只记录类名，
+    同名根类有多个时归入与子类所在模块共同前缀最长的一个。多重继承的类
+    会同时出现在多个分片中。
+    """
+    internal = set()
+    for module_info in analysis_result["modules"].values():
+        internal.update(module_info["classes"])
+
+    shards: Dict[str, Dict[str, Any]] = {}
+    roots: Dict[str, List[Tuple[str, str]]] = {}
+    for module_name, module_info in analysis_result["modules"].items():
+        for class_name, class_info in module_info["classes"].items():
+            if not any(base in internal for base in class_info["bases"]):
+                key = f"{module_name}.{class_name}"
+                shards[key] = _subset(key)
+                roots.setdefault(class_name, []).append((module_name, key))
+
+    for module_name, module_info in analysis_result["modules"].items():
+        for class_name, class_info in module_info["classes"].items():
+            for position, ancestor in enumerate(class_info["mro"]):
+                if position == 0:
+                    key = f"{module_name}.{class_name}"
+                    if key not in shards:
+                        continue
+                else:
+                    candidates = roots.get(ancestor)
+                    if not candidates:
+                        continue
+                    key = max(candidates,
+                              key=lambda root: _common_prefix(root[0], module_name))[1]
+                modules = shards[key]["modules"]
+                if module_name not in modules:
+                    modules[module_name] = {"file": module_info["file"], "classes": {}}
+                modules[module_name]["classes"][class_name] = class_info
+
+    return list(shards.items())
+
+
+def split_result(analysis_result: Dict[str, Any],
+                 split_by: str) -> List[Tuple[str, Dict[str, Any]]]:
+    """
+    拆分分析结果
+
+    Args:
+        analysis_result: 分析结果
+        split_by: module 或 root
+
+    Returns:
+        (分片名, 分片结果) 列表
+    """
+    if split_by == "module":
+        return split_by_module(analysis_result)
+    if split_by == "root":
+        return split_by_root(analysis_result)
+    raise ValueError(f"不支持的拆分方式: {split_by}，可选: {', '.join(SPLIT_MODES)}")
+
+
+def render_file(path: str, fmt: str) -> Tuple[Optional[str], Optional[str]]:
+    """
+    渲染单个 DOT 文件（在工作进程中运行）
+
+    Returns:
+        (输出文件路径, 错误信息)
+    """
+    try:
+        return graphviz.render("dot", fmt, path), None
+    except Exception as e:
+        return None, str(e)
+
+
+def render_files(paths: List[str], fmt: str = "svg",
+                 jobs: Optional[int] = None) -> List[Tuple[Optional[str], Optional[str]]]:
+    """
+    并行渲染一组 DOT 文件
+
+    Args:
+        paths: DOT 文件路径
+        fmt: 输出格式
+        jobs: 工作进程数，默认为 CPU 核数；为 1 时在当前进程中依次渲染
+
+    Returns:
+        与 paths 顺序一致的 (输出文件路径, 错误信息)
+
+    Raises:
+        ValueError: jobs 小于 1
+    """
+    if jobs is not None and jobs < 1:
+        raise ValueError(f"进程数必须为正整数: {jobs}")
+    if not HAS_GRAPHVIZ:
+        return [(None, "Graphviz 未安装，请运行: pip install graphviz")] * len(paths)
+
+    jobs = min(jobs or os.cpu_count() or 1, len(paths)) or 1
+    if jobs == 1:
+        return [render_file(path, fmt) for path in paths]
+
+    chunksize = max(1, len(paths) // (jobs * 4))
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        return list(executor.map(render_file, paths, repeat(fmt), chunksize=chunksize))
+
+
+def write_index(entries: List[Dict[str, Any]], output_dir: Path, title: str) -> Path:
+    """
+    生成链接所有分片的索引页
+
+    Args:
+        entries: 每个分片的 name、classes、dot、output、error
+        output_dir: 输出目录
+        title: 页面标题
+
+    Returns:
+        索引页路径
+    """
+    rows = []
+    for entry in entries:
+        target = entry["output"] or entry["dot"]
+        link = html.escape(os.path.relpath(target, output_dir))
+        note = ""
+        if entry["error"]:
+            note = f' <span class="error" title="{html.escape(entry["error"])}">渲染失败</span>'
+        rows.append(f'<li><a href="{link}">{html.escape(entry["name"])}</a> '
+                    f'<span class="count">{entry["classes"]} 类</span>{note}</li>')
+
+    page = f"""<!DOCTYPE html>
+<html lang="zh-CN">
+<head>
+<meta charset="utf-8">
+<title>{html.escape(title)}</title>
+<style>
+body {{ font-family: Arial, sans-serif; margin: 2em; }}
+li {{ margin: 0.3em 0; }}
+.count {{ color: #666; font-size: 0.9em; }}
+.error {{ color: #c62828; font-size: 0.9em; }}
+</style>
+</head>
+<body>
+<h1>{html.escape(title)}</h1>
+<ul>
+{chr(10).join(rows)}
+</ul>
+</body>
+</html>
+"""
+    index_path = output_dir / "index.html"
+    index_path.write_text(page, encoding="utf-8")
+    return index_path
@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+SQLite 类/方法索引
+
+将分析结果持久化到 SQLite，支持跨项目、跨提交的即席查询而无需重新扫描源码：
+- 每次写入作为一次 run（项目、包、Git 提交）
+- 类、基类、MRO 位置、方法归属分表存储并建立索引
+- 单事务批量写入，支持流式追加（方法归属在写入结束时由 SQL 统一解析）
+"""
+
+import sqlite3
+import time
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Iterable, Iterator, Tuple
+
+DEFAULT_DB_NAME = "supermro.sqlite"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    project TEXT NOT NULL,
+    package TEXT NOT NULL,
+    revision TEXT,
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS classes (
+    id INTEGER PRIMARY KEY,
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    module TEXT,
+    file TEXT,
+    external INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS bases (
+    class_id INTEGER NOT NULL REFERENCES classes(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    base TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS mro (
+    class_id INTEGER NOT NULL REFERENCES classes(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    ancestor TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS methods (
+    class_id INTEGER NOT NULL REFERENCES classes(id) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    owner TEXT,
+    own INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_runs_project ON runs(project, package, id);
+CREATE INDEX IF NOT EXISTS idx_classes_run_name ON classes(run_id, name);
+CREATE INDEX IF NOT EXISTS idx_classes_name ON classes(name);
+CREATE INDEX IF NOT EXISTS idx_bases_base ON bases(base, class_id);
+CREATE INDEX IF NOT EXISTS idx_mro_ancestor ON mro(ancestor, class_id);
+CREATE INDEX IF NOT EXISTS idx_mro_class ON mro(class_id, position);
+CREATE INDEX IF NOT EXISTS idx_methods_name ON methods(name, class_id);
+CREATE INDEX IF NOT EXISTS idx_methods_class ON methods(class_id);
+"""
+
+
+class SqliteIndex:
+    """基于 SQLite 的持久化继承索引"""
+
+    def __init__(self, db_path: str = DEFAULT_DB_NAME):
+        """
+        打开（必要时创建）索引数据库
+
+        Args:
+            db_path: 数据库文件路径
+        """
+        self.db_path = Path(db_path)
+        self.conn = sqlite3.connect(str(self.db_path))
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        self.conn.executescript(_SCHEMA)
+        self._next_class_id = 1
+
+    def close(self) -> None:
+        """关闭数据库连接"""
+        self.conn.close()
+
+    def __enter__(self) -> "SqliteIndex":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def write(self, analysis_result: Dict[str, Any], project: str,
+              revision: Optional[str] = None) -> int:
+        """
+        将分析结果写入索引
+
+        所有行在同一个事务中批量插入。
+
+        Args:
+            analysis_result: 分析结果
+            project: 项目标识（如仓库名或路径）
+            revision: Git 提交（可选）
+
+        Returns:
+            新建 run 的 id
+        """
+        try:
+            run_id = self.begin_run(analysis_result["package_name"], project, revision)
+            self.add_records(run_id, records_from_result(analysis_result))
+            self.finish_run(run_id)
+        except BaseException:
+            self.conn.rollback()
+            raise
+        return run_id
+
+    def begin_run(self, package_name: str, project: str,
+                  revision: Optional[str] = None) -> int:
+        """
+        开始一次写入（事务在 finish_run 时提交）
+
+        Returns:
+            新建 run 的 id
+        """
+        cursor = self.conn.execute(
+            "INSERT INTO runs (project, package, revision, created_at) VALUES (?, ?, ?, ?)",
+            (project, package_name, revision, time.time()))
+        self._next_class_id = self.conn.execute(
+            "SELECT COALESCE(MAX(id), 0) + 1 FROM classes").fetchone()[0]
+        if cursor.lastrowid is None:
+            raise sqlite3.DatabaseError("无法创建 run 记录")
+        return cursor.lastrowid
+
+    def add_records(self, run_id: int, records: Iterable[Dict[str, Any]]) -> None:
+        """
+        批量追加类记录
+
+        记录格式见 records_from_result；kind 为 external 的记录表示包外类。
+        """
+        class_rows: List[Tuple[Any, ...]] = []
+        base_rows: List[Tuple[Any, ...]] = []
+        mro_rows: List[Tuple[Any, ...]] = []
+        method_rows: List[Tuple[Any, ...]] = []
+
+        for record in records:
+            class_id = self._next_class_id
+            self._next_class_id += 1
+            is_external = record["kind"] == "external"
+            class_rows.append((class_id, run_id, record["class"], record["module"],
+                               record.get("file"), int(is_external)))
+            base_rows.extend((class_id, i, base) for i, base in enumerate(record["bases"]))
+            mro_rows.extend((class_id, i, ancestor) for i, ancestor in enumerate(record["mro"]))
+            own = set(record.get("own_methods", ()))
+            methods = own if is_external else record.get("methods", ())
+            method_rows.extend((class_id, method, int(method in own)) for method in methods)
+
+        self.conn.executemany(
+            "INSERT INTO classes (id, run_id, name, module, file, external) "
+            "VALUES (?, ?, ?, ?, ?, ?)", class_rows)
+        self.conn.executemany(
+            "INSERT INTO bases (class_id, position, base) VALUES (?, ?, ?)", base_rows)
+        self.conn.executemany(
+            "INSERT INTO mro (class_id, position, ancestor) VALUES (?, ?, ?)", mro_rows)
+        self.conn.executemany(
+            "INSERT INTO methods (class_id, name, own) VALUES (?, ?, ?)", method_rows)
+
+    def finish_run(self, run_id: int) -> None:
+        """沿 MRO 解析每个方法的定义者并提交事务"""
+        self.conn.execute("""
+            UPDATE methods SET owner = (
+                SELECT a.ancestor FROM mro a
+                JOIN classes d ON d.run_id = ? AND d.name = a.ancestor
+                JOIN methods dm ON dm.class_id = d.id AND dm.name = methods.name AND dm.own = 1
+                WHERE a.class_id = methods.class_id
+                ORDER BY a.position LIMIT 1)
+            WHERE class_id IN (SELECT id FROM classes WHERE run_id = ?)
+        """, (run_id, run_id))
+        self.conn.commit()
+
+    def _run_filter(self, project: Optional[str], run_id: Optional[int]) -> Tuple[str, List[Any]]:
+        """生成 run 过滤条件：指定 run，或每个项目/包的最新 run"""
+        if run_id is not None:
+            return "c.run_id = ?", [run_id]
+        clause = ("c.run_id IN (SELECT MAX(id) FROM runs "
+                  + ("WHERE project = ? " if project else "")
+                  + "GROUP BY project, package)")
+        return clause, [project] if project else []
+
+    def _query(self, sql: str, params: Iterable[Any]) -> List[Dict[str, Any]]:
+        return [dict(row) for row in self.conn.execute(sql, list(params))]
+
+    def runs(self, project: Optional[str] = None) -> List[Dict[str, Any]]:
+        """列出已索引的 run"""
+        sql = ("SELECT r.id AS run, r.project, r.package, r.revision, "
+               "COUNT(c.id) AS classes FROM runs r LEFT JOIN classes c "
+               "ON c.run_id = r.id AND c.external = 0 "
+               + ("WHERE r.project = ? " if project else "")
+               + "GROUP BY r.id ORDER BY r.id")
+        return self._query(sql, [project] if project else [])
+
+    def overrides(self, method: str, under: Optional[str] = None,
+                  project: Optional[str] = None, run_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        查询自身定义（重写）了某方法的类
+
+        Args:
+            method: 方法名
+            under: 只返回 MRO 中包含该基类的子类
+        """
+        where, params = self._run_filter(project, run_id)
+        sql = ("SELECT r.project, c.name AS class, c.module, c.file FROM classes c "
+               "JOIN runs r ON r.id = c.run_id "
+               "JOIN methods m ON m.class_id = c.id AND m.name = ? AND m.owner = c.name ")
+        params = [method] + params
+        if under:
+            sql += "JOIN mro a ON a.class_id = c.id AND a.ancestor = ? AND a.position > 0 "
+            params.insert(1, under)
+        sql += f"WHERE c.external = 0 AND {where} ORDER BY r.project, c.module, c.name"
+        return self._query(sql, params)
+
+    def subclasses(self, base: str, direct: bool = False, project: Optional[str] = None,
+                   run_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        """查询某个类的子类（默认包含间接子类）"""
+        where, params = self._run_filter(project, run_id)
+        if direct:
+            join = "JOIN bases b ON b.class_id = c.id AND b.base = ? "
+        else:
+            join = "JOIN mro a ON a.class_id = c.id AND a.ancestor = ? AND a.position > 0 "
+        sql = ("SELECT r.project, c.name AS class, c.module, c.file FROM classes c "
+               "JOIN runs r ON r.id = c.run_id " + join
+               + f"WHERE c.external = 0 AND {where} ORDER BY r.project, c.module, c.name")
+        return self._query(sql, [base] + params)
+
+    def mro(self, class_name: str, project: Optional[str] = None,
+            run_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        """查询类的 MRO"""
+        where, params = self._run_filter(project, run_id)
+        sql = ("SELECT r.project, c.module, a.position, a.ancestor FROM classes c "
+               "JOIN runs r ON r.id = c.run_id JOIN mro a ON a.class_id = c.id "
+               f"WHERE c.name = ? AND {where} ORDER BY r.project, c.module, a.position")
+        return self._query(sql, [class_name] + params)
+
+    def owner(self, class_name: str, method: str, project: Optional[str] = None,
+              run_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        """查询类上某方法实际由哪个类提供"""
+        where, params = self._run_filter(project, run_id)
+        sql = ("SELECT r.project, c.name AS class, c.module, m.name AS method, m.owner "
+               "FROM classes c JOIN runs r ON r.id = c.run_id "
+               "JOIN methods m ON m.class_id = c.id AND m.name = ? "
+               f"WHERE c.name = ? AND {where} ORDER BY r.project, c.module")
+        return self._query(sql, [method, class_name] + params)
+
+    def hierarchy(self, project: Optional[str] = None,
+                  run_id: Optional[int] = None) -> Dict[str, Dict[str, Dict[str, List[str]]]]:
+        """
+        读取继承图（用于 C3Linearizer，无需导入源码）
+
+        Returns:
+            项目 -> {"bases": 包内类 -> 基类列表, "fixed": 包外类 -> MRO}
+        """
+        where, params = self._run_filter(project, run_id)
+        graphs: Dict[str, Dict[str, Dict[str, List[str]]]] = {}
+        for table, key, column in (("bases", "bases", "base"), ("mro", "fixed", "ancestor")):
+            external = 0 if key == "bases" else 1
+            sql = (f"SELECT r.project, c.name, t.{column} AS value FROM classes c "
+                   f"JOIN runs r ON r.id = c.run_id "
+                   f"LEFT JOIN {table} t ON t.class_id = c.id "
+                   f"WHERE c.external = ? AND {where} ORDER BY c.id, t.position")
+            for row in self.conn.execute(sql, [external] + params):
+                graph = graphs.setdefault(row["project"], {"bases": {}, "fixed": {}})
+                values = graph[key].setdefault(row["name"], [])
+                if row["value"] is not None:
+                    values.append(row["value"])
+        for graph in graphs.values():
+            for name in graph["bases"]:
+                graph["fixed"].pop(name, None)
+        return graphs
+
+
+def records_from_result(analysis_result: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """
+    将分析结果展开为逐类记录
+
+    与 InheritanceAnalyzer.iter_class_records 产出的记录格式相同。
+    """
+    for module_name, module_info in analysis_result["modules"].items():
+        for class_name, class_info in module_info["classes"].items():
+            yield dict(class_info, kind="class", module=module_name,
+                       file=module_info["file"], **{"class": class_name})
+    for class_name, class_info in analysis_result.get("external_classes", {}).items():
+        yield dict(class_info, kind="external", **{"class": class_name})
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+流式分析输出
+
+配合 InheritanceAnalyzer.stream_package 使用的记录输出目标（sink）。sink 需要
+提供 write(record) 和 close() 方法，可选的 abort() 在分析失败时代替 close()
+调用。内置支持：
+- JSON Lines 文件：每行一条类记录
+- 快照：与 analyze_package 结果格式相同的 JSON 文件，逐模块写出
+- SQLite 索引：写入 SqliteIndex，整个流在一个事务中提交
+
+内存上限
+--------
+流式分析只在内存中保留继承骨架（类名 -> 基类名元组），导入的包内模块每
+module_window 个模块清理一次。峰值内存（tracemalloc 统计的 Python 分配）
+不超过::
+
+    MEMORY_BASE + MEMORY_PER_CLASS * 类数量 + MEMORY_PER_WINDOW_MODULE * module_window
+
+其中单个模块的估算按中等规模模块（数十个类）计算。性能测试会验证该上限。
+"""
+
+import json
+from pathlib import Path
+from typing import Dict, Any, Optional, List, Union
+
+from .store import SqliteIndex
+
+DEFAULT_MODULE_WINDOW = 64
+
+MEMORY_BASE = 4 * 1024 * 1024
+MEMORY_PER_CLASS = 512
+MEMORY_PER_WINDOW_MODULE = 64 * 1024
+
+
+def memory_ceiling(class_count: int, module_window: int = DEFAULT_MODULE_WINDOW) -> int:
+    """流式分析的峰值内存上限（字节）"""
+    return (MEMORY_BASE + MEMORY_PER_CLASS * class_count
+            + MEMORY_PER_WINDOW_MODULE * module_window)
+
+
+class JsonlSink:
+    """每行写出一条记录"""
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self._file = open(self.path, "w", encoding="utf-8")
+
+    def write(self, record: Dict[str, Any]) -> None:
+        self._file.write(json.dumps(record, ensure_ascii=False))
+        self._file.write("\n")
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class SnapshotSink:
+    """
+    以 analyze_package 的结果格式逐模块写出 JSON
+
+    类记录按模块顺序到达，因此每个模块写完即可丢弃；包外类数量通常较少，
+    缓存到结尾统一写出。inheritance_chains 与各类的 mro 重复，不写出。
+    """
+
+    def __init__(self, path: str, package_name: str):
+        self.path = Path(path)
+        self._file = open(self.path, "w", encoding="utf-8")
+        self._file.write('{"package_name": %s, "modules": {' % json.dumps(package_name))
+        self._module: Optional[str] = None
+        self._first_class = True
+        self._external: Dict[str, Any] = {}
+
+    def write(self, record: Dict[str, Any]) -> None:
+        record = dict(record)
+        kind = record.pop("kind")
+        name = record.pop("class")
+
+        if kind == "external":
+            self._external[name] = record
+            return
+
+        if record["module"] != self._module:
+            if self._module is not None:
+                self._file.write("}}, ")
+            self._module = record["module"]
+            self._file.write('%s: {"file": %s, "classes": {' % (
+                json.dumps(self._module, ensure_ascii=False), json.dumps(record["file"])))
+            self._first_class = True
+
+        if not self._first_class:
+            self._file.write(", ")
+        self._first_class = False
+        self._file.write("%s: %s" % (json.dumps(name, ensure_ascii=False),
+                                     json.dumps(record, ensure_ascii=False)))
+
+    def close(self) -> None:
+        if self._module is not None:
+            self._file.write("}}")
+        self._file.write('}, "classes": {}, "inheritance_chains": {}, "external_classes": ')
+        json.dump(self._external, self._file, ensure_ascii=False)
+        self._file.write("}")
+        self._file.close()
+
+
+class SqliteSink:
+    """写入 SQLite 索引，按批插入"""
+
+    BATCH_SIZE = 1000
+
+    def __init__(self, path: str, package_name: str, project: str,
+                 revision: Optional[str] = None):
+        self.index = SqliteIndex(path)
+        self.run_id = self.index.begin_run(package_name, project, revision)
+        self._batch: List[Dict[str, Any]] = []
+
+    def write(self, record: Dict[str, Any]) -> None:
+        self._batch.append(record)
+        if len(self._batch) >= self.BATCH_SIZE:
+            self.index.add_records(self.run_id, self._batch)
+            self._batch = []
+
+    def close(self) -> None:
+        self.index.add_records(self.run_id, self._batch)
+        self._batch = []
+        self.index.finish_run(self.run_id)
+        self.index.close()
+
+    def abort(self) -> None:
+        """放弃本次写入"""
+        self.index.conn.rollback()
+        self.index.close()
+
+
+def open_sink(path: str, package_name: str, project: str,
+              revision: Optional[str] = None) -> Union[JsonlSink, SnapshotSink, SqliteSink]:
+    """
+    按文件后缀创建 sink
+
+    .jsonl -> JsonlSink，.sqlite/.db -> SqliteSink，其他 -> SnapshotSink
+    """
+    suffix = Path(path).suffix.lower()
+    if suffix == ".jsonl":
+        return JsonlSink(path)
+    if suffix in (".sqlite", ".sqlite3", ".db"):
+        return SqliteSink(path, package_name, project, revision)
+    return SnapshotSink(path, package_name)
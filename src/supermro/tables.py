@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+表格输出
+
+将行数据格式化为对齐文本、CSV 或 JSON，供指标、查询和追踪结果共用。
+"""
+
+import csv
+import io
+import json
+from typing import List, Dict, Any
+
+TABLE_FORMATS = ("text", "csv", "json")
+
+
+def format_rows(rows: List[Dict[str, Any]], columns: List[str], fmt: str = "text") -> str:
+    """
+    格式化表格
+
+    Args:
+        rows: 行数据
+        columns: 输出的列（text/csv 格式）
+        fmt: text、csv 或 json
+
+    Returns:
+        表格文本
+    """
+    if fmt == "json":
+        return json.dumps(rows, ensure_ascii=False, indent=2) + "\n"
+
+    if fmt == "csv":
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=columns, lineterminator="\n",
+                                extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(rows)
+        return buffer.getvalue()
+
+    if fmt != "text":
+        raise ValueError(f"不支持的表格格式: {fmt}")
+
+    cells = [columns] + [["" if row.get(col) is None else str(row[col]) for col in columns]
+                         for row in rows]
+    widths = [max(len(line[i]) for line in cells) for i in range(len(columns))]
+    lines = ["  ".join(cell.ljust(width) for cell, width in zip(line, widths)).rstrip()
+             for line in cells]
+    lines.insert(1, "  ".join("-" * width for width in widths))
+    return "\n".join(lines) + "\n"
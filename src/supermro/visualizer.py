@@ -6,14 +6,20 @@
 - 生成继承关系图
 - 智能颜色分类
 - 多种输出格式
+- 交互式 HTML 报告
 """
 
 import sys
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, List, Tuple, Union
+
+from .html_report import build_report_data, render_html
+from .dot import write_dot
+from .shards import split_result, render_files, write_index
 
 # 可选：安装 Graphviz 支持
 try:
+    import graphviz
     from graphviz import Digraph
     HAS_GRAPHVIZ = True
 except ImportError:
@@ -43,13 +49,57 @@ class InheritanceVisualizer:
             print("⚠️ Graphviz 未安装，请运行: pip install graphviz")
             return None
         
-        package_name = analysis_result["package_name"]
-        modules = analysis_result["modules"]
-        
-        if not modules:
+        if not analysis_result["modules"]:
             print("⚠️ 没有找到可分析的模块")
             return None
         
+        package_name = analysis_result["package_name"]
+        
+        # 生成文件
+        if output_path is None:
+            output_path = f"{package_name}_inheritance.gv"
+        
+        output_file = Path(output_path)
+        self.write_dot(analysis_result, output_file)
+        graphviz.view(graphviz.render("dot", "pdf", output_file))
+        
+        print(f"✅ 继承关系可视化生成成功: {output_file.absolute()}")
+        return str(output_file.absolute())
+    
+    def write_dot(self, analysis_result: Dict[str, Any],
+                  output_path: Union[str, Path]) -> Path:
+        """
+        将继承关系图写为 DOT 文件（不渲染，不需要 graphviz）
+        
+        Args:
+            analysis_result: 分析结果
+            output_path: 输出路径
+            
+        Returns:
+            输出文件路径
+        """
+        output_file = Path(output_path)
+        with open(output_file, "w", encoding="utf-8") as f:
+            write_dot(analysis_result, f, self._get_module_color,
+                      self._get_class_color, self._format_methods)
+        return output_file
+    
+    def build_graph(self, analysis_result: Dict[str, Any]) -> "Digraph":
+        """
+        构建继承关系图（不渲染）
+        
+        逐个节点调用 graphviz Python 包，大型图较慢；只需要 DOT 文本时
+        使用 write_dot。不调用 dot 可执行文件。
+        
+        Args:
+            analysis_result: 分析结果
+            
+        Returns:
+            graphviz.Digraph
+        """
+        package_name = analysis_result["package_name"]
+        modules = analysis_result["modules"]
+        
         # 创建图形
         dot = Digraph(
             comment=f"{package_name} Class Hierarchy",
@@ -62,8 +112,8 @@ class InheritanceVisualizer:
         )
         
         # 按模块组织类
-        module_classes = {}
-        added_edges = set()
+        module_classes: Dict[str, Any] = {}
+        added_edges: Dict[Tuple[str, str], None] = {}
         
         # 收集数据
         for module_name, module_info in modules.items():
@@ -72,22 +122,17 @@ class InheritanceVisualizer:
             
             for class_name, class_info in module_info["classes"].items():
                 methods = class_info["methods"]
-                methods_str = ', '.join(methods[:3]) if methods else '无公共方法'
-                if methods and len(methods) > 3:
-                    methods_str += f'... (+{len(methods)-3})'
                 
                 classes.append({
                     'name': class_name,
-                    'methods': methods_str,
+                    'methods': self._format_methods(methods),
                     'methods_count': len(methods)
                 })
                 
                 # 收集继承关系
                 mro = class_info["mro"][:-1]  # 去掉 object
                 for i in range(len(mro)-1):
-                    edge = (mro[i], mro[i+1])
-                    if edge not in added_edges:
-                        added_edges.add(edge)
+                    added_edges[(mro[i], mro[i+1])] = None
             
             if classes:
                 module_classes[module_name] = {
@@ -102,16 +147,102 @@ class InheritanceVisualizer:
         for child, parent in added_edges:
             dot.edge(child, parent, color="black", arrowhead="normal")
         
-        # 生成文件
+        return dot
+    
+    def visualize_shards(self, analysis_result: Dict[str, Any], split_by: str = "module",
+                         output_dir: Optional[str] = None, fmt: str = "svg",
+                         jobs: Optional[int] = None) -> Optional[str]:
+        """
+        按模块或根类拆分为多张图并行渲染，并生成索引页
+        
+        Args:
+            analysis_result: 分析结果
+            split_by: module 或 root
+            output_dir: 输出目录，默认为 {包名}_{split_by}_graphs
+            fmt: 渲染格式
+            jobs: 渲染进程数，默认为 CPU 核数
+            
+        Returns:
+            索引页路径
+        """
+        package_name = analysis_result["package_name"]
+        shards = split_result(analysis_result, split_by)
+        if not shards:
+            print("⚠️ 没有找到可分析的模块")
+            return None
+        
+        directory = Path(output_dir if output_dir is not None
+                         else f"{package_name}_{split_by}_graphs")
+        directory.mkdir(parents=True, exist_ok=True)
+        
+        dot_files = [str(self.write_dot(shard, directory / f"{name}.gv"))
+                     for name, shard in shards]
+        print(f"🎨 渲染 {len(dot_files)} 张图...")
+        rendered = render_files(dot_files, fmt, jobs)
+        
+        entries = []
+        errors = []
+        for (name, shard), dot_file, (output, error) in zip(shards, dot_files, rendered):
+            if error:
+                errors.append(error)
+            entries.append({
+                "name": name,
+                "classes": sum(len(m["classes"]) for m in shard["modules"].values()),
+                "dot": dot_file,
+                "output": output,
+                "error": error
+            })
+        
+        title = f"{package_name} 继承关系图（按{'模块' if split_by == 'module' else '根类'}）"
+        index_path = write_index(entries, directory, title)
+        if errors:
+            print(f"⚠️ {len(errors)} 张图渲染失败，索引页改为链接 DOT 文件: {errors[0]}")
+        print(f"✅ 分片索引生成成功: {index_path.absolute()}")
+        return str(index_path.absolute())
+    
+    def export_html(self, analysis_result: Dict[str, Any],
+                    output_path: Optional[str] = None) -> Optional[str]:
+        """
+        生成自包含的交互式 HTML 报告
+        
+        报告内嵌分析数据，在浏览器中完成布局、搜索、集群折叠和祖先/后代高亮，
+        不依赖 Graphviz。
+        
+        Args:
+            analysis_result: 分析结果
+            output_path: 输出路径，默认为 {包名}_inheritance.html
+            
+        Returns:
+            生成的文件路径
+        """
+        package_name = analysis_result["package_name"]
+        if not analysis_result["modules"]:
+            print("⚠️ 没有找到可分析的模块")
+            return None
+        
+        data = build_report_data(
+            analysis_result,
+            self._get_module_color,
+            self._get_class_color,
+            self._format_methods
+        )
+        
         if output_path is None:
-            output_path = f"{package_name}_inheritance.gv"
+            output_path = f"{package_name}_inheritance.html"
         
         output_file = Path(output_path)
-        dot.render(output_file, view=True)
+        output_file.write_text(render_html(data), encoding="utf-8")
         
-        print(f"✅ 继承关系可视化生成成功: {output_file.absolute()}")
+        print(f"✅ 交互式报告生成成功: {output_file.absolute()}")
         return str(output_file.absolute())
     
+    def _format_methods(self, methods: List[str]) -> str:
+        """生成方法摘要（前3个方法）"""
+        methods_str = ', '.join(methods[:3]) if methods else '无公共方法'
+        if methods and len(methods) > 3:
+            methods_str += f'... (+{len(methods)-3})'
+        return methods_str
+    
     def _create_module_clusters(self, dot, module_classes: Dict[str, Any]):
         """创建模块集群"""
         module_names = list(module_classes.keys())
@@ -0,0 +1,23 @@
+"""
+测试公共配置
+"""
+
+import os
+import shutil
+import tempfile
+
+import pytest
+
+
+@pytest.fixture(scope="session", autouse=True)
+def user_cache_home():
+    """用户级缓存（包外类描述）写入临时目录，不污染真实的 ~/.cache"""
+    cache_home = tempfile.mkdtemp()
+    previous = os.environ.get("XDG_CACHE_HOME")
+    os.environ["XDG_CACHE_HOME"] = cache_home
+    yield cache_home
+    if previous is None:
+        del os.environ["XDG_CACHE_HOME"]
+    else:
+        os.environ["XDG_CACHE_HOME"] = previous
+    shutil.rmtree(cache_home, ignore_errors=True)
@@ -0,0 +1,139 @@
+"""
+测试变更检测与增量分析
+"""
+
+import sys
+import shutil
+import subprocess
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from supermro.analyzer import InheritanceAnalyzer
+from supermro.cache import ResultCache
+from supermro.changes import affected_modules, files_to_modules
+
+
+def _class_info(name, mro):
+    return {"name": name, "mro": mro}
+
+
+class TestAffectedModules:
+    """测试受影响模块的计算"""
+
+    def setup_method(self):
+        self.previous = {
+            "modules": {
+                "pkg.base": {"classes": {
+                    "Base": _class_info("Base", ["Base", "object"])}},
+                "pkg.mid": {"classes": {
+                    "Mid": _class_info("Mid", ["Mid", "Base", "object"])}},
+                "pkg.leaf": {"classes": {
+                    "Leaf": _class_info("Leaf", ["Leaf", "Mid", "Base", "object"])}},
+                "pkg.other": {"classes": {
+                    "Other": _class_info("Other", ["Other", "object"])}},
+            }
+        }
+
+    def test_transitive_closure(self):
+        """测试变更基类会影响所有子类模块"""
+        affected = affected_modules(self.previous, {"pkg.base"})
+        assert affected == {"pkg.base", "pkg.mid", "pkg.leaf"}
+
+    def test_leaf_change(self):
+        """测试叶子类变更只影响自身"""
+        assert affected_modules(self.previous, {"pkg.leaf"}) == {"pkg.leaf"}
+
+    def test_new_module(self):
+        """测试新模块不在旧结果中"""
+        assert affected_modules(self.previous, {"pkg.new"}) == {"pkg.new"}
+
+
+def test_files_to_modules(tmp_path):
+    """测试文件路径到模块名的映射"""
+    files = [
+        tmp_path / "pkg" / "__init__.py",
+        tmp_path / "pkg" / "sub" / "models.py",
+        tmp_path / "pkg" / "README.md",
+        tmp_path / "other" / "x.py",
+    ]
+    modules = files_to_modules(files, tmp_path, "pkg")
+    assert modules == {"pkg", "pkg.sub.models"}
+
+
+@pytest.mark.skipif(shutil.which("git") is None, reason="需要 git")
+class TestAnalyzeChanged:
+    """测试基于 Git 的增量分析"""
+
+    def setup_method(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.root = Path(self.temp_dir)
+        package_dir = self.root / "chgpkg"
+        package_dir.mkdir()
+        (package_dir / "__init__.py").touch()
+        (package_dir / "base.py").write_text(
+            "class Base:\n    def run(self):\n        pass\n")
+        (package_dir / "child.py").write_text(
+            "from .base import Base\n\nclass Child(Base):\n    pass\n")
+        (package_dir / "other.py").write_text("class Other:\n    pass\n")
+
+        self._git("init", "-q")
+        self._git("add", ".")
+        self._git("-c", "user.name=t", "-c", "user.email=t@t",
+                  "commit", "-q", "-m", "init")
+
+        self.analyzer = InheritanceAnalyzer(self.temp_dir)
+        self.cache = ResultCache(self.root / ".supermro_cache")
+
+    def teardown_method(self):
+        for name in [m for m in sys.modules if m.split(".")[0] == "chgpkg"]:
+            del sys.modules[name]
+        shutil.rmtree(self.temp_dir)
+
+    def _git(self, *args):
+        subprocess.run(["git", *args], cwd=self.temp_dir, check=True)
+
+    def test_reanalyzes_only_closure(self):
+        """测试只重新分析受影响的模块"""
+        first = self.analyzer.analyze_changed("chgpkg", "HEAD", self.cache)
+        assert set(first["modules"]) == {"chgpkg.base", "chgpkg.child", "chgpkg.other"}
+
+        (self.root / "chgpkg" / "base.py").write_text(
+            "class Base:\n    def run(self):\n        pass\n\n"
+            "    def stop(self):\n        pass\n")
+        for name in [m for m in sys.modules if m.split(".")[0] == "chgpkg"]:
+            del sys.modules[name]
+
+        second = self.analyzer.analyze_changed("chgpkg", "HEAD", self.cache)
+        assert second["changed_modules"] == ["chgpkg.base"]
+        assert set(second["reanalyzed_modules"]) == {"chgpkg.base", "chgpkg.child"}
+        child = second["modules"]["chgpkg.child"]["classes"]["Child"]
+        assert "stop" in child["methods"]
+        assert second["modules"]["chgpkg.other"] == first["modules"]["chgpkg.other"]
+
+    def test_reverted_working_tree_change(self):
+        """测试基于未提交修改的缓存在修改撤销后重新分析"""
+        base = self.root / "chgpkg" / "base.py"
+        original = base.read_text()
+        base.write_text(original + "\n    def dirty(self):\n        pass\n")
+        first = self.analyzer.analyze_changed("chgpkg", "HEAD", self.cache)
+        assert "dirty" in first["modules"]["chgpkg.base"]["classes"]["Base"]["methods"]
+        assert self.cache.load("chgpkg")["dirty"] == ["chgpkg.base"]
+
+        self._git("checkout", "--", "chgpkg/base.py")
+        for name in [m for m in sys.modules if m.split(".")[0] == "chgpkg"]:
+            del sys.modules[name]
+
+        second = self.analyzer.analyze_changed("chgpkg", "HEAD", self.cache)
+        assert set(second["reanalyzed_modules"]) == {"chgpkg.base", "chgpkg.child"}
+        modules = second["modules"]
+        assert "dirty" not in modules["chgpkg.base"]["classes"]["Base"]["methods"]
+        assert "dirty" not in modules["chgpkg.child"]["classes"]["Child"]["methods"]
+        assert self.cache.load("chgpkg")["dirty"] == []
+
+    def test_not_a_repository(self):
+        """测试非 Git 仓库返回错误"""
+        shutil.rmtree(self.root / ".git")
+        result = self.analyzer.analyze_changed("chgpkg", "HEAD", self.cache)
+        assert "error" in result
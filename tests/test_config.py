@@ -0,0 +1,106 @@
+"""
+测试分析范围配置
+"""
+
+import sys
+import shutil
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from supermro.analyzer import InheritanceAnalyzer
+from supermro.config import AnalysisConfig, HAS_TOML
+
+
+class TestAnalysisConfig:
+    """测试配置规则"""
+
+    def test_defaults(self):
+        """测试默认配置不排除任何模块"""
+        config = AnalysisConfig()
+        assert config.is_included("pkg.tests.test_x")
+        assert not config.is_excluded("pkg.tests")
+        assert config.is_member_visible("run")
+        assert not config.is_member_visible("_helper")
+
+    def test_include_covers_subtree(self):
+        """测试包含包时也包含其子模块"""
+        config = AnalysisConfig(include=["pkg.core"])
+        assert config.is_included("pkg.core")
+        assert config.is_included("pkg.core.models")
+        assert not config.is_included("pkg.api")
+
+    def test_member_visibility(self):
+        """测试成员可见性规则"""
+        protected = AnalysisConfig(members="protected")
+        assert protected.is_member_visible("_helper")
+        assert not protected.is_member_visible("__init__")
+        assert AnalysisConfig(members="all").is_member_visible("__init__")
+
+    def test_invalid_members(self):
+        """测试非法的可见性规则"""
+        with pytest.raises(ValueError):
+            AnalysisConfig(members="private")
+
+    @pytest.mark.skipif(not HAS_TOML, reason="需要 tomllib 或 tomli")
+    def test_from_pyproject(self, tmp_path):
+        """测试从 pyproject.toml 读取配置"""
+        pyproject = tmp_path / "pyproject.toml"
+        pyproject.write_text(
+            '[tool.supermro]\n'
+            'exclude = ["*.tests"]\n'
+            'members = "protected"\n'
+            'external-depth = 1\n'
+        )
+        config = AnalysisConfig.from_pyproject(pyproject)
+        assert config.exclude == ["*.tests"]
+        assert config.members == "protected"
+        assert config.external_depth == 1
+
+    def test_missing_pyproject(self, tmp_path):
+        """测试没有 pyproject.toml 时使用默认配置"""
+        config = AnalysisConfig.from_pyproject(tmp_path / "pyproject.toml")
+        assert config == AnalysisConfig()
+
+
+class TestScopedAnalysis:
+    """测试配置对分析范围的影响"""
+
+    def setup_method(self):
+        self.temp_dir = tempfile.mkdtemp()
+        package_dir = Path(self.temp_dir) / "scopepkg"
+        package_dir.mkdir()
+        (package_dir / "__init__.py").touch()
+        (package_dir / "models.py").write_text(
+            "class Model(Exception):\n"
+            "    def save(self):\n        pass\n"
+            "    def _validate(self):\n        pass\n")
+        tests_dir = package_dir / "tests"
+        tests_dir.mkdir()
+        (tests_dir / "__init__.py").write_text("raise RuntimeError('不应被导入')\n")
+        (tests_dir / "test_models.py").write_text("class TestModel:\n    pass\n")
+
+    def teardown_method(self):
+        for name in [m for m in sys.modules if m.split(".")[0] == "scopepkg"]:
+            del sys.modules[name]
+        shutil.rmtree(self.temp_dir)
+
+    def test_exclude_before_import(self):
+        """测试被排除的包不会被导入"""
+        config = AnalysisConfig(exclude=["*.tests"])
+        analyzer = InheritanceAnalyzer(self.temp_dir, config=config)
+        result = analyzer.analyze_package("scopepkg")
+        assert list(result["modules"]) == ["scopepkg.models"]
+        assert "scopepkg.tests" not in sys.modules
+        assert analyzer.find_python_packages() == ["scopepkg"]
+
+    def test_members_and_external_depth(self):
+        """测试成员可见性与包外基类深度限制"""
+        config = AnalysisConfig(exclude=["*.tests"], members="protected",
+                                external_depth=1)
+        analyzer = InheritanceAnalyzer(self.temp_dir, config=config)
+        result = analyzer.analyze_package("scopepkg")
+        model = result["modules"]["scopepkg.models"]["classes"]["Model"]
+        assert "_validate" in model["own_methods"]
+        assert model["mro"] == ["Model", "Exception", "object"]
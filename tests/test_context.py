@@ -0,0 +1,129 @@
+"""
+测试分析上下文（src 布局、命名空间包与状态释放）
+"""
+
+import importlib
+import sys
+import shutil
+import tempfile
+import types
+from pathlib import Path
+
+import pytest
+
+from supermro.analyzer import InheritanceAnalyzer
+from supermro.changes import files_to_modules
+from supermro.context import AnalysisContext, source_roots
+
+
+class TestAnalysisContext:
+    """测试不修改 sys.path 的项目导入"""
+
+    def setup_method(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.root = Path(self.temp_dir).resolve()
+        src = self.root / "src"
+        (src / "srcpkg").mkdir(parents=True)
+        (src / "srcpkg" / "__init__.py").touch()
+        (src / "srcpkg" / "models.py").write_text(
+            "class Base:\n    def run(self):\n        pass\n\n"
+            "class Child(Base):\n    pass\n")
+
+        # 命名空间包 ctxns 分布在 src/ 和项目根目录两处
+        (src / "ctxns").mkdir()
+        (src / "ctxns" / "alpha.py").write_text("class Alpha:\n    pass\n")
+        (self.root / "ctxns").mkdir()
+        (self.root / "ctxns" / "beta.py").write_text(
+            "from ctxns.alpha import Alpha\n\nclass Beta(Alpha):\n    pass\n")
+
+        # 与标准库同名的目录（没有 __init__.py）不能遮蔽标准库
+        (self.root / "json").mkdir()
+        (self.root / "json" / "fake.py").touch()
+        # 与标准库同名的模块也不能遮蔽标准库
+        (self.root / "colorsys.py").write_text("SHADOWED = True\n")
+
+        self.sys_path = list(sys.path)
+        self.meta_path = list(sys.meta_path)
+
+    def teardown_method(self):
+        for name in [m for m in sys.modules if m.split(".")[0] in ("srcpkg", "ctxns")]:
+            del sys.modules[name]
+        shutil.rmtree(self.temp_dir)
+
+    def test_src_layout(self):
+        """测试 src 布局的包发现与分析"""
+        assert source_roots(self.root) == [self.root / "src", self.root]
+        with InheritanceAnalyzer(self.temp_dir) as analyzer:
+            assert analyzer.find_python_packages() == ["srcpkg"]
+            result = analyzer.analyze_package("srcpkg")
+            assert result["modules"]["srcpkg.models"]["classes"]["Child"]["mro"] == [
+                "Child", "Base", "object"]
+            assert sys.path == self.sys_path
+
+    def test_namespace_package(self):
+        """测试跨根目录的 PEP 420 命名空间包"""
+        with InheritanceAnalyzer(self.temp_dir) as analyzer:
+            result = analyzer.analyze_package("ctxns")
+            assert sorted(result["modules"]) == ["ctxns.alpha", "ctxns.beta"]
+            beta = result["modules"]["ctxns.beta"]["classes"]["Beta"]
+            assert beta["bases"] == ["Alpha"]
+            assert analyzer.context.finder.find_spec("json") is None
+
+    def test_close_releases_state(self):
+        """测试关闭后不保留 finder、模块和路径缓存"""
+        analyzer = InheritanceAnalyzer(self.temp_dir)
+        analyzer.analyze_package("srcpkg")
+        assert "srcpkg.models" in sys.modules
+        analyzer.close()
+
+        assert sys.meta_path == self.meta_path
+        assert sys.path == self.sys_path
+        assert not [m for m in sys.modules if m.split(".")[0] == "srcpkg"]
+        assert not [key for key in sys.path_importer_cache
+                    if isinstance(key, str) and key.startswith(str(self.root))]
+        with pytest.raises(ImportError):
+            importlib.import_module("srcpkg")
+
+    def test_many_projects(self):
+        """测试依次分析多个项目不累积导入状态"""
+        for _ in range(20):
+            with AnalysisContext(self.temp_dir):
+                importlib.import_module("srcpkg.models")
+        assert sys.meta_path == self.meta_path
+        assert "srcpkg" not in sys.modules
+
+    def test_finder_only_during_analysis(self):
+        """测试 finder 只在分析期间安装，未关闭的分析器也不累积"""
+        analyzers = [InheritanceAnalyzer(self.temp_dir) for _ in range(5)]
+        for analyzer in analyzers:
+            analyzer.analyze_package("srcpkg")
+            assert sys.meta_path == self.meta_path
+        for analyzer in analyzers:
+            analyzer.close()
+
+    def test_stdlib_not_shadowed(self):
+        """测试项目根目录下与标准库同名的模块不遮蔽标准库"""
+        sys.modules.pop("colorsys", None)
+        with InheritanceAnalyzer(self.temp_dir) as analyzer:
+            with analyzer.context.importing("srcpkg"):
+                assert analyzer.context.finder.find_spec("colorsys") is None
+                colorsys = importlib.import_module("colorsys")
+            assert not hasattr(colorsys, "SHADOWED")
+            assert not analyzer.context.owns(colorsys)
+        assert sys.modules["colorsys"] is colorsys
+
+    def test_venv_not_owned(self):
+        """测试项目内虚拟环境中的模块不属于项目"""
+        site = self.root / ".venv" / "lib" / "site-packages"
+        venv_module = types.ModuleType("venvpkg")
+        venv_module.__file__ = str(site / "venvpkg" / "__init__.py")
+        with InheritanceAnalyzer(self.temp_dir) as analyzer:
+            assert not analyzer.context.owns(venv_module)
+            analyzer.analyze_package("srcpkg")
+            assert analyzer.context.owns(sys.modules["srcpkg.models"])
+
+    def test_changed_files_in_src(self):
+        """测试 src 布局下的文件到模块映射"""
+        files = [self.root / "src" / "srcpkg" / "models.py", self.root / "setup.py"]
+        modules = files_to_modules(files, self.root, "srcpkg", source_roots(self.root))
+        assert modules == {"srcpkg.models"}
@@ -0,0 +1,68 @@
+"""
+测试 DOT 文本输出
+"""
+
+import shutil
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from supermro.dot import quote, dot_source
+from supermro.visualizer import InheritanceVisualizer
+
+graphviz = pytest.importorskip("graphviz")
+
+
+def _result():
+    """覆盖需要加引号的类名、空模块和重复继承边的分析结果"""
+    def info(mro, methods=()):
+        return {"methods": list(methods), "mro": mro}
+
+    return {
+        "package_name": "dotpkg",
+        "modules": {
+            "dotpkg.models": {"file": "models.py", "classes": {
+                "Node": info(["Node", "object"], ["a", "b", "c", "d", "e"]),
+                "Leaf": info(["Leaf", "Node", "object"], ["a"]),
+                "节点": info(["节点", "Leaf", "Node", "object"]),
+            }},
+            "dotpkg.empty": {"file": "empty.py", "classes": {}},
+            "dotpkg.errors": {"file": 'we"ird.py', "classes": {
+                "ParseError": info(["ParseError", "ValueError", "Exception",
+                                    "BaseException", "object"]),
+                "ConfigManager": info(["ConfigManager", "Leaf", "Node", "object"],
+                                      ["run"]),
+            }},
+        },
+    }
+
+
+def test_quote_matches_graphviz():
+    """测试引号规则与 graphviz 一致"""
+    for identifier in ["spam", "spam spam", "-4.2", ".42", "<<b>x</b>>", '"', '\\"',
+                       "Graph", "#ffcdd2", "节点", "a\\nb", ""]:
+        assert quote(identifier) == graphviz.quoting.quote(identifier)
+
+
+def test_source_identical_to_graphviz():
+    """测试输出与 build_graph 的 DOT 源码逐字节相同"""
+    visualizer = InheritanceVisualizer()
+    result = _result()
+    expected = visualizer.build_graph(result).source
+    actual = dot_source(result, visualizer._get_module_color,
+                        visualizer._get_class_color, visualizer._format_methods)
+    assert actual == expected
+
+
+def test_write_dot_file():
+    """测试写出 DOT 文件"""
+    temp_dir = tempfile.mkdtemp()
+    try:
+        visualizer = InheritanceVisualizer()
+        result = _result()
+        output_file = visualizer.write_dot(result, Path(temp_dir) / "graph.gv")
+        expected = visualizer.build_graph(result).source
+        assert output_file.read_text(encoding="utf-8") == expected
+    finally:
+        shutil.rmtree(temp_dir)
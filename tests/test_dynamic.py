@@ -0,0 +1,134 @@
+"""
+测试动态类特征识别
+"""
+
+import sys
+import shutil
+import tempfile
+import textwrap
+from pathlib import Path
+
+from supermro.analyzer import InheritanceAnalyzer
+
+
+FACTORY_SOURCE = '''
+def make_model(name, base=object):
+    def describe(self):
+        return name
+    return type(name, (base,), {"describe": describe})
+
+
+def make_product(name):
+    class Product:
+        def price(self):
+            return 0
+    Product.__name__ = name
+    return Product
+'''
+
+MODELS_SOURCE = '''
+import abc
+from dataclasses import dataclass
+
+from .factory import make_model, make_product
+
+
+class Registry(abc.ABCMeta):
+    def registered(cls):
+        return []
+
+
+class Plugin(metaclass=Registry):
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+
+
+class AudioPlugin(Plugin):
+    pass
+
+
+@dataclass
+class Point:
+    x: int = 0
+    y: int = 0
+
+
+User = make_model("User")
+Apple = make_product("Apple")
+Pear = make_product("Pear")
+'''
+
+VIEWS_SOURCE = '''
+from .models import User, Point
+'''
+
+
+class TestDynamicFeatures:
+    """测试元类、装饰器与动态类识别"""
+
+    def setup_method(self):
+        self.temp_dir = tempfile.mkdtemp()
+        package_dir = Path(self.temp_dir) / "dynpkg"
+        package_dir.mkdir()
+        (package_dir / "__init__.py").touch()
+        (package_dir / "factory.py").write_text(textwrap.dedent(FACTORY_SOURCE))
+        (package_dir / "models.py").write_text(textwrap.dedent(MODELS_SOURCE))
+        (package_dir / "views.py").write_text(textwrap.dedent(VIEWS_SOURCE))
+        self.analyzer = InheritanceAnalyzer(self.temp_dir)
+        self.result = self.analyzer.analyze_package("dynpkg")
+        self.classes = self.result["modules"]["dynpkg.models"]["classes"]
+
+    def teardown_method(self):
+        for name in [m for m in sys.modules if m.split(".")[0] == "dynpkg"]:
+            del sys.modules[name]
+        shutil.rmtree(self.temp_dir)
+
+    def test_metaclass(self):
+        """测试元类及其方法"""
+        meta = self.classes["Plugin"]["meta"]
+        assert meta["metaclass"] == "Registry"
+        assert meta["metaclass_mro"] == ["Registry", "ABCMeta", "type", "object"]
+        assert "registered" in meta["metaclass_methods"]
+
+    def test_init_subclass_hook(self):
+        """测试 __init_subclass__ 钩子"""
+        assert self.classes["AudioPlugin"]["meta"]["init_subclass_hooks"] == ["Plugin"]
+        assert self.classes["Plugin"]["meta"]["init_subclass_hooks"] == []
+
+    def test_dataclass(self):
+        """测试 dataclass 改写生成的方法"""
+        meta = self.classes["Point"]["meta"]
+        assert meta["decorators"] == ["dataclass"]
+        assert "__init__" in meta["generated_methods"]
+        assert meta["dynamic"] is False
+
+    def test_factory_class(self):
+        """测试工厂创建的类只在绑定它的第一个模块中收录"""
+        user = self.classes["User"]
+        assert user["meta"]["dynamic"] is True
+        assert "describe" in user["methods"]
+        assert "describe" in user["meta"]["generated_methods"]
+        assert "dynpkg.views" not in self.result["modules"]
+
+    def test_same_factory_classes(self):
+        """测试同一工厂创建的多个类（__qualname__ 相同）都被收录"""
+        assert self.classes["Apple"]["name"] == "Apple"
+        assert self.classes["Pear"]["name"] == "Pear"
+        assert "price" in self.classes["Pear"]["methods"]
+
+    def test_same_factory_classes_streaming(self):
+        """测试流式分析同样收录同一工厂创建的多个类"""
+        for name in [m for m in sys.modules if m.split(".")[0] == "dynpkg"]:
+            del sys.modules[name]
+        records = self.analyzer.iter_class_records("dynpkg", module_window=1)
+        records = [r for r in records if r["kind"] == "class"]
+        names = {(r["module"], r["class"]) for r in records}
+        assert {("dynpkg.models", "Apple"), ("dynpkg.models", "Pear")} <= names
+        assert not any(module == "dynpkg.views" for module, _ in names)
+
+    def test_resolution_budget(self):
+        """测试解析预算限制"""
+        analyzer = InheritanceAnalyzer(self.temp_dir, resolution_budget=1)
+        result = analyzer.analyze_package("dynpkg")
+        meta = result["modules"]["dynpkg.models"]["classes"]["Point"]["meta"]
+        assert meta["truncated"] is True
@@ -0,0 +1,106 @@
+"""
+测试包外类描述缓存
+"""
+
+import importlib
+import sys
+import shutil
+import tempfile
+from pathlib import Path
+
+from supermro.analyzer import InheritanceAnalyzer
+from supermro.cache import ExternalCache, default_external_cache_dir
+from supermro.config import AnalysisConfig
+
+SOURCE = """\
+import collections
+import enum
+import json
+import threading
+
+
+class Registry(collections.OrderedDict):
+    def register(self, name):
+        pass
+
+
+class Color(enum.Enum):
+    RED = 1
+
+
+class Encoder(json.JSONEncoder, threading.Thread):
+    @property
+    def name_(self):
+        return ""
+
+    @classmethod
+    def build(cls):
+        pass
+"""
+
+
+class TestExternalCache:
+    """测试包外类描述的缓存与复用"""
+
+    def setup_method(self):
+        self.temp_dir = tempfile.mkdtemp()
+        package_dir = Path(self.temp_dir) / "extpkg"
+        package_dir.mkdir()
+        (package_dir / "__init__.py").touch()
+        (package_dir / "models.py").write_text(SOURCE)
+        self.cache_dir = Path(tempfile.mkdtemp()) / "external"
+
+    def teardown_method(self):
+        for name in [m for m in sys.modules if m.split(".")[0] == "extpkg"]:
+            del sys.modules[name]
+        shutil.rmtree(self.temp_dir)
+        shutil.rmtree(self.cache_dir.parent)
+
+    def test_group_key(self):
+        """测试按 Python 版本和发行包版本分组"""
+        cache = ExternalCache(self.cache_dir)
+        version = sys.version_info
+        python = f"{version.major}.{version.minor}.{version.micro}"
+        expected = f"{sys.implementation.name}-{python}"
+        assert cache.group_key("collections.abc") == expected
+        assert cache.group_key("builtins") == cache.group_key("json")
+        assert cache.group_key("nonexistent_module") is None
+
+    def test_reuse_across_runs(self):
+        """测试第二次运行直接复用缓存，结果与不使用缓存时相同"""
+        first = InheritanceAnalyzer(self.temp_dir, external_cache_dir=self.cache_dir
+                                    ).analyze_package("extpkg")
+        assert list(self.cache_dir.glob("*.json"))
+
+        second = InheritanceAnalyzer(self.temp_dir, external_cache_dir=self.cache_dir)
+
+        def fail(cls):
+            raise AssertionError(f"{cls.__name__} 应当来自缓存")
+
+        second._introspect_external = fail
+        assert second.analyze_package("extpkg") == first
+
+        uncached = InheritanceAnalyzer(self.temp_dir, external_cache=False)
+        assert uncached.analyze_package("extpkg") == first
+
+    def test_user_level_default(self, user_cache_home):
+        """测试默认缓存在用户级目录中，不写入被分析的项目"""
+        expected = Path(user_cache_home) / "supermro" / "external"
+        assert default_external_cache_dir() == expected
+        InheritanceAnalyzer(self.temp_dir).analyze_package("extpkg")
+        assert list(default_external_cache_dir().glob("*.json"))
+        assert not (Path(self.temp_dir) / ".supermro_cache").exists()
+
+    def test_methods_match_dir(self):
+        """测试方法列表与遍历 dir() 的结果一致"""
+        for members in ("public", "protected", "all"):
+            config = AnalysisConfig(members=members)
+            analyzer = InheritanceAnalyzer(self.temp_dir, config=config,
+                                           external_cache=False)
+            with analyzer.context.importing("extpkg"):
+                models = importlib.import_module("extpkg.models")
+            visible = analyzer.config.is_member_visible
+            for cls in (models.Registry, models.Color, models.Encoder):
+                expected = [name for name in dir(cls)
+                            if visible(name) and callable(getattr(cls, name, None))]
+                assert analyzer._class_methods(cls, "extpkg") == expected
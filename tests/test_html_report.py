@@ -0,0 +1,61 @@
+"""
+测试交互式 HTML 报告
+"""
+
+import json
+
+from supermro.html_report import EXTERNAL_MODULE, build_report_data, render_html
+from supermro.visualizer import InheritanceVisualizer
+
+
+def _analysis():
+    return {
+        "package_name": "pkg",
+        "modules": {
+            "pkg.models": {
+                "file": "models.py",
+                "classes": {
+                    "Base": {"methods": ["save"], "bases": ["Model"]},
+                    "User": {"methods": [], "bases": ["Base", "object"],
+                             "meta": {"metaclass": "Meta", "decorators": [],
+                                      "dynamic": False}},
+                },
+            },
+        },
+    }
+
+
+def _report_data(analysis):
+    visualizer = InheritanceVisualizer()
+    return build_report_data(analysis, visualizer._get_module_color,
+                             visualizer._get_class_color, visualizer._format_methods)
+
+
+def test_build_report_data():
+    """测试报告数据的压缩格式"""
+    data = _report_data(_analysis())
+    names = [c[0] for c in data["classes"]]
+    assert names == ["Base", "User", "Model"]
+    assert data["modules"][1][0] == EXTERNAL_MODULE
+    assert data["classes"][0][3] == [2]
+    assert data["classes"][1][3] == [0]
+    assert data["classes"][1][5] == ["metaclass"]
+    assert data["collapsed"] is False
+
+
+def test_render_html_embeds_data():
+    """测试报告内嵌数据且不会提前结束 script 标签"""
+    analysis = _analysis()
+    analysis["modules"]["pkg.models"]["classes"]["Base"]["methods"] = ["</script>"]
+    html = render_html(_report_data(analysis))
+    assert html.count("</script>") == 1
+    payload = html[html.index("const DATA = ") + 13:html.index(";\nconst NODE_W")]
+    assert json.loads(payload)["package"] == "pkg"
+
+
+def test_export_html(tmp_path):
+    """测试写出报告文件"""
+    output = tmp_path / "report.html"
+    path = InheritanceVisualizer().export_html(_analysis(), str(output))
+    assert path == str(output.absolute())
+    assert "<svg" in output.read_text(encoding="utf-8")
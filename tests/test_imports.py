@@ -0,0 +1,90 @@
+"""
+测试包内导入图与导入开销
+"""
+
+import sys
+import shutil
+import tempfile
+from pathlib import Path
+
+from supermro.analyzer import InheritanceAnalyzer
+from supermro.imports import build_import_report, find_cycles, find_imports
+
+
+def test_find_cycles():
+    """测试导入环检测"""
+    graph = {
+        "pkg.a": ["pkg.b"],
+        "pkg.b": ["pkg.c"],
+        "pkg.c": ["pkg.a"],
+        "pkg.d": ["pkg.d", "pkg.a"],
+        "pkg.e": [],
+    }
+    assert find_cycles(graph) == [["pkg.a", "pkg.b", "pkg.c"], ["pkg.d"]]
+
+
+def test_type_checking_imports(tmp_path):
+    """测试 if TYPE_CHECKING 下的导入不计入导入期依赖（不形成导入环）"""
+    (tmp_path / "a.py").write_text(
+        "from typing import TYPE_CHECKING\n"
+        "if TYPE_CHECKING:\n    from .b import B\n"
+        "else:\n    from . import c\n")
+    (tmp_path / "b.py").write_text(
+        "import typing\n"
+        "from .a import A\n"
+        "if typing.TYPE_CHECKING:\n    from . import c\n")
+    known = {"p", "p.a", "p.b", "p.c"}
+    graph = {name: find_imports(name, str(tmp_path / f"{name[2:]}.py"), False, known)
+             for name in ("p.a", "p.b")}
+    assert graph == {"p.a": ["p.c"], "p.b": ["p.a"]}
+    assert find_cycles(graph) == []
+
+
+class TestImportProfile:
+    """测试分析时记录导入图与开销"""
+
+    def setup_method(self):
+        self.temp_dir = tempfile.mkdtemp()
+        package_dir = Path(self.temp_dir) / "imppkg"
+        (package_dir / "sub").mkdir(parents=True)
+        (package_dir / "__init__.py").write_text("from . import base\n")
+        (package_dir / "base.py").write_text("import json\n\nclass Base:\n    pass\n")
+        (package_dir / "sub" / "__init__.py").touch()
+        (package_dir / "sub" / "models.py").write_text(
+            "from ..base import Base\n"
+            "from imppkg import helpers\n\n"
+            "def lazy():\n    import imppkg.late\n\n"
+            "class Model(Base):\n    pass\n")
+        (package_dir / "helpers.py").write_text("from .sub.models import Model\n")
+        (package_dir / "late.py").touch()
+        self.analyzer = InheritanceAnalyzer(self.temp_dir, import_profile=True)
+        self.result = self.analyzer.analyze_package("imppkg")
+
+    def teardown_method(self):
+        for name in [m for m in sys.modules if m.split(".")[0] == "imppkg"]:
+            del sys.modules[name]
+        shutil.rmtree(self.temp_dir)
+
+    def test_import_graph(self):
+        """测试相对/绝对导入解析，忽略函数内的延迟导入"""
+        graph = self.result["import_graph"]
+        assert graph["imppkg"] == ["imppkg.base"]
+        assert graph["imppkg.sub.models"] == ["imppkg.base", "imppkg.helpers"]
+        assert graph["imppkg.helpers"] == ["imppkg.sub.models"]
+        assert graph["imppkg.late"] == []
+
+    def test_costs_and_report(self):
+        """测试导入开销与报告"""
+        costs = self.result["import_costs"]
+        assert set(costs) == set(self.result["import_graph"])
+        assert all(cost["seconds"] >= 0 for cost in costs.values())
+        assert all(cost["memory_kb"] is not None for cost in costs.values())
+
+        report = build_import_report(self.result, top=2)
+        assert len(report["slowest"]) == 2
+        assert report["cycles"] == [["imppkg.helpers", "imppkg.sub.models"]]
+
+    def test_disabled_by_default(self):
+        """测试默认不记录导入信息"""
+        result = InheritanceAnalyzer(self.temp_dir).analyze_package("imppkg")
+        assert "import_graph" not in result
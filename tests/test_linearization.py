@@ -0,0 +1,192 @@
+"""
+测试 C3 线性化引擎
+"""
+
+import pytest
+
+from supermro.linearization import C3Linearizer, LinearizationError, c3_merge
+
+
+def _graph():
+    """
+    Base(Model) -> Left, Right -> Both(Left, Right)；Model 为包外类
+    """
+    bases = {
+        "Base": ["Model"],
+        "Left": ["Base"],
+        "Right": ["Base"],
+        "Both": ["Left", "Right"],
+        "Mixin": ["object"],
+    }
+    fixed = {"Model": ["Model", "object"]}
+    return C3Linearizer(bases, fixed)
+
+
+def _python_mro(bases, name):
+    """用真实的类验证结果"""
+    classes = {}
+
+    def build(class_name):
+        if class_name not in classes:
+            parents = tuple(build(b) for b in bases.get(class_name, ())) or (object,)
+            classes[class_name] = type(class_name, parents, {})
+        return classes[class_name]
+
+    return [c.__name__ for c in build(name).__mro__]
+
+
+def test_c3_merge():
+    """测试 C3 合并"""
+    assert c3_merge([["A", "O"], ["B", "O"], ["A", "B"]]) == ["A", "B", "O"]
+    assert c3_merge([["A", "B"], ["B", "A"]]) is None
+
+
+class TestC3Linearizer:
+    """测试线性化与诊断"""
+
+    def setup_method(self):
+        self.linearizer = _graph()
+
+    def test_diamond(self):
+        """测试菱形继承"""
+        assert self.linearizer.mro("Both") == [
+            "Both", "Left", "Right", "Base", "Model", "object"]
+        assert self.linearizer.mro("Model") == ["Model", "object"]
+        assert self.linearizer.mro("Mixin") == ["Mixin", "object"]
+
+    def test_matches_python(self):
+        """测试与 Python 计算的 MRO 一致"""
+        bases = {
+            "A": [], "B": ["A"], "C": ["A"], "D": ["B", "C"],
+            "E": ["C", "B"], "F": ["D", "A"], "G": ["F", "C"],
+        }
+        linearizer = C3Linearizer(
+            {name: list(b) or ["object"] for name, b in bases.items()})
+        for name in bases:
+            assert linearizer.mro(name) == _python_mro(bases, name)
+
+    def test_memoized(self):
+        """测试基类结果只计算一次并被子类复用"""
+        self.linearizer.mro("Both")
+        cached = dict(self.linearizer._cache)
+        self.linearizer.mro("Both")
+        assert self.linearizer._cache == cached
+        assert set(cached) == {"Base", "Left", "Right", "Both"}
+
+    def test_deep_chain(self):
+        """测试深层继承链不受递归深度限制"""
+        count = 5000
+        bases = {f"C{i}": [f"C{i - 1}"] for i in range(1, count)}
+        bases["C0"] = ["object"]
+        mro = C3Linearizer(bases).mro(f"C{count - 1}")
+        assert len(mro) == count + 1
+        assert mro[-2:] == ["C0", "object"]
+
+    def test_unknown_class(self):
+        """测试未知的类"""
+        with pytest.raises(KeyError):
+            self.linearizer.mro("Missing")
+
+    def test_conflict_diagnostics(self):
+        """测试基类顺序冲突的诊断信息"""
+        self.linearizer.bases["Bad"] = ["Base", "Left"]
+        with pytest.raises(LinearizationError) as info:
+            self.linearizer.mro("Bad")
+        error = info.value
+        assert error.class_name == "Bad"
+        assert error.reason == "基类顺序 (Base, Left) 与其 MRO 冲突"
+        assert {"class": "Base", "after": "Left",
+                "source": "Left 的 MRO"} in error.conflicts
+        assert {"class": "Left", "after": "Base", "source": "基类列表"} in error.conflicts
+        assert "Left 的 MRO 要求 Base 排在 Left 之后" in error.describe()
+
+    def test_failure_propagates(self):
+        """测试基类失败沿子类传播，并能找到根因"""
+        self.linearizer.bases["Bad"] = ["Base", "Left"]
+        self.linearizer.bases["Child"] = ["Bad"]
+        with pytest.raises(LinearizationError) as info:
+            self.linearizer.mro("Child")
+        assert info.value.reason == "基类 Bad 无法线性化"
+        assert info.value.root_cause.class_name == "Bad"
+        assert [e.class_name for e in self.linearizer.failures()] == ["Bad", "Child"]
+
+    def test_cycle(self):
+        """测试继承图中的环"""
+        linearizer = C3Linearizer({"A": ["B"], "B": ["A"], "C": ["A"]})
+        mros, failures = linearizer.linearize_all()
+        assert mros == {}
+        assert {e.class_name for e in failures if e.cycle} == {"A", "B"}
+        assert failures[-1].class_name == "C"
+
+
+class TestWhatIf:
+    """测试假如查询"""
+
+    def setup_method(self):
+        self.linearizer = _graph()
+
+    def test_add_base(self):
+        """测试追加基类，不修改继承图"""
+        assert self.linearizer.what_if("Left", add=["Mixin"]) == [
+            "Left", "Base", "Model", "Mixin", "object"]
+        assert self.linearizer.mro("Left") == ["Left", "Base", "Model", "object"]
+
+    def test_new_class(self):
+        """测试尚不存在的新类"""
+        assert self.linearizer.what_if("New", bases=["Right", "Left"]) == [
+            "New", "Right", "Left", "Base", "Model", "object"]
+        with pytest.raises(KeyError):
+            self.linearizer.what_if("New", add=["Left"])
+
+    def test_conflict(self):
+        """测试修改后无法线性化"""
+        with pytest.raises(LinearizationError) as info:
+            self.linearizer.what_if("Right", bases=["Base", "Left"])
+        assert info.value.conflicts
+
+    def test_conflict_lines_unique(self):
+        """测试队首相同的多个序列只产生一条约束说明"""
+        with pytest.raises(LinearizationError) as info:
+            self.linearizer.what_if("New", bases=["Base", "Left"])
+        lines = info.value.describe().splitlines()[1:]
+        assert lines.count("    Left 的 MRO 要求 Base 排在 Left 之后") == 1
+        assert len(lines) == len(set(lines))
+
+    def test_cycle(self):
+        """测试把子类添加为基类"""
+        with pytest.raises(LinearizationError) as info:
+            self.linearizer.what_if("Base", add=["Both"])
+        assert info.value.cycle == ["Base", "Both", "Base"]
+        assert info.value.reason == "Both 是 Base 的子类，作为基类会形成继承环"
+
+    def test_impact(self):
+        """测试受影响的子类"""
+        changes = self.linearizer.impact("Right", add=["Mixin"])
+        assert changes == {
+            "Right": ["Right", "Base", "Model", "Mixin", "object"],
+            "Both": ["Both", "Left", "Right", "Base", "Model", "Mixin", "object"],
+        }
+        assert self.linearizer.mro("Both") == [
+            "Both", "Left", "Right", "Base", "Model", "object"]
+
+        changes = self.linearizer.impact("Right", bases=["Left"])
+        assert isinstance(changes["Both"], LinearizationError)
+
+
+def test_from_analysis():
+    """测试基于分析结果创建引擎"""
+    def cls(bases):
+        return {"bases": bases, "mro": [], "methods": [], "own_methods": []}
+
+    analysis = {
+        "package_name": "pkg",
+        "modules": {"pkg.a": {"file": "a.py", "classes": {
+            "Base": cls(["Model"]), "Child": cls(["Base"])}}},
+        "external_classes": {"Model": {"module": "orm", "bases": ["Root"],
+                                       "mro": ["Model", "Root", "object"]}},
+    }
+    linearizer = C3Linearizer.from_analysis(analysis)
+    assert linearizer.what_if("Base", add=["Unknown"]) == [
+        "Base", "Model", "Root", "Unknown", "object"]
+    assert linearizer.mro("Child") == ["Child", "Base", "Model", "Root", "object"]
+    assert "Model" in linearizer and "Root" not in linearizer
@@ -0,0 +1,120 @@
+"""
+测试继承层次指标
+"""
+
+import csv
+import io
+
+import pytest
+
+from supermro.metrics import HierarchyMetrics
+
+
+def _cls(bases, mro, own_methods=()):
+    return {"bases": bases, "mro": mro, "own_methods": list(own_methods), "methods": []}
+
+
+def _analysis():
+    """
+    Base(Model) -> Left, Right -> Both(Left, Right)
+    """
+    return {
+        "package_name": "pkg",
+        "modules": {
+            "pkg.models": {
+                "file": "models.py",
+                "classes": {
+                    "Base": _cls(["Model"], ["Base", "Model", "object"], ["save"]),
+                    "Left": _cls(["Base"], ["Left", "Base", "Model", "object"],
+                                 ["save"]),
+                    "Right": _cls(["Base"], ["Right", "Base", "Model", "object"]),
+                    "Both": _cls(["Left", "Right"],
+                                 ["Both", "Left", "Right", "Base", "Model", "object"],
+                                 ["save"]),
+                },
+            },
+        },
+        "external_classes": {
+            "Model": {"module": "orm", "bases": ["object"], "mro": ["Model", "object"],
+                      "own_methods": ["save"]},
+        },
+    }
+
+
+class TestHierarchyMetrics:
+    """测试指标引擎"""
+
+    def setup_method(self):
+        self.metrics = HierarchyMetrics(_analysis())
+        self.classes = self.metrics.compute()["classes"]
+
+    def test_depth(self):
+        """测试继承深度（包含包外基类）"""
+        assert self.classes["pkg.models.Base"]["depth"] == 1
+        assert self.classes["pkg.models.Both"]["depth"] == 3
+
+    def test_subclass_counts(self):
+        """测试直接/传递子类数量，菱形继承不重复计数"""
+        assert self.classes["pkg.models.Base"]["direct_subclasses"] == 2
+        assert self.classes["pkg.models.Base"]["transitive_subclasses"] == 3
+        assert self.classes["pkg.models.Both"]["transitive_subclasses"] == 0
+
+    def test_diamonds(self):
+        """测试菱形继承"""
+        assert self.classes["pkg.models.Both"]["diamonds"] == [
+            "pkg.models.Base", "orm.Model"]
+        assert self.classes["pkg.models.Left"]["diamonds"] == []
+
+    def test_multi_overrides(self):
+        """测试多层重写的方法"""
+        assert self.classes["pkg.models.Both"]["multi_overrides"] == ["save"]
+        assert self.classes["pkg.models.Right"]["multi_overrides"] == []
+
+    def test_c3_failure(self):
+        """测试无法线性化的类"""
+        analysis = _analysis()
+        analysis["modules"]["pkg.models"]["classes"]["Bad"] = _cls(
+            ["Base", "Left"], ["Bad", "Left", "Base", "Model", "object"])
+        result = HierarchyMetrics(analysis).compute()
+        assert [f["class"] for f in result["c3_failures"]] == ["pkg.models.Bad"]
+        assert result["classes"]["pkg.models.Bad"]["c3_ok"] is False
+        assert all(m["c3_ok"] for n, m in result["classes"].items()
+                   if n != "pkg.models.Bad")
+
+    def test_rows_sorted(self):
+        """测试排序与截断"""
+        rows = self.metrics.rows(sort_by="transitive_subclasses", top=2)
+        assert [r["class"] for r in rows] == ["Base", "Left"]
+        assert rows[0]["diamonds"] == 0
+
+    def test_format_csv(self):
+        """测试 CSV 导出"""
+        reader = csv.DictReader(io.StringIO(self.metrics.format_table("csv")))
+        rows = {row["class"]: row for row in reader}
+        assert rows["Both"]["diamonds"] == "2"
+
+    def test_invalid_sort_key(self):
+        """测试非法排序列"""
+        with pytest.raises(ValueError):
+            self.metrics.rows(sort_by="name")
+
+
+    def test_same_class_names(self):
+        """测试不同模块中的同名类分别统计，MRO 按模块解析"""
+        analysis = _analysis()
+        analysis["modules"]["pkg.other"] = {"file": "other.py", "classes": {
+            "Base": _cls(["object"], ["Base", "object"], ["save"]),
+            "Child": dict(_cls(["Base"], ["Child", "Base", "object"], ["save"]),
+                          qualified_mro=["pkg.other.Child", "pkg.other.Base",
+                                         "builtins.object"]),
+        }}
+        classes = HierarchyMetrics(analysis).compute()["classes"]
+
+        assert classes["pkg.models.Base"]["transitive_subclasses"] == 3
+        assert classes["pkg.other.Base"]["transitive_subclasses"] == 1
+        assert classes["pkg.other.Base"]["depth"] == 0
+        assert classes["pkg.other.Child"]["depth"] == 1
+        assert classes["pkg.other.Child"]["multi_overrides"] == []
+        rows = HierarchyMetrics(analysis).rows()
+        bases = sorted((r["module"], r["class"]) for r in rows if r["class"] == "Base")
+        assert bases == [("pkg.models", "Base"), ("pkg.other", "Base")]
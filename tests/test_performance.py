@@ -0,0 +1,251 @@
+"""
+性能回归测试
+
+生成 1k、10k、50k 个类的测试包，检查包发现、分析、方法追踪和图构建
+（graphviz 与 DOT 文本输出）的复杂度与峰值内存；C3 线性化引擎另外在
+10k、100k 个类的合成继承图上检查。耗时只比较不同规模之间的
+增长倍数（不依赖机器快慢），内存按 tracemalloc 统计的 Python 分配峰值检查
+每类开销上限。
+
+该层级默认不运行（见 pyproject.toml 中的 addopts），需要显式启用::
+
+    python -m pytest -m performance
+
+不需要 Graphviz 可执行文件：图构建只生成 DOT 源码，不渲染。
+"""
+
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import pytest
+
+from supermro.analyzer import InheritanceAnalyzer
+from supermro.dot import dot_source
+from supermro.html_report import build_report_data
+from supermro.linearization import C3Linearizer
+from supermro.streaming import JsonlSink, memory_ceiling
+from supermro.visualizer import InheritanceVisualizer, HAS_GRAPHVIZ
+
+pytestmark = pytest.mark.performance
+
+SIZES = (1000, 10000, 50000)
+CLASSES_PER_MODULE = 50
+MODULES_PER_PACKAGE = 10
+
+# 相对线性增长允许的倍数：规模扩大 k 倍时耗时不超过 k * SCALING_SLACK 倍。
+# 平方复杂度在 10 倍规模下会放大 10 倍，远超该余量。
+SCALING_SLACK = 2.5
+# C3 线性化引擎的继承图规模（不生成源码）
+LINEARIZATION_SIZES = (10000, 100000)
+# 低于该值的耗时按该值计算，避免计时精度和固定开销干扰小规模的比值
+MIN_SECONDS = 0.005
+
+# 峰值内存上限：固定开销 + 每类（或每个追踪目标）开销
+MEMORY_LIMITS = {
+    "discover": (1024 * 1024, 256),
+    "analyze": (8 * 1024 * 1024, 12 * 1024),
+    "trace": (1024 * 1024, 512),
+    "graph": (4 * 1024 * 1024, 4 * 1024),
+    "dot": (4 * 1024 * 1024, 1024),
+    "html": (4 * 1024 * 1024, 1024),
+}
+
+
+def _write_package(root: Path, name: str, class_count: int):
+    """
+    生成测试包
+
+    每个子包 MODULES_PER_PACKAGE 个模块，每个模块 CLASSES_PER_MODULE 个类，
+    组成深度不超过 5 的继承链，部分类额外混入 Mixin（菱形继承）。
+    """
+    package_dir = root / name
+    package_dir.mkdir()
+    (package_dir / "__init__.py").touch()
+    core = [f"class Base{i}:\n    def run(self):\n        pass\n"
+            f"    def step{i}(self):\n        pass\n" for i in range(5)]
+    core.append("class Mixin:\n    def run(self):\n        pass\n"
+                "    def mix(self):\n        pass\n")
+    (package_dir / "core.py").write_text("\n".join(core))
+
+    for m in range(class_count // CLASSES_PER_MODULE):
+        sub_dir = package_dir / f"sub{m // MODULES_PER_PACKAGE:03d}"
+        if not sub_dir.exists():
+            sub_dir.mkdir()
+            (sub_dir / "__init__.py").touch()
+        lines = [f"from {name}.core import Base0, Base1, Base2, Base3, Base4, Mixin",
+                 ""]
+        for c in range(CLASSES_PER_MODULE):
+            if c % 5 == 0:
+                bases = f"Base{c // 5 % 5}"
+            elif c % 5 == 3:
+                bases = f"C{m}_{c - 1}, Mixin"
+            else:
+                bases = f"C{m}_{c - 1}"
+            lines.append(f"class C{m}_{c}({bases}):\n"
+                         f"    def run(self):\n        return {c}\n"
+                         f"    def m{c % 7}(self):\n        pass\n")
+        (sub_dir / f"mod{m:04d}.py").write_text("\n".join(lines))
+
+
+def _measure(func):
+    """运行 func，返回 (结果, 耗时, 峰值内存)"""
+    tracemalloc.start()
+    try:
+        start = time.perf_counter()
+        value = func()
+        seconds = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return value, seconds, peak
+
+
+def _best_of(func, repeat: int = 5) -> float:
+    """多次运行取最短耗时（用于很快的操作）"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def _unload(package_name: str):
+    for name in [m for m in sys.modules if m.split(".")[0] == package_name]:
+        del sys.modules[name]
+
+
+def _profile_size(root: Path, class_count: int) -> dict:
+    """在一个规模上测量各阶段的耗时和峰值内存"""
+    package_name = f"perfpkg{class_count}"
+    _write_package(root, package_name, class_count)
+    analyzer = InheritanceAnalyzer(str(root))
+    visualizer = InheritanceVisualizer()
+    stats = {}
+
+    try:
+        packages, _, peak = _measure(analyzer.find_python_packages)
+        per_package = CLASSES_PER_MODULE * MODULES_PER_PACKAGE
+        assert len(packages) == 1 + -(-class_count // per_package)
+        stats["discover"] = (_best_of(analyzer.find_python_packages), peak)
+
+        result, seconds, peak = _measure(lambda: analyzer.analyze_package(package_name))
+        counts = [len(m["classes"]) for m in result["modules"].values()]
+        assert sum(counts) == class_count + 6
+        stats["analyze"] = (seconds, peak)
+
+        pairs = [(f"C{m}_{c}", "run")
+                 for m in range(class_count // CLASSES_PER_MODULE) for c in (4, 49)]
+        traced, seconds, peak = _measure(
+            lambda: analyzer.trace_methods(pairs, package_name))
+        assert all(len(item["chain"]) == 7 for item in traced)
+        stats["trace"] = (seconds, peak)
+
+        if HAS_GRAPHVIZ:
+            _, seconds, peak = _measure(
+                lambda result=result: visualizer.build_graph(result).source)
+            stats["graph"] = (seconds, peak)
+
+        _, seconds, peak = _measure(lambda result=result: dot_source(
+            result, visualizer._get_module_color, visualizer._get_class_color,
+            visualizer._format_methods))
+        stats["dot"] = (seconds, peak)
+
+        _, seconds, peak = _measure(lambda result=result: build_report_data(
+            result, visualizer._get_module_color, visualizer._get_class_color,
+            visualizer._format_methods))
+        stats["html"] = (seconds, peak)
+
+        del result, traced
+        _unload(package_name)
+
+        summary, seconds, peak = _measure(lambda: analyzer.stream_package(
+            package_name, [JsonlSink(root / "out.jsonl")], module_window=16))
+        assert summary["classes"] == class_count + 6
+        stats["stream"] = (seconds, peak)
+    finally:
+        _unload(package_name)
+
+    return stats
+
+
+@pytest.fixture(scope="module")
+def profiles(tmp_path_factory):
+    """按规模从小到大测量（整个模块共享，只生成一次）"""
+    return {size: _profile_size(tmp_path_factory.mktemp(f"perf{size}"), size)
+            for size in SIZES}
+
+
+def _assert_linear(profiles: dict, phase: str):
+    """相邻规模之间的耗时增长不超过规模增长的 SCALING_SLACK 倍"""
+    for small, large in zip(SIZES, SIZES[1:]):
+        before = max(profiles[small][phase][0], MIN_SECONDS)
+        after = max(profiles[large][phase][0], MIN_SECONDS)
+        ratio = after / before
+        allowed = large / small * SCALING_SLACK
+        assert ratio <= allowed, (
+            f"{phase}: {small} -> {large} 类耗时增长 {ratio:.1f} 倍，超过 {allowed:.1f} 倍")
+
+
+@pytest.mark.parametrize("phase", ["discover", "analyze", "trace", "graph", "dot",
+                                   "html", "stream"])
+def test_scaling(profiles, phase):
+    """测试各阶段耗时随规模线性增长"""
+    if phase not in profiles[SIZES[0]]:
+        pytest.skip("未安装 graphviz Python 包")
+    _assert_linear(profiles, phase)
+
+
+@pytest.mark.parametrize("phase", sorted(MEMORY_LIMITS))
+def test_peak_memory(profiles, phase):
+    """测试各阶段峰值内存不超过每类开销上限"""
+    if phase not in profiles[SIZES[0]]:
+        pytest.skip("未安装 graphviz Python 包")
+    base, per_class = MEMORY_LIMITS[phase]
+    for size in SIZES:
+        peak = profiles[size][phase][1]
+        limit = base + per_class * size
+        assert peak <= limit, (
+            f"{phase}: {size} 类峰值内存 {peak / 1024 / 1024:.1f} MiB，"
+            f"超过 {limit / 1024 / 1024:.1f} MiB")
+
+
+def test_stream_memory_ceiling(profiles):
+    """测试流式分析峰值内存不超过 streaming.memory_ceiling"""
+    for size in SIZES:
+        assert profiles[size]["stream"][1] < memory_ceiling(size + 6, module_window=16)
+
+
+def _synthetic_graph(class_count: int) -> dict:
+    """与 _write_package 形状相同的继承图：深度不超过 5 的继承链，部分类混入 Mixin"""
+    bases = {f"Base{i}": ["object"] for i in range(5)}
+    bases["Mixin"] = ["object"]
+    for m in range(class_count // CLASSES_PER_MODULE):
+        for c in range(CLASSES_PER_MODULE):
+            if c % 5 == 0:
+                class_bases = [f"Base{c // 5 % 5}"]
+            elif c % 5 == 3:
+                class_bases = [f"C{m}_{c - 1}", "Mixin"]
+            else:
+                class_bases = [f"C{m}_{c - 1}"]
+            bases[f"C{m}_{c}"] = class_bases
+    return bases
+
+
+def test_linearization_scaling():
+    """测试 C3 线性化引擎的耗时随继承图规模线性增长"""
+    timings = {}
+    for size in LINEARIZATION_SIZES:
+        bases = _synthetic_graph(size)
+        start = time.perf_counter()
+        mros, failures = C3Linearizer(bases).linearize_all()
+        timings[size] = max(time.perf_counter() - start, MIN_SECONDS)
+        assert len(mros) == size + 6 and not failures
+        assert mros[f"C0_{CLASSES_PER_MODULE - 1}"][-2:] == ["Mixin", "object"]
+
+    small, large = LINEARIZATION_SIZES
+    ratio = timings[large] / timings[small]
+    allowed = large / small * SCALING_SLACK
+    assert ratio <= allowed, f"linearize: {small} -> {large} 类耗时增长 {ratio:.1f} 倍"
@@ -0,0 +1,152 @@
+"""
+测试分片渲染
+"""
+
+import argparse
+import os
+import stat
+import shutil
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from supermro.cli import positive_int
+from supermro.shards import split_result, render_files
+from supermro.visualizer import InheritanceVisualizer
+
+# 模拟 dot 可执行文件：按 -T 参数生成 {输入}.{格式}
+FAKE_DOT = """#!/bin/sh
+fmt=svg
+for arg in "$@"; do
+    case "$arg" in
+        -T*) fmt="${arg#-T}" ;;
+    esac
+    last="$arg"
+done
+echo "<svg/>" > "$last.$fmt"
+"""
+
+
+def _info(name, mro, bases):
+    return {"name": name, "methods": [], "mro": mro, "bases": bases}
+
+
+def _result():
+    return {
+        "package_name": "shardpkg",
+        "modules": {
+            "shardpkg.base": {"file": "base.py", "classes": {
+                "Animal": _info("Animal", ["Animal", "object"], ["object"]),
+                "Mixin": _info("Mixin", ["Mixin", "object"], ["object"]),
+            }},
+            "shardpkg.empty": {"file": "empty.py", "classes": {}},
+            "shardpkg.pets": {"file": "pets.py", "classes": {
+                "Dog": _info("Dog", ["Dog", "Animal", "Mixin", "object"],
+                             ["Animal", "Mixin"]),
+                "Error": _info("Error",
+                               ["Error", "Exception", "BaseException", "object"],
+                               ["Exception"]),
+            }},
+        },
+    }
+
+
+def test_split_by_module():
+    """测试按模块拆分，跳过没有类的模块"""
+    shards = split_result(_result(), "module")
+    assert [name for name, _ in shards] == ["shardpkg.base", "shardpkg.pets"]
+    assert list(shards[1][1]["modules"]["shardpkg.pets"]["classes"]) == ["Dog", "Error"]
+
+
+def test_split_by_root():
+    """测试按根类拆分，多重继承的类出现在每个根类的分片中"""
+    shards = dict(split_result(_result(), "root"))
+    assert list(shards) == [
+        "shardpkg.base.Animal", "shardpkg.base.Mixin", "shardpkg.pets.Error"]
+    assert {m: list(i["classes"])
+            for m, i in shards["shardpkg.base.Animal"]["modules"].items()} == {
+        "shardpkg.base": ["Animal"], "shardpkg.pets": ["Dog"]}
+    assert "Dog" in shards["shardpkg.base.Mixin"]["modules"]["shardpkg.pets"]["classes"]
+    with pytest.raises(ValueError):
+        split_result(_result(), "package")
+
+
+def test_split_by_root_same_name():
+    """测试不同模块中的同名根类各自成图，子类归入最近的同名根类"""
+    base = _info("Base", ["Base", "object"], ["object"])
+    result = {
+        "package_name": "p",
+        "modules": {
+            "p.x.m": {"file": "m.py", "classes": {"Base": base}},
+            "p.y.m": {"file": "m.py", "classes": {"Base": base}},
+            "p.y.sub": {"file": "sub.py", "classes": {
+                "Child": _info("Child", ["Child", "Base", "object"], ["Base"])}},
+        },
+    }
+    shards = dict(split_result(result, "root"))
+    assert list(shards) == ["p.x.m.Base", "p.y.m.Base"]
+    assert list(shards["p.x.m.Base"]["modules"]) == ["p.x.m"]
+    assert list(shards["p.y.m.Base"]["modules"]) == ["p.y.m", "p.y.sub"]
+
+
+class TestRenderShards:
+    """测试并行渲染与索引页"""
+
+    def setup_method(self):
+        self.temp_dir = tempfile.mkdtemp()
+        bin_dir = Path(self.temp_dir) / "bin"
+        bin_dir.mkdir()
+        dot = bin_dir / "dot"
+        dot.write_text(FAKE_DOT)
+        dot.chmod(dot.stat().st_mode | stat.S_IEXEC)
+        self.bin_dir = bin_dir
+
+    def teardown_method(self):
+        shutil.rmtree(self.temp_dir)
+
+    @pytest.mark.parametrize("jobs", [1, 2])
+    def test_render_and_index(self, monkeypatch, jobs):
+        """测试在进程池中渲染并生成索引页"""
+        pytest.importorskip("graphviz")
+        monkeypatch.setenv("PATH", f"{self.bin_dir}{os.pathsep}{os.environ['PATH']}")
+        output_dir = Path(self.temp_dir) / "graphs"
+
+        index = InheritanceVisualizer().visualize_shards(
+            _result(), "module", str(output_dir), "svg", jobs)
+
+        assert (output_dir / "shardpkg.base.gv.svg").exists()
+        assert (output_dir / "shardpkg.pets.gv.svg").exists()
+        page = Path(index).read_text(encoding="utf-8")
+        assert 'href="shardpkg.pets.gv.svg"' in page
+        assert "2 类" in page and "渲染失败" not in page
+
+    def test_root_shard_files(self, monkeypatch):
+        """测试按根类拆分时文件名和索引标签使用 模块.类名"""
+        pytest.importorskip("graphviz")
+        monkeypatch.setenv("PATH", f"{self.bin_dir}{os.pathsep}{os.environ['PATH']}")
+        output_dir = Path(self.temp_dir) / "graphs"
+
+        index = InheritanceVisualizer().visualize_shards(
+            _result(), "root", str(output_dir), "svg", 1)
+
+        assert (output_dir / "shardpkg.base.Animal.gv.svg").exists()
+        assert ">shardpkg.pets.Error</a>" in Path(index).read_text(encoding="utf-8")
+
+    def test_invalid_jobs(self):
+        """测试非法的进程数"""
+        with pytest.raises(ValueError):
+            render_files([], "svg", jobs=-1)
+        assert positive_int("4") == 4
+        for value in ("0", "-2", "x"):
+            with pytest.raises(argparse.ArgumentTypeError):
+                positive_int(value)
+
+    def test_render_errors(self, monkeypatch):
+        """测试渲染失败时返回错误而不是中断"""
+        pytest.importorskip("graphviz")
+        monkeypatch.setenv("PATH", str(self.bin_dir / "missing"))
+        missing = Path(self.temp_dir) / "a.gv"
+        missing.write_text("digraph {}\n")
+        [(output, error)] = render_files([str(missing)], "svg", jobs=4)
+        assert output is None and error
@@ -0,0 +1,123 @@
+"""
+测试 SQLite 继承索引
+"""
+
+from supermro.store import SqliteIndex
+
+
+def _cls(bases, mro, methods, own_methods):
+    return {"bases": bases, "mro": mro, "methods": methods, "own_methods": own_methods}
+
+
+def _analysis(package_name="pkg"):
+    return {
+        "package_name": package_name,
+        "modules": {
+            "pkg.processors": {
+                "file": "processors.py",
+                "classes": {
+                    "BaseProcessor": _cls(
+                        ["Plugin"], ["BaseProcessor", "Plugin", "object"],
+                        ["load", "process"], ["process"]),
+                    "TextProcessor": _cls(
+                        ["BaseProcessor"],
+                        ["TextProcessor", "BaseProcessor", "Plugin", "object"],
+                        ["load", "process"], ["process"]),
+                    "ImageProcessor": _cls(
+                        ["BaseProcessor"],
+                        ["ImageProcessor", "BaseProcessor", "Plugin", "object"],
+                        ["load", "process"], []),
+                },
+            },
+        },
+        "external_classes": {
+            "Plugin": {"module": "plugins", "bases": ["object"],
+                       "mro": ["Plugin", "object"], "own_methods": ["load"]},
+        },
+    }
+
+
+class TestSqliteIndex:
+    """测试索引写入与查询"""
+
+    def setup_method(self):
+        self.index = SqliteIndex(":memory:")
+        self.run_id = self.index.write(_analysis(), "proj", "abc123")
+
+    def teardown_method(self):
+        self.index.close()
+
+    def test_overrides_under(self):
+        """测试查询某基类下重写了方法的类"""
+        rows = self.index.overrides("process", under="BaseProcessor")
+        assert [row["class"] for row in rows] == ["TextProcessor"]
+
+    def test_owner(self):
+        """测试方法归属"""
+        rows = self.index.owner("ImageProcessor", "load")
+        assert rows[0]["owner"] == "Plugin"
+        rows = self.index.owner("ImageProcessor", "process")
+        assert rows[0]["owner"] == "BaseProcessor"
+
+    def test_subclasses(self):
+        """测试直接与传递子类"""
+        assert len(self.index.subclasses("Plugin")) == 3
+        direct = self.index.subclasses("Plugin", direct=True)
+        assert [r["class"] for r in direct] == ["BaseProcessor"]
+
+    def test_mro(self):
+        """测试 MRO 查询"""
+        rows = self.index.mro("TextProcessor")
+        assert [row["ancestor"] for row in rows] == [
+            "TextProcessor", "BaseProcessor", "Plugin", "object"]
+
+    def test_latest_run_per_project(self):
+        """测试默认只查询每个项目的最新 run"""
+        analysis = _analysis()
+        del analysis["modules"]["pkg.processors"]["classes"]["TextProcessor"]
+        new_run = self.index.write(analysis, "proj", "def456")
+        self.index.write(_analysis(), "other")
+
+        rows = self.index.overrides("process", under="BaseProcessor")
+        assert [(r["project"], r["class"]) for r in rows] == [
+            ("other", "TextProcessor")]
+        rows = self.index.overrides("process", under="BaseProcessor",
+                                    run_id=self.run_id)
+        assert len(rows) == 1
+        assert [r["run"] for r in self.index.runs("proj")] == [self.run_id, new_run]
+
+
+def test_query_cli(tmp_path, capsys):
+    """测试查询命令行"""
+    from supermro.cli import query_main
+
+    db_path = tmp_path / "index.sqlite"
+    with SqliteIndex(str(db_path)) as index:
+        index.write(_analysis(), "proj")
+
+    query_main(["--db", str(db_path), "overrides", "process",
+                "--under", "BaseProcessor"])
+    out = capsys.readouterr().out
+    assert "TextProcessor" in out
+    assert "ImageProcessor" not in out
+
+
+def test_hierarchy_and_what_if_cli(tmp_path, capsys):
+    """测试读取继承图与假如查询命令"""
+    from supermro.cli import query_main
+
+    db_path = tmp_path / "index.sqlite"
+    with SqliteIndex(str(db_path)) as index:
+        index.write(_analysis(), "proj")
+        graph = index.hierarchy()["proj"]
+    assert graph["bases"]["TextProcessor"] == ["BaseProcessor"]
+    assert graph["fixed"] == {"Plugin": ["Plugin", "object"]}
+
+    query_main(["--db", str(db_path), "--format", "csv", "whatif", "BaseProcessor",
+                "--add-base", "Cached", "--impact"])
+    out = capsys.readouterr().out
+    mro = "TextProcessor → BaseProcessor → Plugin → Cached → object"
+    assert f"proj,TextProcessor,{mro}" in out
+
+    query_main(["--db", str(db_path), "whatif", "Plugin", "--bases", "TextProcessor"])
+    assert "❌" in capsys.readouterr().out
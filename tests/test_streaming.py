@@ -0,0 +1,116 @@
+"""
+测试流式分析
+"""
+
+import json
+import sys
+import shutil
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+from supermro.analyzer import InheritanceAnalyzer
+from supermro.store import SqliteIndex
+from supermro.streaming import JsonlSink, SnapshotSink, SqliteSink, memory_ceiling
+
+
+def _write_package(root, name, module_count, class_count):
+    """生成测试包：每个模块的类都继承 base.Root"""
+    package_dir = Path(root) / name
+    package_dir.mkdir()
+    (package_dir / "__init__.py").touch()
+    (package_dir / "base.py").write_text(
+        "class Root(Exception):\n    def run(self):\n        pass\n")
+    for m in range(module_count):
+        lines = ["from .base import Root", ""]
+        for c in range(class_count):
+            lines.append(f"class C{m}_{c}(Root):\n"
+                         f"    def process(self):\n        return {c}\n")
+        (package_dir / f"mod{m:03d}.py").write_text("\n".join(lines))
+
+
+class TestStreaming:
+    """测试流式分析与输出"""
+
+    def setup_method(self):
+        self.temp_dir = tempfile.mkdtemp()
+        _write_package(self.temp_dir, "streampkg", 5, 3)
+        self.analyzer = InheritanceAnalyzer(self.temp_dir)
+
+    def teardown_method(self):
+        for name in [m for m in sys.modules if m.split(".")[0] == "streampkg"]:
+            del sys.modules[name]
+        shutil.rmtree(self.temp_dir)
+
+    def test_records_and_eviction(self):
+        """测试逐类记录与模块清理"""
+        records = list(self.analyzer.iter_class_records("streampkg", module_window=2))
+        classes = [r for r in records if r["kind"] == "class"]
+        external = [r["class"] for r in records if r["kind"] == "external"]
+        assert len(classes) == 16
+        assert external == ["Exception", "BaseException"]
+        assert not [m for m in sys.modules if m.startswith("streampkg")]
+
+    def test_sinks(self):
+        """测试 JSONL、快照与 SQLite 输出"""
+        root = Path(self.temp_dir)
+        sinks = [
+            JsonlSink(root / "out.jsonl"),
+            SnapshotSink(root / "snapshot.json", "streampkg"),
+            SqliteSink(str(root / "index.sqlite"), "streampkg", "proj"),
+        ]
+        summary = self.analyzer.stream_package("streampkg", sinks)
+        assert summary["classes"] == 16
+        assert summary["modules"] == 6
+        assert summary["skeleton"]["streampkg.mod000.C0_0"] == ("Root",)
+
+        lines = (root / "out.jsonl").read_text(encoding="utf-8").splitlines()
+        assert len(lines) == 18
+
+        snapshot = json.loads((root / "snapshot.json").read_text(encoding="utf-8"))
+        full = self.analyzer.analyze_package("streampkg")
+        assert snapshot["modules"] == full["modules"]
+        assert snapshot["external_classes"] == full["external_classes"]
+
+        with SqliteIndex(str(root / "index.sqlite")) as index:
+            assert len(index.overrides("process", under="Root")) == 15
+            assert index.owner("C1_2", "run")[0]["owner"] == "Root"
+
+    def test_same_class_names(self):
+        """测试不同模块中的同名类分别计入骨架"""
+        package_dir = Path(self.temp_dir) / "streampkg"
+        (package_dir / "mod000.py").write_text(
+            "class Root:\n    pass\n\nclass Leaf(Root):\n    pass\n")
+        summary = self.analyzer.stream_package("streampkg")
+        full = self.analyzer.analyze_package("streampkg")
+
+        assert summary["classes"] == sum(
+            len(info["classes"]) for info in full["modules"].values())
+        assert summary["skeleton"]["streampkg.base.Root"] == ("Exception",)
+        assert summary["skeleton"]["streampkg.mod000.Root"] == ("object",)
+        assert summary["skeleton"]["streampkg.mod000.Leaf"] == ("Root",)
+
+    def test_missing_package(self):
+        """测试包无法导入时返回错误"""
+        assert "error" in self.analyzer.stream_package("nonexistent")
+
+
+def test_memory_ceiling():
+    """测试流式分析峰值内存不超过文档上限"""
+    temp_dir = tempfile.mkdtemp()
+    try:
+        _write_package(temp_dir, "mempkg", 40, 25)
+        analyzer = InheritanceAnalyzer(temp_dir)
+        tracemalloc.start()
+        try:
+            summary = analyzer.stream_package(
+                "mempkg", [JsonlSink(Path(temp_dir) / "out.jsonl")], module_window=8)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        assert summary["classes"] == 1001
+        assert peak < memory_ceiling(summary["classes"], module_window=8)
+    finally:
+        for name in [m for m in sys.modules if m.split(".")[0] == "mempkg"]:
+            del sys.modules[name]
+        shutil.rmtree(temp_dir)
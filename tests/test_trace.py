@@ -0,0 +1,159 @@
+"""
+测试批量方法追踪
+"""
+
+import sys
+import shutil
+import tempfile
+from pathlib import Path
+
+from supermro.analyzer import InheritanceAnalyzer
+from supermro.cli import parse_trace_spec, read_trace_file, trace_rows
+
+
+def test_parse_trace_spec():
+    """测试追踪目标解析"""
+    assert parse_trace_spec("Dog.speak") == ("Dog", "speak")
+    assert parse_trace_spec("pkg.animals.Dog.speak") == ("pkg.animals.Dog", "speak")
+    assert parse_trace_spec("Dog  speak") == ("Dog", "speak")
+    for bad in ("Dog", "Dog.", ".speak", "a b c"):
+        try:
+            parse_trace_spec(bad)
+        except ValueError:
+            continue
+        raise AssertionError(bad)
+
+
+class TestTraceMethods:
+    """测试批量追踪 API"""
+
+    def setup_method(self):
+        self.temp_dir = tempfile.mkdtemp()
+        package_dir = Path(self.temp_dir) / "tracepkg"
+        package_dir.mkdir()
+        (package_dir / "__init__.py").touch()
+        (package_dir / "base.py").write_text(
+            "class Animal:\n"
+            "    def speak(self):\n        pass\n"
+            "    def eat(self):\n        pass\n")
+        (package_dir / "animals.py").write_text(
+            "from .base import Animal\n\n"
+            "class Dog(Animal):\n"
+            "    def speak(self):\n        pass\n\n"
+            "class Puppy(Dog):\n"
+            "    def speak(self):\n        pass\n")
+        self.analyzer = InheritanceAnalyzer(self.temp_dir)
+
+    def teardown_method(self):
+        for name in [m for m in sys.modules if m.split(".")[0] == "tracepkg"]:
+            del sys.modules[name]
+        shutil.rmtree(self.temp_dir)
+
+    def test_batch(self):
+        """测试结果顺序、错误条目与完整路径"""
+        results = self.analyzer.trace_methods([
+            ("Puppy", "speak"),
+            ("Dog", "eat"),
+            ("Missing", "speak"),
+            ("tracepkg.animals.Dog", "speak"),
+            ("Puppy", "speak"),
+        ], "tracepkg")
+
+        assert len(results) == 5
+        assert [item["class"] for item in results[0]["chain"]] == [
+            "Puppy", "Dog", "Animal"]
+        assert [item["class"] for item in results[1]["chain"]] == ["Animal"]
+        assert results[1]["chain"][0]["module"] == "tracepkg.base"
+        assert results[2]["error"] == "未找到类 Missing"
+        assert [item["class"] for item in results[3]["chain"]] == ["Dog", "Animal"]
+        assert results[4] is results[0]
+
+    def test_single_trace_compatible(self):
+        """测试 trace_method 保持原有结果格式"""
+        result = self.analyzer.trace_method("Dog", "speak", "tracepkg")
+        assert set(result) == {"class", "method", "chain"}
+        assert result["chain"][0]["file"].endswith("animals.py")
+
+    def test_trace_file_and_rows(self):
+        """测试追踪文件读取和表格行展开"""
+        trace_file = Path(self.temp_dir) / "pairs.txt"
+        trace_file.write_text("# 需要检查的方法\nPuppy.speak\n\nDog eat  # 继承\nDog.run\n")
+        pairs = read_trace_file(str(trace_file))
+        assert pairs == [("Puppy", "speak"), ("Dog", "eat"), ("Dog", "run")]
+
+        rows = trace_rows(self.analyzer.trace_methods(pairs, "tracepkg"))
+        assert [(r["class"], r.get("order"), r.get("defined_in")) for r in rows] == [
+            ("Puppy", 0, "Puppy"), ("Puppy", 1, "Dog"), ("Puppy", 2, "Animal"),
+            ("Dog", 0, "Animal"), ("Dog", None, None),
+        ]
+        assert rows[-1]["error"] == "MRO 中没有类定义该方法"
+
+    def test_trace_with_analysis_result(self):
+        """测试基于已有分析结果追踪，结果与导入追踪相同且不再遍历模块"""
+        result = self.analyzer.analyze_package("tracepkg")
+        pairs = [("Puppy", "speak"), ("Dog", "eat"), ("tracepkg.animals.Dog", "speak"),
+                 ("Dog", "__init__"), ("Dog", "run")]
+        expected = self.analyzer.trace_methods(pairs, "tracepkg")
+
+        walked = []
+        find_classes = self.analyzer._find_classes
+        self.analyzer._find_classes = lambda names, package: walked.append(names) or \
+            find_classes(names, package)
+        traced = self.analyzer.trace_methods(
+            pairs + [("Missing", "speak")], "tracepkg", result)
+
+        assert traced[:-1] == expected
+        assert traced[-1]["error"] == "未找到类 Missing"
+        # 只有未收录的 __init__ 和结果中没有的类按完整路径查找
+        assert walked == [{"tracepkg.animals.Dog", "tracepkg.Missing"}]
+
+
+class TestTraceSameNames:
+    """测试同名类与换名绑定的工厂类"""
+
+    def setup_method(self):
+        self.temp_dir = tempfile.mkdtemp()
+        root = Path(self.temp_dir)
+        (root / "samepkg").mkdir()
+        (root / "samepkg" / "__init__.py").touch()
+        (root / "samepkg" / "a.py").write_text(
+            "class Base:\n    def run(self):\n        pass\n")
+        (root / "samepkg" / "b.py").write_text(
+            "class Base:\n    def other(self):\n        pass\n\n"
+            "class Child(Base):\n    pass\n")
+        (root / "factpkg").mkdir()
+        (root / "factpkg" / "__init__.py").touch()
+        (root / "factpkg" / "f.py").write_text(
+            "def make(name):\n"
+            "    def describe(self):\n        pass\n"
+            "    return type(name, (), {'describe': describe})\n\n"
+            "Foo = make('Bar')\n")
+        self.analyzer = InheritanceAnalyzer(self.temp_dir)
+
+    def teardown_method(self):
+        for name in [m for m in sys.modules
+                     if m.split(".")[0] in ("samepkg", "factpkg")]:
+            del sys.modules[name]
+        shutil.rmtree(self.temp_dir)
+
+    def test_same_short_names(self):
+        """测试 MRO 按模块解析，不取第一个同名类"""
+        result = self.analyzer.analyze_package("samepkg")
+        pairs = [("Child", "run"), ("Child", "other"), ("Base", "run")]
+        expected = self.analyzer.trace_methods(pairs, "samepkg")
+        traced = self.analyzer.trace_methods(pairs, "samepkg", result)
+
+        assert traced == expected
+        assert traced[0]["chain"] == []
+        assert [(c["class"], c["module"]) for c in traced[1]["chain"]] == [
+            ("Base", "samepkg.b")]
+
+    def test_renamed_factory_class(self):
+        """测试绑定名与类名不同的工厂类"""
+        result = self.analyzer.analyze_package("factpkg")
+        expected = self.analyzer.trace_method("Foo", "describe", "factpkg")
+        traced = self.analyzer.trace_method("Foo", "describe", "factpkg", result)
+
+        assert traced == expected
+        assert [(c["class"], c["module"]) for c in traced["chain"]] == [
+            ("Bar", "factpkg.f")]